@@ -7,5 +7,9 @@ class ActivityLogsConfig(AppConfig):
     verbose_name = 'Activity Logs'
     
     def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
         # Import signals
         from . import signals  # noqa
+        # Let apps register their audited models (see registry.py)
+        autodiscover_modules('audit')
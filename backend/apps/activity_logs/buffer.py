@@ -0,0 +1,197 @@
+"""
+Buffered writer for activity logs.
+
+Activities are logged from request middleware and from model signals, so
+writing each one with its own ``INSERT`` adds a database round trip to the
+request or transaction that triggered it. ``ActivityBuffer`` queues unsaved
+``ActivityLog`` instances in memory and a daemon thread writes them with
+``bulk_create`` and adds them to the hourly rollups (see ``rollups.py``):
+
+- when ``ACTIVITY_LOG_BATCH_SIZE`` activities are waiting,
+- at least every ``ACTIVITY_LOG_FLUSH_INTERVAL`` seconds,
+- when the process exits (``atexit``) or a Celery worker shuts down.
+
+Activities logged inside a transaction are only queued once it commits, so
+rolled-back work leaves no trace. The buffer holds at most
+``ACTIVITY_LOG_BUFFER_SIZE`` activities; what happens when it is full is set
+by ``ACTIVITY_LOG_OVERFLOW``: ``'drop'`` discards the new activity, ``'block'``
+makes the caller write the pending batch itself.
+
+The buffer is per process and starts lazily on first use (see
+``get_buffer``). Activities still buffered when a process is killed are
+lost; set ``ACTIVITY_LOG_BUFFERED = False`` to write every activity
+immediately.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from celery.signals import worker_process_shutdown, worker_shutdown
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import ActivityLog
+from .rollups import record_activities
+
+logger = logging.getLogger(__name__)
+
+DROP = 'drop'
+BLOCK = 'block'
+
+
+class ActivityBuffer:
+    """Queues activities in memory and writes them in batches from a daemon thread."""
+
+    def __init__(self, max_size=10000, batch_size=500, flush_interval=2.0, overflow=DROP):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.dropped = 0
+        self._pending = deque()
+        self._lock = threading.Lock()
+        # Serializes writers so batches are written in the order they were queued
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread and write whatever is still buffered."""
+        if os.getpid() != self._pid:
+            # Inherited from the parent process through fork
+            return
+        self._stop.set()
+        self._wakeup.set()
+        if self.running and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def add(self, activity):
+        """
+        Queue an unsaved activity, once the current transaction commits.
+
+        Returns:
+            bool: False if the activity was dropped because the buffer is full
+                (only known immediately outside of a transaction)
+        """
+        if connection.in_atomic_block:
+            transaction.on_commit(lambda: self._enqueue(activity))
+            return True
+        return self._enqueue(activity)
+
+    def _enqueue(self, activity):
+        with self._lock:
+            full = len(self._pending) >= self.max_size
+            if full and self.overflow == DROP:
+                self.dropped += 1
+                dropped = self.dropped
+            else:
+                self._pending.append(activity)
+            pending = len(self._pending)
+
+        if full and self.overflow == DROP:
+            # Powers of two keep a sustained overload from flooding the log
+            if dropped & (dropped - 1) == 0:
+                logger.warning(f"Activity log buffer full; {dropped} activities dropped so far")
+            return False
+        if full:
+            # Backpressure: the caller pays for writing the oldest batch
+            self.flush(max_batches=1)
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _take(self):
+        with self._lock:
+            return [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+
+    def flush(self, max_batches=None):
+        """
+        Write buffered activities in batches of ``batch_size``.
+
+        Returns:
+            int: Number of activities written
+        """
+        written = 0
+        batches = 0
+        with self._flush_lock:
+            while max_batches is None or batches < max_batches:
+                batch = self._take()
+                if not batch:
+                    break
+                batches += 1
+                try:
+                    ActivityLog.objects.bulk_create(batch)
+                    written += len(batch)
+                except Exception as e:
+                    logger.error(f"Error writing {len(batch)} activity logs: {str(e)}", exc_info=True)
+                    continue
+                try:
+                    record_activities(batch)
+                except Exception as e:
+                    logger.error(f"Error updating activity rollups: {str(e)}", exc_info=True)
+        return written
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                connection.close_if_unusable_or_obsolete()
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing activity logs: {str(e)}", exc_info=True)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Return this process's activity buffer, starting its writer on first use."""
+    global _buffer
+    with _buffer_lock:
+        # A forked worker must not share the parent's queue or thread
+        if _buffer is None or _buffer._pid != os.getpid():
+            _buffer = ActivityBuffer(
+                max_size=getattr(settings, 'ACTIVITY_LOG_BUFFER_SIZE', 10000),
+                batch_size=getattr(settings, 'ACTIVITY_LOG_BATCH_SIZE', 500),
+                flush_interval=getattr(settings, 'ACTIVITY_LOG_FLUSH_INTERVAL', 2.0),
+                overflow=getattr(settings, 'ACTIVITY_LOG_OVERFLOW', DROP),
+            )
+            atexit.register(_buffer.stop)
+        _buffer.start()
+    return _buffer
+
+
+def flush_activity_logs():
+    """Write all buffered activities of this process now."""
+    if _buffer is not None and _buffer._pid == os.getpid():
+        return _buffer.flush()
+    return 0
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def flush_on_worker_shutdown(**kwargs):
+    # Prefork children exit without running atexit handlers
+    flush_activity_logs()
@@ -0,0 +1,127 @@
+"""
+Activity log exports.
+
+Activities are read with ``.iterator()`` (a server-side cursor on
+PostgreSQL) and turned into CSV or NDJSON lines one at a time, so an export
+uses the same memory whatever its size. ``ActivityLogViewSet.export``
+streams the lines in the response; the ``export_activity_logs`` task writes
+them to a gzip file under ``MEDIA_ROOT`` for exports too large to download
+in one request.
+"""
+import csv
+import gzip
+import json
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+EXPORT_FIELDS = [
+    'id',
+    'created_at',
+    'user_id',
+    'user__username',
+    'activity_type',
+    'object_type',
+    'object_id',
+    'ip_address',
+    'user_agent',
+    'details',
+]
+# Column names in the exported files
+EXPORT_COLUMNS = [field.replace('__', '_') for field in EXPORT_FIELDS]
+
+EXPORT_DIR = os.path.join('exports', 'activity_logs')
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        row = list(row)
+        row[1] = row[1].isoformat()
+        row[-1] = json.dumps(row[-1], cls=DjangoJSONEncoder)
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+# Export format: (content type, line generator)
+FORMATS = {
+    'csv': ('text/csv', _csv_lines),
+    'ndjson': ('application/x-ndjson', _ndjson_lines),
+}
+
+
+def export_lines(queryset, export_format):
+    """
+    Lines of an export of ``queryset``, oldest activity last.
+
+    Args:
+        queryset: Activity logs to export, already filtered
+        export_format: A key of ``FORMATS``
+    """
+    rows = (
+        queryset
+        .order_by('-created_at', '-id')
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=getattr(settings, 'ACTIVITY_LOG_EXPORT_CHUNK_SIZE', 2000))
+    )
+    return FORMATS[export_format][1](rows)
+
+
+def export_filename(export_format):
+    return f"activity-log-{timezone.now():%Y%m%d-%H%M%S}.{export_format}"
+
+
+def write_export(queryset, export_format):
+    """
+    Write an export of ``queryset`` to a gzip file under ``MEDIA_ROOT``.
+
+    The file name is random, as media files are served without authentication.
+
+    Returns:
+        str: Path of the file relative to ``MEDIA_ROOT``
+    """
+    directory = os.path.join(settings.MEDIA_ROOT, EXPORT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.join(EXPORT_DIR, f"{uuid.uuid4().hex}-{export_filename(export_format)}.gz")
+    path = os.path.join(settings.MEDIA_ROOT, name)
+
+    # Written under a temporary name so a partial file is never served
+    with gzip.open(f'{path}.part', 'wt', encoding='utf-8', newline='') as output:
+        for line in export_lines(queryset, export_format):
+            output.write(line)
+    os.replace(f'{path}.part', path)
+    return name
+
+
+def prune_exports(max_age):
+    """Delete exported files older than ``max_age`` (a timedelta)."""
+    directory = os.path.join(settings.MEDIA_ROOT, EXPORT_DIR)
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = (timezone.now() - max_age).timestamp()
+    removed = 0
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+
+def export_max_age():
+    return timedelta(hours=getattr(settings, 'ACTIVITY_LOG_EXPORT_TTL_HOURS', 24))
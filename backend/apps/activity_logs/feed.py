@@ -0,0 +1,146 @@
+"""
+Activity feeds read from ``ActivityLog`` with keyset pagination.
+
+Feeds are ordered newest first by ``(created_at, id)``. A page is fetched
+with a range condition on that pair rather than an ``OFFSET``, so with the
+``(organization|user, created_at, id)`` indexes every page costs the same
+no matter how far back it is. Positions are handed to clients as opaque
+cursors; nothing in a feed response needs a ``COUNT(*)``.
+"""
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .models import ActivityLog
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    """Raised when a feed cursor cannot be decoded."""
+
+
+def encode_cursor(activity, direction):
+    """Encode the position of ``activity`` and a paging direction as an opaque string."""
+    payload = json.dumps([activity.created_at.isoformat(), activity.pk, direction])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by ``encode_cursor``.
+
+    Returns:
+        tuple: ``(created_at, id, direction)``
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk, direction = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(created_at)
+        if created_at is None or direction not in (NEXT, PREVIOUS):
+            raise ValueError(cursor)
+        return created_at, int(pk), direction
+    except (TypeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def get_feed_queryset(organization=None, user=None):
+    """
+    Activities of an organization and/or a user, without ordering.
+
+    With neither argument the feed covers all activities (superadmins).
+    """
+    queryset = ActivityLog.objects.select_related('user')
+    if organization is not None:
+        queryset = queryset.filter(organization=organization)
+    if user is not None:
+        queryset = queryset.filter(user=user)
+    return queryset
+
+
+def get_feed_page(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch one page of a feed, newest first.
+
+    Args:
+        queryset: Activities to page through (see ``get_feed_queryset``)
+        cursor: Cursor from a previous page's ``next``/``previous``, or None
+            for the newest page
+        page_size: Number of activities per page (at most MAX_PAGE_SIZE)
+
+    Returns:
+        dict: 'results' (list of ActivityLog), 'next' and 'previous'
+            (cursors, or None at either end of the feed)
+
+    Raises:
+        InvalidCursor: If ``cursor`` is malformed
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    direction = NEXT
+
+    if cursor:
+        created_at, pk, direction = decode_cursor(cursor)
+        if direction == NEXT:
+            # Older than the last activity of the previous page
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        else:
+            # Newer than the first activity of the following page
+            queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+
+    if direction == NEXT:
+        queryset = queryset.order_by('-created_at', '-pk')
+    else:
+        queryset = queryset.order_by('created_at', 'pk')
+
+    # One extra row tells whether there is another page in this direction
+    activities = list(queryset[:page_size + 1])
+    has_more = len(activities) > page_size
+    activities = activities[:page_size]
+    if direction == PREVIOUS:
+        activities.reverse()
+
+    if not activities:
+        return {'results': [], 'next': None, 'previous': None}
+
+    if direction == NEXT:
+        has_next, has_previous = has_more, bool(cursor)
+    else:
+        has_next, has_previous = True, has_more
+
+    return {
+        'results': activities,
+        'next': encode_cursor(activities[-1], NEXT) if has_next else None,
+        'previous': encode_cursor(activities[0], PREVIOUS) if has_previous else None,
+    }
+
+
+def serialize_activity(activity):
+    """Format an activity the way the dashboard feeds return it."""
+    user = activity.user
+    description = activity.get_activity_type_display()
+    if activity.object_type:
+        description = f"{description}: {activity.object_type}"
+    return {
+        'id': activity.pk,
+        'type': activity.activity_type,
+        'object_type': activity.object_type,
+        'object_id': activity.object_id,
+        'organization_id': str(activity.organization_id) if activity.organization_id else None,
+        'user': {
+            'id': str(user.id),
+            'email': user.email,
+            'name': user.get_full_name() or user.username,
+        } if user else None,
+        'details': activity.details,
+        'timestamp': activity.created_at.isoformat(),
+        'message': f"{description} by {user.email}" if user else description,
+    }
@@ -0,0 +1,131 @@
+"""
+Query parameters of the activity log API.
+
+Every filter compiles to a predicate the activity log indexes can serve:
+
+- ``details.<path>=<value>``: containment (``@>``) on ``details``, served by
+  the ``jsonb_path_ops`` GIN index. Nested keys are separated by dots and
+  values are parsed as JSON when possible, so ``details.status_code=500``
+  matches the number 500 and ``details.method=POST`` the string "POST".
+- ``object_type``, ``object_id``, ``user_id``, ``activity_type``,
+  ``ip_address``: equality.
+- ``since``/``until``: ``created_at`` range (ISO date or datetime), which
+  also limits the monthly partitions that are scanned.
+- ``search``: full-text search over the generated ``search_vector``, or
+  activities of users whose username or email contains the text.
+"""
+import ipaddress
+import json
+import uuid
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import ActivityType
+
+DETAILS_PREFIX = 'details.'
+EQUALITY_FILTERS = ('object_type', 'object_id')
+# Users whose activities a free-text search also returns, at most
+MAX_SEARCH_USERS = 100
+
+
+def _parse_value(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def details_filter(path, value):
+    """Containment document matching ``value`` at the dotted ``path``."""
+    keys = [key for key in path.split('.') if key]
+    if not keys:
+        raise ValidationError({DETAILS_PREFIX + path: 'A details path is required.'})
+    document = _parse_value(value)
+    for key in reversed(keys):
+        document = {key: document}
+    return document
+
+
+def _parse_moment(name, value, end=False):
+    try:
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+    except ValueError:
+        moment = day = None
+    if moment is None:
+        if day is None:
+            raise ValidationError({name: 'Expected an ISO 8601 date or datetime.'})
+        moment = datetime.combine(day, time.min)
+        if end:
+            # A date as upper bound includes the whole day
+            moment += timedelta(days=1)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_activities(queryset, params):
+    """
+    Apply the activity log query parameters to ``queryset``.
+
+    Raises:
+        ValidationError: If a parameter is malformed
+    """
+    for key in params:
+        if key.startswith(DETAILS_PREFIX):
+            for value in params.getlist(key):
+                queryset = queryset.filter(details__contains=details_filter(key[len(DETAILS_PREFIX):], value))
+
+    for name in EQUALITY_FILTERS:
+        value = params.get(name)
+        if value:
+            queryset = queryset.filter(**{name: value})
+
+    user_id = params.get('user_id')
+    if user_id:
+        try:
+            user_id = uuid.UUID(user_id)
+        except ValueError:
+            raise ValidationError({'user_id': 'Expected a user ID (UUID).'})
+        queryset = queryset.filter(user_id=user_id)
+
+    activity_type = params.get('activity_type')
+    if activity_type:
+        if activity_type not in ActivityType.values:
+            raise ValidationError({'activity_type': f'Unknown activity type: {activity_type}'})
+        queryset = queryset.filter(activity_type=activity_type)
+
+    ip_address = params.get('ip_address')
+    if ip_address:
+        try:
+            ipaddress.ip_address(ip_address)
+        except ValueError:
+            raise ValidationError({'ip_address': 'Expected an IP address.'})
+        queryset = queryset.filter(ip_address=ip_address)
+
+    since = params.get('since')
+    if since:
+        queryset = queryset.filter(created_at__gte=_parse_moment('since', since))
+    until = params.get('until')
+    if until:
+        queryset = queryset.filter(created_at__lt=_parse_moment('until', until, end=True))
+
+    search = params.get('search', '').strip()
+    if search:
+        condition = Q(search_vector=SearchQuery(search, search_type='websearch', config='english'))
+        # Resolved up front so both sides of the OR can use an index
+        user_ids = list(
+            get_user_model().objects
+            .filter(Q(username__icontains=search) | Q(email__icontains=search))
+            .values_list('pk', flat=True)[:MAX_SEARCH_USERS]
+        )
+        if user_ids:
+            condition |= Q(user_id__in=user_ids)
+        queryset = queryset.filter(condition)
+    return queryset
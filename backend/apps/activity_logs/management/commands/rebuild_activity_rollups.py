@@ -0,0 +1,51 @@
+"""
+Management command to rebuild or verify the hourly activity rollups.
+
+The rollups of the activities logged before they existed are computed by a
+migration; this command repairs them after activities were written without
+``log_activity``.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.activity_logs.rollups import hour_of, rebuild_rollups, verify_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the hourly activity rollups from the activity log, or check them against it'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Number of past days to process (the current hour is included)'
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only compare the rollups with exact figures, without changing them'
+        )
+
+    def handle(self, *args, **options):
+        end = hour_of(timezone.now()) + timedelta(hours=1)
+        start = end - timedelta(days=options['days'])
+
+        if not options['verify']:
+            counted = rebuild_rollups(start, end)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt activity rollups ({counted} activities counted)"))
+            return
+
+        result = verify_rollups(start, end)
+        for hour, activity_type, rollup, exact in result['mismatched_hours']:
+            self.stdout.write(f"{hour:%Y-%m-%d %H:00} {activity_type}: rollup {rollup}, exact {exact}")
+        self.stdout.write(
+            f"Unique users: exact {result['unique_users']}, "
+            f"estimate {result['unique_users_estimate']} "
+            f"(error {result['relative_error']:.2%}, bound {result['error_bound']:.2%})"
+        )
+        if not result['counts_match'] or not result['within_bound']:
+            raise CommandError('Activity rollups are out of bounds; run this command without --verify to rebuild them')
+        self.stdout.write(self.style.SUCCESS('Activity rollups are consistent with the activity log'))
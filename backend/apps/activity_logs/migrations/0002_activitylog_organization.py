@@ -0,0 +1,34 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity_logs', '0001_initial'),
+        ('organization', '0007_seed_subscription_plans'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='organization',
+            field=models.ForeignKey(blank=True, help_text='Organization the activity belongs to, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='organization.organization'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['organization', '-created_at', '-id'], name='activity_org_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='activity_user_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-created_at', '-id'], name='activity_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:56
+
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+TABLE = 'activity_logs_activitylog'
+OLD_TABLE = 'activity_logs_activitylog_unpartitioned'
+PARTITIONS_AHEAD = 3
+
+
+def _month(day, offset=0):
+    month = day.year * 12 + day.month - 1 + offset
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def _bound(month):
+    return timezone.make_aware(datetime.combine(month, time.min)).isoformat()
+
+
+def partition_table(apps, schema_editor):
+    """
+    Replace the activity log table with one partitioned by month.
+
+    Index and foreign key definitions are copied from the existing table,
+    partitions are created for every month with activities up to a few
+    months ahead, and the activities are copied over.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+            [TABLE, f'{TABLE}_pkey']
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE]
+        )
+        foreign_keys = cursor.fetchall()
+
+        # Index names are unique per schema, so free them for the new table
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME CONSTRAINT "{TABLE}_pkey" TO "{OLD_TABLE}_pkey"')
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{OLD_TABLE}"')
+
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" (LIKE "{OLD_TABLE}" INCLUDING DEFAULTS INCLUDING IDENTITY, '
+            f'PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)'
+        )
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}')
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+        cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+        cursor.execute(f'SELECT MIN(created_at) FROM "{OLD_TABLE}"')
+        oldest = cursor.fetchone()[0]
+        today = timezone.localdate()
+        month = _month(timezone.localdate(oldest) if oldest else today)
+        while month <= _month(today, PARTITIONS_AHEAD):
+            cursor.execute(
+                f'CREATE TABLE "{TABLE}_p{month:%Y%m}" PARTITION OF "{TABLE}" FOR VALUES FROM (%s) TO (%s)',
+                [_bound(month), _bound(_month(month, 1))]
+            )
+            month = _month(month, 1)
+
+        cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{OLD_TABLE}"')
+        # Check the deferred foreign keys now; indexes cannot be created later
+        # in this transaction while their triggers are pending
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM \"{TABLE}\"",
+            [TABLE]
+        )
+        cursor.execute(f'DROP TABLE "{OLD_TABLE}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity_logs', '0003_activitylog_created_at_default'),
+        ('organization', '0007_seed_subscription_plans'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_table, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['activity_type', '-created_at'], name='activity_type_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:59
+
+import apps.activity_logs.models
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity_logs', '0004_partition_by_month'),
+        ('organization', '0007_seed_subscription_plans'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activitylog',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('object_type', 'object_id', config='english', weight='A'), '||', apps.activity_logs.models.DetailsVector('details'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['object_type', 'object_id', '-created_at'], name='activity_object_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['details'], name='activity_details_idx', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='activity_search_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.7 on 2026-10-17 05:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity_logs', '0006_activity_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityDailyUserSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('sketch', models.BinaryField()),
+            ],
+            options={
+                'verbose_name': 'Activity Daily User Sketch',
+                'verbose_name_plural': 'Activity Daily User Sketches',
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from apps.activity_logs.hll import HyperLogLog
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Compute the rollups and user sketches of the activities logged before
+    they existed, over the retained months (or all activities when they are
+    kept forever).
+    """
+    ActivityLog = apps.get_model('activity_logs', 'ActivityLog')
+    ActivityRollup = apps.get_model('activity_logs', 'ActivityRollup')
+    ActivityUserSketch = apps.get_model('activity_logs', 'ActivityUserSketch')
+    ActivityDailyUserSketch = apps.get_model('activity_logs', 'ActivityDailyUserSketch')
+
+    now = timezone.now().astimezone(dt_timezone.utc)
+    end = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    retention_months = getattr(settings, 'ACTIVITY_LOG_RETENTION_MONTHS', 12)
+    if retention_months:
+        start = now - timedelta(days=31 * (retention_months + 1))
+    else:
+        start = ActivityLog.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        if start is None:
+            return
+    start = start.astimezone(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    activities = ActivityLog.objects.filter(created_at__gte=start, created_at__lt=end).annotate(
+        hour=TruncHour('created_at', tzinfo=dt_timezone.utc)
+    )
+    counts = activities.values('hour', 'activity_type').annotate(count=Count('pk')).order_by()
+
+    hourly = defaultdict(HyperLogLog)
+    users = activities.exclude(user__isnull=True).values_list('hour', 'user_id').distinct()
+    for hour, user_id in users.iterator(chunk_size=5000):
+        hourly[hour].add(user_id)
+    daily = defaultdict(HyperLogLog)
+    for hour, sketch in hourly.items():
+        daily[hour.date()].merge(sketch)
+
+    ActivityRollup.objects.filter(hour__gte=start, hour__lt=end).delete()
+    ActivityUserSketch.objects.filter(hour__gte=start, hour__lt=end).delete()
+    ActivityDailyUserSketch.objects.filter(day__gte=start.date()).delete()
+    ActivityRollup.objects.bulk_create(
+        [ActivityRollup(hour=row['hour'], activity_type=row['activity_type'], count=row['count']) for row in counts],
+        batch_size=1000
+    )
+    ActivityUserSketch.objects.bulk_create(
+        [ActivityUserSketch(hour=hour, sketch=sketch.to_bytes()) for hour, sketch in hourly.items()],
+        batch_size=1000
+    )
+    ActivityDailyUserSketch.objects.bulk_create(
+        [ActivityDailyUserSketch(day=day, sketch=sketch.to_bytes()) for day, sketch in daily.items()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activity_logs', '0007_activity_daily_user_sketch'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorCombinable, SearchVectorField
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
@@ -14,6 +17,13 @@ class ActivityType(models.TextChoices):
     PROFILE_UPDATE = 'profile_update', _('Profile Update')
     SETTINGS_UPDATE = 'settings_update', _('Settings Update')
 
+class DetailsVector(SearchVectorCombinable, models.Func):
+    """Text search vector of the string values (not the keys) of a JSON field."""
+    function = 'jsonb_to_tsvector'
+    template = "setweight(%(function)s('english'::regconfig, %(expressions)s, '[\"string\"]'::jsonb), 'B')"
+    output_field = SearchVectorField()
+
+
 class ActivityLog(models.Model):
     user = models.ForeignKey(
         User,
@@ -22,6 +32,14 @@ class ActivityLog(models.Model):
         blank=True,
         related_name='activities'
     )
+    organization = models.ForeignKey(
+        'organization.Organization',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activities',
+        help_text=_('Organization the activity belongs to, if any')
+    )
     activity_type = models.CharField(
         max_length=50,
         choices=ActivityType.choices,
@@ -32,12 +50,81 @@ class ActivityLog(models.Model):
     object_type = models.CharField(max_length=100, blank=True, null=True)
     object_id = models.CharField(max_length=100, blank=True, null=True)
     details = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the activity is logged, not when a buffered batch is written
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Free-text search over the object and the string values of the details
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('object_type', 'object_id', weight='A', config='english')
+            + DetailsVector('details')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ['-created_at']
         verbose_name = _('Activity Log')
         verbose_name_plural = _('Activity Logs')
+        # Keyset pagination of the activity feeds (see apps.activity_logs.feed).
+        # On PostgreSQL the table is partitioned by month (see partitions.py)
+        # and every partition gets these indexes.
+        indexes = [
+            models.Index(fields=['organization', '-created_at', '-id'], name='activity_org_feed_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='activity_user_feed_idx'),
+            models.Index(fields=['-created_at', '-id'], name='activity_feed_idx'),
+            models.Index(fields=['activity_type', '-created_at'], name='activity_type_idx'),
+            models.Index(fields=['object_type', 'object_id', '-created_at'], name='activity_object_idx'),
+            # Containment (@>) filters on details and free-text search
+            GinIndex(fields=['details'], opclasses=['jsonb_path_ops'], name='activity_details_idx'),
+            GinIndex(fields=['search_vector'], name='activity_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_activity_type_display()} by {self.user} at {self.created_at}"
+
+
+class ActivityRollup(models.Model):
+    """
+    Number of activities of one type logged during one hour.
+
+    Maintained as activity logs are written (see ``apps.activity_logs.rollups``)
+    so activity summaries do not have to scan the activity log.
+    """
+    hour = models.DateTimeField()
+    activity_type = models.CharField(max_length=50, choices=ActivityType.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _('Activity Rollup')
+        verbose_name_plural = _('Activity Rollups')
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'activity_type'], name='activity_rollup_unique_hour_type'),
+        ]
+
+    def __str__(self):
+        return f"{self.activity_type} at {self.hour}: {self.count}"
+
+
+class ActivityUserSketch(models.Model):
+    """HyperLogLog sketch of the users active during one hour (see ``hll.py``)."""
+    hour = models.DateTimeField(unique=True)
+    sketch = models.BinaryField()
+
+    class Meta:
+        verbose_name = _('Activity User Sketch')
+        verbose_name_plural = _('Activity User Sketches')
+
+    def __str__(self):
+        return f"Active users at {self.hour}"
+
+
+
+class ActivityDailyUserSketch(models.Model):
+    """Union of the hourly user sketches of one UTC day, so long ranges merge one sketch per day."""
+    day = models.DateField(unique=True)
+    sketch = models.BinaryField()
+
+    class Meta:
+        verbose_name = _('Activity Daily User Sketch')
+        verbose_name_plural = _('Activity Daily User Sketches')
@@ -0,0 +1,178 @@
+"""
+Monthly range partitions of the activity log.
+
+On PostgreSQL ``activity_logs_activitylog`` is partitioned by ``created_at``
+into one table per calendar month (``activity_logs_activitylog_pYYYYMM``)
+plus a default partition for rows outside every month partition. Indexes
+declared on the model are created on the parent and inherited by each
+partition, and queries filtering on ``created_at`` only scan the months
+they cover.
+
+``maintain_partitions`` (run daily by the ``maintain_activity_log_partitions``
+Celery task) creates the partitions for the current month and the next
+``ACTIVITY_LOG_PARTITIONS_AHEAD`` months, and drops the partitions that fall
+entirely before the ``ACTIVITY_LOG_RETENTION_MONTHS`` retention window, so
+expiring old activities never runs a ``DELETE``.
+
+On other databases the table is not partitioned and these functions do
+nothing.
+"""
+import logging
+import re
+from datetime import date, datetime, time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+def _table():
+    return ActivityLog._meta.db_table
+
+
+def month_start(day, offset=0):
+    """First day of the month ``offset`` months after the month of ``day``."""
+    month = day.year * 12 + day.month - 1 + offset
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{_table()}_p{month:%Y%m}'
+
+
+def _bound(month):
+    return timezone.make_aware(datetime.combine(month, time.min)).isoformat()
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [_table()])
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """Months that have a partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [_table()]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_NAME.search(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+@transaction.atomic
+def create_partition(month):
+    """
+    Create the partition of ``month`` if it does not exist.
+
+    Rows of that month that already landed in the default partition are
+    moved into the new partition.
+    """
+    table = _table()
+    name = partition_name(month)
+    start, end = _bound(month), _bound(month_start(month, 1))
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return False
+
+        default = qn(f'{table}_default')
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {default} WHERE created_at >= %s AND created_at < %s)",
+            [start, end]
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [start, end]
+            )
+            return True
+
+        # A partition cannot be attached while the default partition holds
+        # rows of its range, so move them first
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED)"
+        )
+        # Generated columns are recomputed, not copied
+        columns = ', '.join(
+            qn(field.column) for field in ActivityLog._meta.concrete_fields
+            if not getattr(field, 'generated', False)
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {default} WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} ({columns}) SELECT {columns} FROM moved",
+            [start, end]
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)",
+            [start, end]
+        )
+    return True
+
+
+def drop_partition(month):
+    """Detach and drop the partition of ``month``, with all its activities."""
+    qn = connection.ops.quote_name
+    name = partition_name(month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(_table())} DETACH PARTITION {qn(name)}")
+        cursor.execute(f"DROP TABLE {qn(name)}")
+
+
+def maintain_partitions(today=None, ahead=3, retention_months=12):
+    """
+    Create upcoming partitions and drop expired ones.
+
+    Args:
+        today: Reference date (defaults to the current local date)
+        ahead: Number of months after the current one to create partitions for
+        retention_months: Number of past months kept besides the current
+            one; 0 keeps everything
+
+    Returns:
+        dict: 'created' and 'dropped' lists of months
+    """
+    result = {'created': [], 'dropped': []}
+    if not is_partitioned():
+        return result
+
+    today = today or timezone.localdate()
+    current = month_start(today)
+    for offset in range(ahead + 1):
+        month = month_start(current, offset)
+        if create_partition(month):
+            result['created'].append(month)
+
+    if retention_months:
+        oldest_kept = month_start(current, -retention_months)
+        for month in list_partitions():
+            if month < oldest_kept:
+                drop_partition(month)
+                result['dropped'].append(month)
+
+    if result['created'] or result['dropped']:
+        logger.info(
+            f"Activity log partitions created: {[f'{m:%Y-%m}' for m in result['created']]}, "
+            f"dropped: {[f'{m:%Y-%m}' for m in result['dropped']]}"
+        )
+    return result
@@ -0,0 +1,141 @@
+"""
+Registry of audited models.
+
+Apps declare which of their models are audited in an ``audit.py`` module,
+which is imported when the activity logs app is ready::
+
+    from apps.activity_logs.registry import register
+    from .models import OrganizationMember
+
+    register(OrganizationMember, fields=['role', 'is_active'], actor='user')
+
+``post_save``/``post_delete`` receivers are connected for registered models
+only. Updates are logged only when an audited field changed, with a
+``{field: [old, new]}`` diff taken from the model's ``FieldTracker``, which
+has to track all audited fields. Activities go through ``log_activity``, so
+they are written in batches after the transaction commits (see
+``apps.activity_logs.buffer``).
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import ActivityType
+from .utils import log_activity
+
+
+@dataclass(frozen=True)
+class AuditOptions:
+    """How a registered model is audited."""
+    model: type
+    fields: tuple
+    tracker: str = 'tracker'
+    # Attribute holding the user who is credited with the change
+    actor: str = None
+    # Attribute holding the id of the organization the change belongs to
+    organization: str = 'organization_id'
+    log_create: bool = True
+    log_delete: bool = True
+
+
+_registry = {}
+
+
+def _json_value(value):
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _actor(options, instance):
+    return getattr(instance, options.actor, None) if options.actor else None
+
+
+def _log(options, instance, activity_type, details):
+    actor = _actor(options, instance)
+    if actor is None:
+        # Changes nobody can be credited with are not audited
+        return
+    log_activity(
+        user=actor,
+        activity_type=activity_type,
+        object_type=options.model.__name__,
+        object_id=instance.pk,
+        details=details,
+        organization=getattr(instance, options.organization, None) if options.organization else None,
+    )
+
+
+def get_changes(options, instance):
+    """Audited fields changed by the save in progress, as ``{field: [old, new]}``."""
+    tracker = getattr(instance, options.tracker)
+    changed = tracker.changed()
+    return {
+        field: [
+            _json_value(changed[field]),
+            _json_value(options.model._meta.get_field(field).value_from_object(instance)),
+        ]
+        for field in options.fields if field in changed
+    }
+
+
+def audit_save(sender, instance, created, raw=False, **kwargs):
+    options = _registry.get(sender)
+    if options is None or raw:
+        return
+    if created:
+        if options.log_create:
+            _log(options, instance, ActivityType.CREATE, {})
+        return
+
+    changes = get_changes(options, instance)
+    if changes:
+        _log(options, instance, ActivityType.UPDATE, {'changes': changes})
+
+
+def audit_delete(sender, instance, **kwargs):
+    options = _registry.get(sender)
+    if options is None or not options.log_delete:
+        return
+    _log(options, instance, ActivityType.DELETE, {'deleted_at': timezone.now().isoformat()})
+
+
+def register(model, fields, **options):
+    """
+    Audit saves and deletions of ``model``.
+
+    Args:
+        model: The model class
+        fields: Fields whose changes are logged; all must be tracked by the
+            model's tracker
+        **options: Other ``AuditOptions`` (tracker, actor, organization,
+            log_create, log_delete)
+
+    Raises:
+        ImproperlyConfigured: If the model has no tracker covering ``fields``
+    """
+    options = AuditOptions(model=model, fields=tuple(fields), **options)
+    tracker = getattr(model, options.tracker, None)
+    tracked = set(getattr(tracker, 'fields', None) or ())
+    untracked = [field for field in options.fields if field not in tracked]
+    if untracked:
+        raise ImproperlyConfigured(
+            f"{model.__name__}.{options.tracker} does not track audited fields: {', '.join(untracked)}"
+        )
+
+    _registry[model] = options
+    dispatch_uid = f'activity_logs.audit.{model._meta.label_lower}'
+    post_save.connect(audit_save, sender=model, dispatch_uid=dispatch_uid)
+    post_delete.connect(audit_delete, sender=model, dispatch_uid=dispatch_uid)
+    return options
+
+
+def get_registered_models():
+    return list(_registry)
@@ -0,0 +1,262 @@
+"""
+Hourly activity rollups.
+
+``ActivityRollup`` counts the activities of each type per hour and
+``ActivityUserSketch`` keeps a HyperLogLog sketch of the users active in each
+hour, with ``ActivityDailyUserSketch`` holding the union of each UTC day's
+hourly sketches. They are updated by ``record_activities`` whenever the
+activity buffer writes a batch, so summaries add up a few rows per hour and
+merge one sketch per day (plus the hours of a partial first day) instead of
+scanning the activity log.
+
+Activities written without going through ``log_activity`` are not counted;
+``rebuild_rollups`` recomputes a range of hours from the activity log and
+``verify_rollups`` compares the rollups with exact figures (see the
+``rebuild_activity_rollups`` command).
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .hll import HyperLogLog
+from .models import ActivityDailyUserSketch, ActivityLog, ActivityRollup, ActivityUserSketch
+
+# Estimates of distinct users are expected within this many standard errors
+ERROR_BOUND_SIGMAS = 3
+
+
+def hour_of(moment):
+    """Start of the UTC hour containing ``moment``."""
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _day_start(day):
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def _merge_sketches(model, field, sketches):
+    """Merge ``sketches`` (a mapping of ``field`` value to sketch) into the rows of ``model``."""
+    model.objects.bulk_create(
+        [model(**{field: key, 'sketch': HyperLogLog().to_bytes()}) for key in sketches],
+        ignore_conflicts=True
+    )
+    rows = list(model.objects.select_for_update().filter(**{f'{field}__in': list(sketches)}).order_by(field))
+    for row in rows:
+        row.sketch = HyperLogLog.from_bytes(row.sketch).merge(sketches[getattr(row, field)]).to_bytes()
+    model.objects.bulk_update(rows, ['sketch'])
+
+
+@transaction.atomic
+def _store(counts, users, daily=True):
+    """
+    Add activity counts and active users to the rollups.
+
+    Args:
+        counts: Mapping of ``(hour, activity_type)`` to a number of activities
+        users: Mapping of hour to a HyperLogLog sketch of active users
+        daily: Whether to merge the users into the daily sketches as well
+    """
+    if counts:
+        # Make sure every row exists, then increment in place
+        ActivityRollup.objects.bulk_create(
+            [ActivityRollup(hour=hour, activity_type=activity_type) for hour, activity_type in counts],
+            ignore_conflicts=True
+        )
+        # Keys in a fixed order so concurrent writers lock rows in the same order
+        for (hour, activity_type), count in sorted(counts.items()):
+            ActivityRollup.objects.filter(hour=hour, activity_type=activity_type).update(count=F('count') + count)
+
+    if users:
+        _merge_sketches(ActivityUserSketch, 'hour', users)
+        if daily:
+            days = defaultdict(HyperLogLog)
+            for hour, sketch in users.items():
+                days[hour.date()].merge(sketch)
+            _merge_sketches(ActivityDailyUserSketch, 'day', days)
+
+
+def _rebuild_daily(days):
+    """Recompute the daily sketches of ``days`` from the hourly sketches."""
+    for day in sorted(days):
+        merged = HyperLogLog()
+        hourly = ActivityUserSketch.objects.filter(hour__gte=_day_start(day), hour__lt=_day_start(day + timedelta(days=1)))
+        for data in hourly.values_list('sketch', flat=True):
+            merged.merge(HyperLogLog.from_bytes(data))
+        ActivityDailyUserSketch.objects.update_or_create(day=day, defaults={'sketch': merged.to_bytes()})
+
+
+def record_activities(activities):
+    """Add newly written activities to the rollups."""
+    counts = Counter()
+    users = defaultdict(HyperLogLog)
+    for activity in activities:
+        hour = hour_of(activity.created_at)
+        counts[hour, activity.activity_type] += 1
+        if activity.user_id:
+            users[hour].add(activity.user_id)
+    _store(counts, users)
+
+
+def merged_sketch(start=None, end=None):
+    """
+    Sketch of the users active between ``start`` and ``end``.
+
+    Whole UTC days in the range are read from the daily sketches and only
+    the hours of partial days from the hourly ones.
+    """
+    start = hour_of(start) if start is not None else None
+    first_day = None
+    if start is not None:
+        first_day = start.date() if start.hour == 0 else start.date() + timedelta(days=1)
+    last_day = end.date() if end is not None else None
+
+    hourly = ActivityUserSketch.objects.none()
+    daily = ActivityDailyUserSketch.objects.none()
+    if first_day is not None and last_day is not None and first_day >= last_day:
+        # Within a single day
+        hourly = ActivityUserSketch.objects.filter(hour__gte=start, hour__lt=end)
+    else:
+        daily = ActivityDailyUserSketch.objects.all()
+        if first_day is not None:
+            daily = daily.filter(day__gte=first_day)
+        if last_day is not None:
+            daily = daily.filter(day__lt=last_day)
+        edges = Q()
+        if start is not None:
+            edges |= Q(hour__gte=start, hour__lt=_day_start(first_day))
+        if end is not None:
+            edges |= Q(hour__gte=_day_start(last_day), hour__lt=end)
+        if edges:
+            hourly = ActivityUserSketch.objects.filter(edges)
+
+    merged = HyperLogLog()
+    for sketches in (daily, hourly):
+        for data in sketches.values_list('sketch', flat=True).iterator():
+            merged.merge(HyperLogLog.from_bytes(data))
+    return merged
+
+
+def summarize(days=7, now=None):
+    """
+    Activity summary from the rollups.
+
+    Returns:
+        dict: 'by_type' and 'total_activities' over all rollups,
+            'daily_activity' and 'unique_users' (approximate) over the last
+            ``days`` days
+    """
+    now = now or timezone.now()
+    start = now - timedelta(days=days)
+
+    by_type = list(
+        ActivityRollup.objects
+        .values('activity_type')
+        .annotate(count=Sum('count'), label=F('activity_type'))
+        .order_by('activity_type')
+    )
+    daily_activity = list(
+        ActivityRollup.objects
+        .filter(hour__gte=hour_of(start))
+        .annotate(date=TruncDay('hour'))
+        .values('date')
+        .annotate(count=Sum('count'))
+        .order_by('date')
+    )
+    return {
+        'by_type': by_type,
+        'daily_activity': daily_activity,
+        'total_activities': sum(row['count'] for row in by_type),
+        'unique_users': merged_sketch(start).count(),
+    }
+
+
+def _exact(start, end):
+    activities = ActivityLog.objects.filter(created_at__gte=start, created_at__lt=end)
+    counts = {
+        (row['hour'], row['activity_type']): row['count']
+        for row in (
+            activities
+            .annotate(hour=TruncHour('created_at', tzinfo=dt_timezone.utc))
+            .values('hour', 'activity_type')
+            .annotate(count=Count('pk'))
+            .order_by()
+        )
+    }
+    return activities, counts
+
+
+@transaction.atomic
+def rebuild_rollups(start, end):
+    """
+    Recompute the rollups of the hours from ``start`` to ``end`` from the activity log.
+
+    Returns:
+        int: Number of activities counted
+    """
+    start, end = hour_of(start), hour_of(end)
+    activities, counts = _exact(start, end)
+
+    users = defaultdict(HyperLogLog)
+    rows = (
+        activities.exclude(user__isnull=True)
+        .annotate(hour=TruncHour('created_at', tzinfo=dt_timezone.utc))
+        .values_list('hour', 'user_id')
+        .distinct()
+    )
+    for hour, user_id in rows.iterator(chunk_size=5000):
+        users[hour].add(user_id)
+
+    ActivityRollup.objects.filter(hour__gte=start, hour__lt=end).delete()
+    ActivityUserSketch.objects.filter(hour__gte=start, hour__lt=end).delete()
+    _store(counts, users, daily=False)
+    _rebuild_daily({start.date() + timedelta(days=offset) for offset in range((end - start).days + 1)})
+    return sum(counts.values())
+
+
+def verify_rollups(start, end):
+    """
+    Compare the rollups of a range of hours with exact figures.
+
+    Returns:
+        dict: 'counts_match' (bool), 'mismatched_hours' (list of
+            ``(hour, activity_type, rollup, exact)``), 'unique_users' and
+            'unique_users_estimate', their 'relative_error', the accepted
+            'error_bound' and whether the estimate is 'within_bound'
+    """
+    start, end = hour_of(start), hour_of(end)
+    activities, exact_counts = _exact(start, end)
+    rollup_counts = {
+        (row.hour, row.activity_type): row.count
+        for row in ActivityRollup.objects.filter(hour__gte=start, hour__lt=end)
+    }
+    mismatched = [
+        (hour, activity_type, rollup_counts.get((hour, activity_type), 0), exact_counts.get((hour, activity_type), 0))
+        for hour, activity_type in sorted(set(exact_counts) | set(rollup_counts))
+        if rollup_counts.get((hour, activity_type), 0) != exact_counts.get((hour, activity_type), 0)
+    ]
+
+    exact_users = activities.exclude(user__isnull=True).values('user').distinct().count()
+    sketch = merged_sketch(start, end)
+    estimate = sketch.count()
+    relative_error = abs(estimate - exact_users) / exact_users if exact_users else float(estimate)
+    error_bound = ERROR_BOUND_SIGMAS * sketch.error
+    return {
+        'counts_match': not mismatched,
+        'mismatched_hours': mismatched,
+        'unique_users': exact_users,
+        'unique_users_estimate': estimate,
+        'relative_error': relative_error,
+        'error_bound': error_bound,
+        'within_bound': relative_error <= error_bound,
+    }
+
+
+def prune_rollups(before):
+    """Delete the rollups of the hours before ``before``."""
+    ActivityRollup.objects.filter(hour__lt=before).delete()
+    ActivityUserSketch.objects.filter(hour__lt=before).delete()
+    ActivityDailyUserSketch.objects.filter(day__lt=hour_of(before).date()).delete()
@@ -1,9 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import ActivityLog,ActivityType
+from .models import ActivityType
 from .utils import log_activity
 
 User = get_user_model()
@@ -52,79 +52,3 @@ def log_user_activity(sender, instance, created, **kwargs):
                 'updated_fields': getattr(instance, '_updated_fields', [])
             }
         )
-
-@receiver(post_save)
-def log_model_activity(sender, instance, created, **kwargs):
-    """Log generic model creation and updates."""
-    # Skip logging for these models
-    if sender._meta.app_label in ['sessions', 'admin', 'contenttypes', 'auth', 'authtoken', 'django_celery_beat']:
-        return
-    
-    # Skip logging for ActivityLog itself to avoid infinite recursion
-    if sender == ActivityLog:
-        return
-    
-    model_name = sender.__name__
-    
-    # Skip if the model doesn't have an id field or if it's a PeriodicTasks model
-    if not hasattr(instance, 'id') or model_name == 'PeriodicTasks':
-        return
-    
-    if created:
-        activity_type = ActivityType.CREATE
-        details = {}
-    else:
-        activity_type = ActivityType.UPDATE
-        # Get changed fields if available
-        if hasattr(instance, '_updated_fields'):
-            details = {field: getattr(instance, field, None) 
-                     for field in instance._updated_fields 
-                     if field not in ['last_login', 'updated_at']}
-        else:
-            details = {}
-    
-    # Get user from common fields
-    user = getattr(instance, 'user', None) or getattr(instance, 'created_by', None)
-    
-    # Only log if we have a user and the model has an id
-    if user and hasattr(instance, 'id'):
-        log_activity(
-            user=user,
-            activity_type=activity_type,
-            object_type=model_name,
-            object_id=instance.id,
-            details=details
-        )
-
-@receiver(post_delete)
-def log_model_deletion(sender, instance, **kwargs):
-    """Log model deletions."""
-    # Skip logging for these models
-    if sender._meta.app_label in ['sessions', 'admin', 'contenttypes', 'auth', 'authtoken', 'django_celery_beat']:
-        return
-    
-    # Skip logging for ActivityLog itself to avoid infinite recursion
-    if sender == ActivityLog:
-        return
-    
-    model_name = sender.__name__
-    
-    # Skip if the model doesn't have an id field or if it's a PeriodicTasks model
-    if not hasattr(instance, 'id') or model_name == 'PeriodicTasks':
-        return
-    
-    # Get user from common fields
-    user = getattr(instance, 'user', None) or getattr(instance, 'created_by', None)
-    
-    # Only log if we have a user and the model has an id
-    if user and hasattr(instance, 'id'):
-        log_activity(
-            user=user,
-            activity_type=ActivityType.DELETE,
-            object_type=model_name,
-            object_id=instance.id,
-            details={
-                'deleted_at': timezone.now().isoformat(),
-                'deleted_object': str(instance)
-            }
-        )
@@ -0,0 +1,64 @@
+import os
+from datetime import datetime, time
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import QueryDict
+from django.utils import timezone
+
+from .export import export_max_age, prune_exports, write_export
+from .filters import filter_activities
+from .models import ActivityLog
+from .partitions import maintain_partitions, month_start
+from .rollups import prune_rollups
+from apps.notifications.utils import send_notification
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def maintain_activity_log_partitions():
+    """Create upcoming activity log partitions and drop the ones past retention."""
+    retention_months = getattr(settings, 'ACTIVITY_LOG_RETENTION_MONTHS', 12)
+    result = maintain_partitions(
+        ahead=getattr(settings, 'ACTIVITY_LOG_PARTITIONS_AHEAD', 3),
+        retention_months=retention_months,
+    )
+    if retention_months:
+        # Rollups expire with the activities they summarize
+        oldest_kept = month_start(timezone.localdate(), -retention_months)
+        prune_rollups(timezone.make_aware(datetime.combine(oldest_kept, time.min)))
+    return {
+        'created': [f'{month:%Y-%m}' for month in result['created']],
+        'dropped': [f'{month:%Y-%m}' for month in result['dropped']],
+    }
+
+
+@shared_task
+def export_activity_logs(user_id, query_string, export_format='csv'):
+    """
+    Write an activity log export to a gzip file and notify the requester.
+
+    Args:
+        user_id: ID of the user who requested the export
+        query_string: Filters of the export, as accepted by the activity log API
+        export_format: 'csv' or 'ndjson'
+    """
+    user = get_user_model().objects.get(id=user_id)
+    pruned = prune_exports(export_max_age())
+    if pruned:
+        logger.info(f"Removed {pruned} expired activity log exports")
+
+    queryset = filter_activities(ActivityLog.objects.all(), QueryDict(query_string))
+    name = write_export(queryset, export_format)
+    url = f"{settings.MEDIA_URL}{name.replace(os.sep, '/')}"
+    logger.info(f"Activity log export written for user {user_id}: {name}")
+
+    send_notification(
+        recipient=user,
+        message=f"Your activity log export is ready: {url}",
+        notification_type='activity_log_export',
+    )
+    return url
@@ -0,0 +1,31 @@
+from django.test import SimpleTestCase
+
+from .hll import HyperLogLog
+
+
+class HyperLogLogTests(SimpleTestCase):
+    """Test the HyperLogLog sketch used for distinct user counts."""
+
+    def test_small_cardinality_is_exact_enough(self):
+        sketch = HyperLogLog().update(range(50))
+        self.assertAlmostEqual(sketch.count(), 50, delta=1)
+
+    def test_estimate_within_error_bound(self):
+        sketch = HyperLogLog().update(f'user-{i}' for i in range(100000))
+        self.assertLessEqual(abs(sketch.count() - 100000) / 100000, 3 * sketch.error)
+
+    def test_duplicates_are_not_counted(self):
+        sketch = HyperLogLog().update(['a', 'b', 'a', 'b', 'a'])
+        self.assertEqual(sketch.count(), 2)
+
+    def test_merge_is_union(self):
+        first = HyperLogLog().update(range(0, 6000))
+        second = HyperLogLog().update(range(3000, 9000))
+        merged = HyperLogLog.from_bytes(first.to_bytes()).merge(second)
+        self.assertLessEqual(abs(merged.count() - 9000) / 9000, 3 * merged.error)
+
+    def test_serialization_round_trip(self):
+        sketch = HyperLogLog(precision=10).update(range(1000))
+        restored = HyperLogLog.from_bytes(sketch.to_bytes())
+        self.assertEqual(restored.precision, 10)
+        self.assertEqual(restored.registers, sketch.registers)
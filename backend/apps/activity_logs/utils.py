@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from ipware import get_client_ip
 
+from .buffer import get_buffer
 from .models import ActivityLog, ActivityType
+from .rollups import record_activities
 
 User = get_user_model()
 
@@ -12,10 +15,15 @@ def log_activity(
     request=None,
     object_type=None,
     object_id=None,
-    details=None
+    details=None,
+    organization=None
 ):
     """
     Log an activity to the database.
+
+    With ``ACTIVITY_LOG_BUFFERED`` enabled the activity is queued and written
+    in a later batch (see ``apps.activity_logs.buffer``); the returned
+    instance is then not saved yet.
     
     Args:
         user: The user performing the action (can be None for system actions)
@@ -24,6 +32,8 @@ def log_activity(
         object_type: Type of the object being acted upon (e.g., 'User', 'Project')
         object_id: ID of the object being acted upon
         details: Additional details about the activity (will be stored as JSON)
+        organization: The organization (or its id) the activity belongs to
+            (optional, used to scope the organization activity feed)
     """
     ip_address = None
     user_agent = None
@@ -34,14 +44,22 @@ def log_activity(
         if not user and hasattr(request, 'user') and request.user.is_authenticated:
             user = request.user
     
-    activity = ActivityLog.objects.create(
+    activity = ActivityLog(
         user=user if user and user.is_authenticated else None,
         activity_type=activity_type,
         ip_address=ip_address,
         user_agent=user_agent,
         object_type=object_type,
         object_id=str(object_id) if object_id else None,
-        details=details or {}
+        details=details or {},
+        organization_id=getattr(organization, 'pk', organization),
+        created_at=timezone.now()
     )
+
+    if getattr(settings, 'ACTIVITY_LOG_BUFFERED', True):
+        get_buffer().add(activity)
+    else:
+        activity.save()
+        record_activities([activity])
     
     return activity
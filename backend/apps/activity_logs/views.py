@@ -1,11 +1,19 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db.models import Q
+from django.http import StreamingHttpResponse
 
-from .models import ActivityLog, ActivityType
+from .export import FORMATS, export_filename, export_lines
+from .filters import filter_activities
+from .models import ActivityLog
+from .rollups import summarize
 from .serializers import ActivityLogSerializer
+from .tasks import export_activity_logs
 from apps.users.permissions import IsSuperAdmin
+from backend.pagination import CreatedAtCursorPagination
+
+# Each day of the summary merges one user sketch
+MAX_SUMMARY_DAYS = 90
 
 class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -13,32 +21,12 @@ class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAuthenticated, IsSuperAdmin]
+    pagination_class = CreatedAtCursorPagination
     
     def get_queryset(self):
-        # Only show logs from the last 30 days by default
         queryset = ActivityLog.objects.all().select_related('user')
-        
-        # Filter by user if specified
-        user_id = self.request.query_params.get('user_id')
-        if user_id:
-            queryset = queryset.filter(user_id=user_id)
-            
-        # Filter by activity type if specified
-        activity_type = self.request.query_params.get('activity_type')
-        if activity_type in dict(ActivityType.choices):
-            queryset = queryset.filter(activity_type=activity_type)
-            
-        # Search in details if search parameter is provided
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(user__username__icontains=search) |
-                Q(user__email__icontains=search) |
-                Q(details__icontains=search) |
-                Q(object_type__icontains=search) |
-                Q(ip_address__icontains=search)
-            )
-            
+        # Structured filters and full-text search (see filters.py)
+        queryset = filter_activities(queryset, self.request.query_params)
         return queryset.order_by('-created_at')
     
     @action(detail=False, methods=['get'])
@@ -55,33 +43,62 @@ class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     def summary(self, request):
         """
         Get summary statistics for activities.
+
+        Served from the hourly rollups; ``unique_users`` is an approximate
+        count of the users active in the last ``days`` days (default 7, at
+        most ``MAX_SUMMARY_DAYS``).
         """
-        from django.db.models import Count, F, Value
-        from django.db.models.functions import TruncDay, TruncHour
-        
-        # Activity counts by type
-        by_type = ActivityLog.objects.values('activity_type').annotate(
-            count=Count('activity_type'),
-            label=F('activity_type')
-        )
-        
-        # Activities per day for the last 7 days
-        from datetime import datetime, timedelta
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=7)
-        
-        daily_activity = (
-            ActivityLog.objects
-            .filter(created_at__date__gte=start_date.date())
-            .annotate(date=TruncDay('created_at'))
-            .values('date')
-            .annotate(count=Count('id'))
-            .order_by('date')
+        try:
+            days = min(max(int(request.query_params.get('days', 7)), 1), MAX_SUMMARY_DAYS)
+        except ValueError:
+            return Response({'error': 'days must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summarize(days=days))
+
+    def _export_format(self, request):
+        # Not ?format=, which DRF uses to pick a renderer
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        if export_format not in FORMATS:
+            return None
+        return export_format
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the activities matching the list filters as CSV or NDJSON.
+
+        ``?export_format=csv`` (default) or ``ndjson``. Rows are read with a
+        server-side cursor and written as they are read, so memory use does
+        not depend on the number of activities exported.
+        """
+        export_format = self._export_format(request)
+        if export_format is None:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        content_type, _ = FORMATS[export_format]
+        response = StreamingHttpResponse(
+            export_lines(self.get_queryset(), export_format),
+            content_type=content_type
         )
-        
-        return Response({
-            'by_type': list(by_type),
-            'daily_activity': list(daily_activity),
-            'total_activities': ActivityLog.objects.count(),
-            'unique_users': ActivityLog.objects.values('user').distinct().count()
-        })
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(export_format)}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='export/async')
+    def export_async(self, request):
+        """
+        Write the export to a gzip file in the background.
+
+        Takes the same query parameters as ``export``; the requester gets a
+        notification with the file's URL when it is ready.
+        """
+        export_format = self._export_format(request)
+        if export_format is None:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Reject invalid filters now rather than in the worker
+        self.get_queryset()
+        export_activity_logs.delay(request.user.id, request.query_params.urlencode(), export_format)
+        return Response({'status': 'export started'}, status=status.HTTP_202_ACCEPTED)
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.utils import timezone
+from model_utils import FieldTracker
 from apps.users.models import User
 from apps.organization.models import Organization, OrganizationMember, OrganizationRoleChoices
 
@@ -63,6 +64,9 @@ class Client(models.Model):
 
     def __str__(self):
         return self.name
+    
+    # Track changes to these fields
+    tracker = FieldTracker(fields=['status', 'salesperson', 'organization'])
         
     class Meta:
         ordering = ['-created_at']
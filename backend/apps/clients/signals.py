@@ -1,10 +1,46 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import Client
 from .tasks import notify_salesperson_async
+from apps.dashboard import rollups
+from apps.dashboard.models import StatusRollup
+from apps.payments import ledger
 
 @receiver(post_save, sender=Client)
 def notify_salesperson_on_client_creation(sender, instance, created, **kwargs):
     if created and instance.salesperson:
         # Delegate to Celery task for async processing
         notify_salesperson_async.delay(instance.id)
+
+@receiver(post_save, sender=Client)
+def update_client_rollups(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the dashboard status rollups in sync with client changes
+    """
+    if raw:
+        return
+    rollups.record_save(StatusRollup.ENTITY_CLIENT, instance, created)
+
+@receiver(post_delete, sender=Client)
+def remove_client_from_rollups(sender, instance, **kwargs):
+    """
+    Remove a deleted client from the dashboard status rollups
+    """
+    rollups.record_delete(StatusRollup.ENTITY_CLIENT, instance)
+
+@receiver(post_save, sender=Client)
+def update_client_revenue(sender, instance, created, raw=False, **kwargs):
+    """
+    Re-attribute a client's revenue in the ledger when its organization or
+    salesperson changes
+    """
+    if raw or created:
+        return
+    tracker = instance.tracker
+    if not (tracker.has_changed('organization') or tracker.has_changed('salesperson')):
+        return
+    ledger.move_client_revenue(
+        instance,
+        (tracker.previous('organization'), tracker.previous('salesperson')),
+        (instance.organization_id, instance.salesperson_id)
+    )
@@ -8,15 +8,20 @@ from django.conf import settings
 import logging
 
 from .permissions import IsSuperAdmin, IsOrganizationAdmin
+from .models import StatusRollup
+from .rollups import get_status_counts
+from .stats import DashboardStats
+from .timeseries import growth_series, period_start
+from .cache import GLOBAL_SCOPE, get_cached_dashboard
 
 from apps.users.models import User
-from apps.organization.models import Organization, OrganizationMember
+from apps.organization.models import Organization, OrganizationMember, OrganizationRoleChoices
 from apps.projects.models import Project
-from apps.projects.tasks import Task
 
 from apps.clients.models import Client
 from apps.support.models import SupportTicket
 from apps.payments.models import Payment
+from apps.activity_logs.feed import get_feed_page, get_feed_queryset, serialize_activity
 
 logger = logging.getLogger(__name__)
 
@@ -52,13 +57,21 @@ class BaseDashboardView(APIView):
         }
     
     def get_common_context(self, request):
-        """Get common context for all dashboard views."""
-        context = {
-            'user': request.user,
-            'time_periods': self.get_time_periods(),
-            'now': timezone.now()
-        }
-        context.update(self.get_organization_context(request.user))
+        """
+        Get common context for all dashboard views.
+        
+        The context is resolved once per request; batched widget requests
+        share the context of their batch.
+        """
+        context = getattr(request, 'dashboard_context', None)
+        if context is None:
+            context = {
+                'user': request.user,
+                'time_periods': self.get_time_periods(),
+                'now': timezone.now()
+            }
+            context.update(self.get_organization_context(request.user))
+            request.dashboard_context = context
         return context
 
 
@@ -95,103 +108,9 @@ class SuperAdminDashboardView(BaseDashboardView):
                     status=status.HTTP_403_FORBIDDEN
                 )
             
-            # Get time period data
-            logger.info("Getting time periods...")
-            time_periods = self.get_time_periods()
-            logger.info(f"Time periods: {time_periods}")
-            
-            # Get all users and organizations for metrics
-            logger.info("Querying users and organizations...")
-            users = User.objects.all()
-            orgs = Organization.objects.all()
-            
-            # Log basic counts
-            logger.info(f"Total users: {users.count()}")
-            logger.info(f"Total organizations: {orgs.count()}")
-            
-            # Calculate metrics with detailed error handling
-            try:
-                logger.info("Counting active projects...")
-                try:
-                    active_projects = Project.objects.filter(is_verified=True).count()
-                    logger.info(f"Found {active_projects} active projects")
-                except Exception as e:
-                    logger.error(f"Error counting active projects: {str(e)}", exc_info=True)
-                    active_projects = 0
-                
-                logger.info("Calculating member growth...")
-                try:
-                    member_growth = users.filter(
-                        date_joined__date__gte=time_periods['month_ago']
-                    ).count()
-                    logger.info(f"Found {member_growth} new members")
-                except Exception as e:
-                    logger.error(f"Error calculating member growth: {str(e)}", exc_info=True)
-                    member_growth = 0
-                
-                logger.info("Calculating project completion rate...")
-                try:
-                    completion_rate = self._calculate_project_completion_rate()
-                    logger.info(f"Project completion rate: {completion_rate}%")
-                except Exception as e:
-                    logger.error(f"Error calculating completion rate: {str(e)}", exc_info=True)
-                    completion_rate = 0
-                
-                # Basic metrics that are less likely to fail
-                try:
-                    total_orgs = orgs.count()
-                    total_users = users.count()
-                    
-                    metrics = {
-                        'total_organizations': total_orgs,
-                        'total_members': total_users,
-                        'active_projects': active_projects,
-                        'monthly_revenue': 0,  # This would come from payment data
-                        'team_productivity': 75,  # Example value
-                        'member_growth': member_growth,
-                        'project_completion_rate': completion_rate
-                    }
-                    logger.info(f"Successfully calculated all metrics: {metrics}")
-                    
-                except Exception as e:
-                    logger.error(f"Error assembling metrics dictionary: {str(e)}", exc_info=True)
-                    raise
-                
-            except Exception as metrics_error:
-                logger.error(f"Critical error in metrics calculation: {str(metrics_error)}", exc_info=True)
-                return Response(
-                    {
-                        'error': 'Failed to calculate dashboard metrics',
-                        'debug': str(metrics_error)
-                    }, 
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            
-            # Format member activity data
-            member_activity = self._get_member_activity(time_periods)
-            
-            # Format project status data
-            project_status = self._get_project_status()
-            
-            # Get recent activities
-            recent_activities = self.get_recent_activities()
-            
-            response_data = {
-                'metrics': {
-                    'total_organizations': metrics['total_organizations'],
-                    'total_members': metrics['total_members'],
-                    'active_projects': metrics['active_projects'],
-                    'monthly_revenue': metrics['monthly_revenue'],
-                    'team_productivity': metrics['team_productivity'],
-                    'member_growth': metrics['member_growth'],
-                    'project_completion_rate': metrics['project_completion_rate']
-                },
-                'member_activity': member_activity,
-                'project_status': project_status,
-                'recent_activities': recent_activities,
-                'timestamp': time_periods['now'].isoformat()
-            }
-            
+            response_data = get_cached_dashboard(
+                'superadmin', GLOBAL_SCOPE, self._build_dashboard_data
+            )
             return Response(response_data)
             
         except Exception as e:
@@ -203,48 +122,130 @@ class SuperAdminDashboardView(BaseDashboardView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-    def _calculate_project_completion_rate(self):
+    def _build_dashboard_data(self):
+        """Compute the dashboard payload (cached by ``get``)."""
+        # Get time period data
+        logger.info("Getting time periods...")
+        time_periods = self.get_time_periods()
+        logger.info(f"Time periods: {time_periods}")
+
+        # Get user, organization and project counts for metrics
+        logger.info("Querying users, organizations and projects...")
+        user_stats = (
+            DashboardStats(User.objects.all())
+            .count('total')
+            .count('member_growth', date_joined__date__gte=time_periods['month_ago'])
+            .evaluate()
+        )
+        project_stats = self._get_project_stats()
+        total_orgs = Organization.objects.count()
+
+        # Log basic counts
+        logger.info(f"Total users: {user_stats['total']}")
+        logger.info(f"Total organizations: {total_orgs}")
+
+        # Calculate metrics with detailed error handling
+        try:
+            active_projects = project_stats['active']
+            logger.info(f"Found {active_projects} active projects")
+
+            member_growth = user_stats['member_growth']
+            logger.info(f"Found {member_growth} new members")
+
+            logger.info("Calculating project completion rate...")
+            completion_rate = self._calculate_project_completion_rate(project_stats)
+            logger.info(f"Project completion rate: {completion_rate}%")
+
+            # Basic metrics that are less likely to fail
+            try:
+                total_users = user_stats['total']
+
+                metrics = {
+                    'total_organizations': total_orgs,
+                    'total_members': total_users,
+                    'active_projects': active_projects,
+                    'monthly_revenue': 0,  # This would come from payment data
+                    'team_productivity': 75,  # Example value
+                    'member_growth': member_growth,
+                    'project_completion_rate': completion_rate
+                }
+                logger.info(f"Successfully calculated all metrics: {metrics}")
+
+            except Exception as e:
+                logger.error(f"Error assembling metrics dictionary: {str(e)}", exc_info=True)
+                raise
+
+        except Exception as metrics_error:
+            logger.error(f"Critical error in metrics calculation: {str(metrics_error)}", exc_info=True)
+            raise
+
+        # Format member activity data
+        member_activity = self._get_member_activity(time_periods)
+
+        # Format project status data
+        project_status = self._get_project_status()
+
+        # Get recent activities
+        recent_activities = self.get_recent_activities()
+
+        response_data = {
+            'metrics': {
+                'total_organizations': metrics['total_organizations'],
+                'total_members': metrics['total_members'],
+                'active_projects': metrics['active_projects'],
+                'monthly_revenue': metrics['monthly_revenue'],
+                'team_productivity': metrics['team_productivity'],
+                'member_growth': metrics['member_growth'],
+                'project_completion_rate': metrics['project_completion_rate']
+            },
+            'member_activity': member_activity,
+            'project_status': project_status,
+            'recent_activities': recent_activities,
+            'timestamp': time_periods['now'].isoformat()
+        }
+
+        return response_data
+    
+    def _get_project_stats(self):
+        """Get project totals used by the overview metrics in one query."""
+        return (
+            DashboardStats(Project.objects.all())
+            .count('total')
+            .count('active', is_verified=True)
+            .count('completed', status='completed')
+            .evaluate()
+        )
+    
+    def _calculate_project_completion_rate(self, project_stats=None):
         """Calculate the percentage of completed projects."""
-        total_projects = Project.objects.count()
-        if total_projects == 0:
+        project_stats = project_stats or self._get_project_stats()
+        if project_stats['total'] == 0:
             return 0
             
-        completed_projects = Project.objects.filter(status='completed').count()
-        return round((completed_projects / total_projects) * 100, 1)
+        return round((project_stats['completed'] / project_stats['total']) * 100, 1)
         
     def _get_member_activity(self, time_periods):
-        """Get member activity data for the last 6 months."""
-        six_months_ago = time_periods['now'] - timedelta(days=180)
-        
-        # Get new users per month for the last 6 months
-        from django.db.models.functions import TruncMonth
-        
-        new_users = User.objects.filter(
-            date_joined__gte=six_months_ago
-        ).annotate(
-            month=TruncMonth('date_joined')
-        ).values('month').annotate(
-            count=Count('id')
-        ).order_by('month')
-        
-        # Format for the frontend
-        member_activity = []
-        for item in new_users:
-            member_activity.append({
-                'month': item['month'].strftime('%Y-%m'),
-                'active': 0,  # This would require tracking active users
-                'new': item['count']
-            })
-            
-        return member_activity
+        """Get new and total users per month for the last 6 months (single query)."""
+        now = time_periods['now']
+        return [
+            {
+                'month': item['period'].strftime('%Y-%m'),
+                'active': item['total'],
+                'new': item['new']
+            }
+            for item in growth_series(User.objects.all(), 'date_joined', period_start(6, end=now), end=now)
+        ]
         
     def _get_project_status(self):
-        """Get project status breakdown."""
-        from django.db.models import Count
-        
-        status_counts = Project.objects.values('status').annotate(
-            count=Count('id')
-        )
+        """Get project status breakdown (from the rollups)."""
+        status_counts = [
+            {'status': value, 'count': count}
+            for value, count in get_status_counts(
+                StatusRollup.ENTITY_PROJECT,
+                assignee__isnull=True
+            ).items()
+            if count
+        ]
         
         status_map = {
             'not_started': { 'name': 'Not Started', 'color': '#9CA3AF' },
@@ -340,28 +341,46 @@ class OrganizationAdminDashboardView(BaseDashboardView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        time_periods = context['time_periods']
-        
-        # Member statistics
+        response_data = get_cached_dashboard(
+            'organization_admin',
+            organization.id,
+            lambda: self._build_dashboard_data(organization, context['time_periods']),
+            role=OrganizationRoleChoices.ADMIN
+        )
+        return Response(response_data)
+    
+    def _build_dashboard_data(self, organization, time_periods):
+        """Compute the dashboard payload of an organization (cached by ``get``)."""
+        # Member statistics (the total is derived from the per-role counts)
         members = OrganizationMember.objects.filter(organization=organization)
+        by_role = list(members.values('role').annotate(count=Count('id')).order_by('role'))
         member_stats = {
-            'total': members.count(),
-            'by_role': list(members.values('role').annotate(count=Count('id')))
+            'total': sum(item['count'] for item in by_role),
+            'by_role': by_role
         }
         
-        # Project statistics - filter projects through the client relationship
-        projects = Project.objects.filter(client__organization=organization)
+        # Project statistics - status counts come from the rollups, projects
+        # belong to the organization through their client
+        status_counts = get_status_counts(
+            StatusRollup.ENTITY_PROJECT,
+            organization=organization,
+            assignee__isnull=True
+        )
         project_stats = {
-            'total': projects.count(),
-            'active': projects.filter(status='in_progress').count(),
-            'completed': projects.filter(status='completed').count(),
-            'overdue': projects.filter(deadline__lt=time_periods['today'], status='in_progress').count()
+            'total': sum(status_counts.values()),
+            'active': status_counts['in_progress'],
+            'completed': status_counts['completed'],
+            'overdue': Project.objects.filter(
+                client__organization=organization,
+                deadline__lt=time_periods['today'],
+                status='in_progress'
+            ).count()
         }
         
         # Recent activities
         recent_activities = self.get_recent_activities(organization)
         
-        return Response({
+        return {
             'organization': {
                 'id': str(organization.id),
                 'name': organization.name,
@@ -371,29 +390,9 @@ class OrganizationAdminDashboardView(BaseDashboardView):
             'project_stats': project_stats,
             'recent_activities': recent_activities,
             'timestamp': time_periods['now'].isoformat()
-        })
+        }
     
     def get_recent_activities(self, organization, limit=10):
         """Get recent activities for the organization."""
-        activities = []
-        
-        # Recent project updates - filter through client relationship
-        recent_projects = Project.objects.filter(
-            client__organization=organization
-        ).order_by('-updated_at')[:5]
-        
-        for project in recent_projects:
-            activities.append({
-                'type': 'project_update',
-                'project': {
-                    'id': str(project.id),
-                    'name': project.name,
-                    'status': project.status
-                },
-                'timestamp': project.updated_at.isoformat(),
-                'message': f"Project '{project.name}' was updated"
-            })
-        
-        # Sort by timestamp and return limited results
-        activities.sort(key=lambda x: x['timestamp'], reverse=True)
-        return activities[:limit]
+        page = get_feed_page(get_feed_queryset(organization=organization), page_size=limit)
+        return [serialize_activity(activity) for activity in page['results']]
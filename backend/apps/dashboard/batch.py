@@ -0,0 +1,156 @@
+"""
+Batched evaluation of dashboard widgets.
+
+A dashboard page used to call several dashboard endpoints one after the
+other, each paying for authentication, permission checks and middleware.
+``run_widgets`` evaluates any number of those endpoints ("widgets") for one
+already-authenticated request: each widget runs its view's permission checks
+and handler against a lightweight copy of the request, and independent
+widgets run concurrently in a bounded thread pool, so the batch takes about
+as long as its slowest widget.
+
+The organization context of the user is resolved once and shared by all
+widgets of the batch (see ``BaseDashboardView.get_common_context``).
+"""
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.http import QueryDict
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.request import Request
+
+from .base_views import BaseDashboardView
+
+logger = logging.getLogger(__name__)
+
+# Dashboard URL names that can be requested as widgets
+WIDGETS = (
+    'superadmin-overview',
+    'admin-overview',
+    'manager-overview',
+    'developer-overview',
+    'sales-overview',
+    'support-overview',
+    'verifier-overview',
+    'activities',
+    'user-profile',
+    'user-notifications',
+    'global-search',
+    'system-health',
+)
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'DASHBOARD_BATCH_WORKERS', 4),
+            thread_name_prefix='dashboard-widget'
+        )
+    return _executor
+
+
+def parse_widgets(items):
+    """
+    Normalize a list of widget specs.
+
+    Each item is either a widget name or a dict with a ``name`` and optional
+    ``params`` (query parameters passed to the widget).
+
+    Returns:
+        dict: Mapping of widget name to its query parameters
+
+    Raises:
+        ValueError: If an item is malformed or names an unknown widget
+    """
+    widgets = {}
+    for item in items:
+        if isinstance(item, str):
+            name, params = item, {}
+        elif isinstance(item, dict):
+            name, params = item.get('name'), item.get('params') or {}
+        else:
+            raise ValueError(f"Invalid widget: {item!r}")
+        if name not in WIDGETS:
+            raise ValueError(f"Unknown widget: {name!r}")
+        if not isinstance(params, dict):
+            raise ValueError(f"Invalid params for widget {name!r}")
+        widgets[name] = params
+    return widgets
+
+
+def _widget_request(request, path, params):
+    """Copy of ``request`` for one widget, reusing its authentication."""
+    http_request = copy.copy(request._request)
+    http_request.path = http_request.path_info = path
+    http_request.method = 'GET'
+    query = QueryDict(mutable=True)
+    for key, value in params.items():
+        if isinstance(value, (list, tuple)):
+            query.setlist(key, [str(item) for item in value])
+        else:
+            query[key] = str(value)
+    http_request.GET = query
+
+    widget_request = Request(http_request, authenticators=())
+    widget_request.user = request.user
+    widget_request.auth = request.auth
+    return widget_request
+
+
+def _run_widget(request, name, params):
+    """Evaluate one widget; returns ``{'status': ..., 'data': ...}``."""
+    path = reverse(f'dashboard:{name}')
+    view_class = resolve(path).func.view_class
+    view = view_class()
+    widget_request = _widget_request(request, path, params)
+    view.args, view.kwargs = (), {}
+    view.request = widget_request
+    view.headers = view.default_response_headers
+    view.format_kwarg = None
+
+    try:
+        view.initial(widget_request)
+        response = view.get(widget_request)
+    except Exception as exc:
+        try:
+            # Permission and validation errors become their usual responses
+            response = view.handle_exception(exc)
+        except Exception as e:
+            logger.error(f"Error evaluating dashboard widget {name}: {str(e)}", exc_info=True)
+            return {
+                'status': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                'data': {'error': 'An error occurred while fetching this widget'},
+            }
+    finally:
+        # Pool threads must not keep database connections between batches
+        connections.close_all()
+
+    return {'status': response.status_code, 'data': response.data}
+
+
+def run_widgets(request, widgets):
+    """
+    Evaluate widgets concurrently for an authenticated request.
+
+    Args:
+        request: The batch request (DRF Request)
+        widgets: Mapping of widget name to query parameters (see ``parse_widgets``)
+
+    Returns:
+        dict: Mapping of widget name to ``{'status': ..., 'data': ...}``
+    """
+    # Resolve the shared context up front; widget requests are copies of this one
+    request._request.dashboard_context = BaseDashboardView().get_common_context(request)
+
+    futures = {
+        name: _get_executor().submit(_run_widget, request, name, params)
+        for name, params in widgets.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
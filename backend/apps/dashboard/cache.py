@@ -0,0 +1,141 @@
+"""
+Versioned response cache for the admin dashboards.
+
+Cached payloads are keyed by view, scope (an organization id or
+``GLOBAL_SCOPE``), viewer role and the scope's current version number.
+Model signals (see ``apps.dashboard.signals``) bump the version of the
+affected organization and the global version after each committed change,
+so invalidation is a single ``incr`` and stale entries simply stop being
+read until they expire.
+
+When an entry is missing, only the request that wins a short-lived lock
+recomputes it. Concurrent requests are served the previous payload for the
+same view and scope if there is one, or wait briefly for the winner.
+
+Any cache backend error degrades to computing the payload directly.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = 'global'
+
+# Seconds a recomputation may hold the lock before another request may take over
+LOCK_TIMEOUT = 30
+# Seconds a request without the lock waits for the winner's result
+LOCK_WAIT = 5
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _version_key(scope):
+    return f'dashboard:version:{scope}'
+
+
+def get_version(scope):
+    """
+    Return the current cache version of ``scope``.
+
+    Versions start from the current time in milliseconds rather than 1, so a
+    version counter that was evicted never restarts at a number that older,
+    still cached entries were stored under.
+    """
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(scope):
+    """Invalidate every cached dashboard of ``scope``."""
+    key = _version_key(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version stored yet; the next read starts a fresh one
+        cache.add(key, int(time.time() * 1000), None)
+
+
+def bump_versions(organization_id=None):
+    """
+    Invalidate the dashboards affected by a change to an organization's data.
+
+    The global version is always bumped because the superadmin dashboard
+    aggregates across all organizations.
+    """
+    try:
+        if organization_id is not None:
+            bump_version(organization_id)
+        bump_version(GLOBAL_SCOPE)
+    except Exception as e:
+        logger.warning(f"Could not invalidate dashboard cache for organization {organization_id}: {str(e)}")
+
+
+def get_cached_dashboard(view_name, scope, compute, role=None, timeout=None):
+    """
+    Return the cached payload of a dashboard, computing it if needed.
+
+    Args:
+        view_name: Name identifying the dashboard view
+        scope: Organization id, or GLOBAL_SCOPE for cross-organization dashboards
+        compute: Callable returning the payload (must be picklable)
+        role: Role of the viewer, if the payload depends on it
+        timeout: Cache timeout in seconds (defaults to DASHBOARD_CACHE_TIMEOUT)
+
+    Returns:
+        The dashboard payload
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300)
+
+    base_key = f'dashboard:{view_name}:{scope}:{role or "any"}'
+    stale_key = f'{base_key}:latest'
+    try:
+        key = f'{base_key}:v{get_version(scope)}'
+        lock_key = f'{key}:lock'
+
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+
+        have_lock = cache.add(lock_key, 1, LOCK_TIMEOUT)
+        if not have_lock:
+            payload = cache.get(stale_key) or _wait_for(key)
+            if payload is not None:
+                return payload
+    except Exception as e:
+        logger.warning(f"Dashboard cache unavailable, computing {view_name} directly: {str(e)}")
+        return compute()
+
+    try:
+        payload = compute()
+        try:
+            # The unversioned copy outlives the versioned one so it can be
+            # served while the next version is being computed
+            cache.set(key, payload, timeout)
+            cache.set(stale_key, payload, timeout * 2)
+        except Exception as e:
+            logger.warning(f"Could not cache {view_name} dashboard: {str(e)}")
+        return payload
+    finally:
+        if have_lock:
+            try:
+                cache.delete(lock_key)
+            except Exception as e:
+                logger.warning(f"Could not release {view_name} dashboard cache lock: {str(e)}")
+
+
+def _wait_for(key):
+    """Poll for ``key`` while another request computes it."""
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+    return None
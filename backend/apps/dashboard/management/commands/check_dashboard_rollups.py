@@ -0,0 +1,54 @@
+"""
+Management command to verify the dashboard status rollups against the source tables.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.dashboard.rollups import ROLLUP_SPECS, check_rollups, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Compare the dashboard status rollups with the project, task, ticket and client tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            help='Only check the rollups of this organization (UUID)'
+        )
+        parser.add_argument(
+            '--entity-type',
+            action='append',
+            choices=sorted(ROLLUP_SPECS),
+            dest='entity_types',
+            help='Only check this entity type (can be repeated)'
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Rebuild the checked rollups if any counter is off'
+        )
+
+    def handle(self, *args, **options):
+        scope = {
+            'organization_id': options['organization'],
+            'entity_types': options['entity_types'],
+        }
+        mismatches = check_rollups(**scope)
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("Dashboard rollups are consistent"))
+            return
+
+        for key, stored, actual in mismatches:
+            self.stdout.write(
+                f"  {key.entity_type} org={key.organization_id} status={key.status} "
+                f"assignee={key.assignee_id}: stored {stored}, actual {actual}"
+            )
+
+        if options['fix']:
+            rebuild_rollups(**scope)
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(mismatches)} drifted counters"))
+            return
+
+        raise CommandError(
+            f"{len(mismatches)} dashboard rollup counters have drifted; "
+            f"rerun with --fix or use rebuild_dashboard_rollups"
+        )
@@ -0,0 +1,30 @@
+"""
+Management command to rebuild the dashboard status rollups from scratch.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.rollups import ROLLUP_SPECS, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard status rollups from the project, task, ticket and client tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            help='Only rebuild the rollups of this organization (UUID)'
+        )
+        parser.add_argument(
+            '--entity-type',
+            action='append',
+            choices=sorted(ROLLUP_SPECS),
+            dest='entity_types',
+            help='Only rebuild this entity type (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(
+            organization_id=options['organization'],
+            entity_types=options['entity_types']
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt dashboard rollups ({written} rows written)"))
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('organization', '0007_seed_subscription_plans'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('project', 'Project'), ('task', 'Task'), ('ticket', 'Support Ticket'), ('client', 'Client')], max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('assignee', models.ForeignKey(blank=True, help_text='Member the counted entities are assigned to (empty for totals)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='status_rollups', to='organization.organizationmember')),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='status_rollups', to='organization.organization')),
+            ],
+            options={
+                'verbose_name': 'Status Rollup',
+                'verbose_name_plural': 'Status Rollups',
+                'indexes': [models.Index(fields=['organization', 'entity_type'], name='dashboard_s_organiz_eda1b8_idx'), models.Index(fields=['assignee', 'entity_type'], name='dashboard_s_assigne_a6476b_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='statusrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('assignee__isnull', False), ('organization__isnull', False)), fields=('organization', 'entity_type', 'status', 'assignee'), name='dashboard_rollup_unique_org_assignee'),
+        ),
+        migrations.AddConstraint(
+            model_name='statusrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('assignee__isnull', True), ('organization__isnull', False)), fields=('organization', 'entity_type', 'status'), name='dashboard_rollup_unique_org_total'),
+        ),
+        migrations.AddConstraint(
+            model_name='statusrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('assignee__isnull', False), ('organization__isnull', True)), fields=('entity_type', 'status', 'assignee'), name='dashboard_rollup_unique_assignee'),
+        ),
+        migrations.AddConstraint(
+            model_name='statusrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('assignee__isnull', True), ('organization__isnull', True)), fields=('entity_type', 'status'), name='dashboard_rollup_unique_total'),
+        ),
+    ]
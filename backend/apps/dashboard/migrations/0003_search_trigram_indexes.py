@@ -0,0 +1,25 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:41
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_searchdocument_and_more'),
+        ('organization', '0007_seed_subscription_plans'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='dashboard_search_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['subtitle'], name='dashboard_search_subtitle_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
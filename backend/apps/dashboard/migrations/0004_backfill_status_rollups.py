@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def backfill_rollups(apps, schema_editor):
+    """
+    Count the projects, tasks, tickets and clients created before the rollups
+    existed, one entity type at a time.
+    """
+    from apps.dashboard.rollups import ROLLUP_SPECS, rebuild_rollups
+
+    for entity_type in ROLLUP_SPECS:
+        rebuild_rollups(entity_types=[entity_type])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_search_trigram_indexes'),
+        ('clients', '0002_initial'),
+        ('projects', '0001_initial'),
+        ('support', '0001_initial'),
+        ('tasks', '0002_task_tasks_task_created_5b4d0b_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def backfill_documents(apps, schema_editor):
+    """
+    Index the projects, tasks, clients, tickets and members created before
+    the search index existed.
+    """
+    from apps.dashboard.search import rebuild_index
+
+    rebuild_index(chunk_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_backfill_status_rollups'),
+        ('organization', '0007_seed_subscription_plans'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
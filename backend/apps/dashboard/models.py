@@ -0,0 +1,159 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+from django.db.models import Q
+
+from apps.organization.models import Organization, OrganizationMember
+
+
+class StatusRollup(models.Model):
+    """
+    Pre-aggregated status counters used by the dashboards.
+
+    One row holds the number of entities of ``entity_type`` (project, task,
+    ticket, client) in a given ``status`` for an organization. Rows without an
+    ``assignee`` are organization-wide totals; rows with an ``assignee`` hold
+    the same counts restricted to the member the entities are assigned to.
+
+    Rows are kept up to date incrementally by the model signals (see
+    ``apps.dashboard.rollups``) and can be rebuilt with the
+    ``rebuild_dashboard_rollups`` management command.
+    """
+    ENTITY_PROJECT = 'project'
+    ENTITY_TASK = 'task'
+    ENTITY_TICKET = 'ticket'
+    ENTITY_CLIENT = 'client'
+
+    ENTITY_TYPES = [
+        (ENTITY_PROJECT, 'Project'),
+        (ENTITY_TASK, 'Task'),
+        (ENTITY_TICKET, 'Support Ticket'),
+        (ENTITY_CLIENT, 'Client'),
+    ]
+
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='status_rollups'
+    )
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPES)
+    status = models.CharField(max_length=20)
+    assignee = models.ForeignKey(
+        OrganizationMember,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='status_rollups',
+        help_text="Member the counted entities are assigned to (empty for totals)"
+    )
+    count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Status Rollup'
+        verbose_name_plural = 'Status Rollups'
+        indexes = [
+            models.Index(fields=['organization', 'entity_type']),
+            models.Index(fields=['assignee', 'entity_type']),
+        ]
+        # NULLs never collide in a plain unique constraint, so each
+        # combination of missing organization/assignee gets its own one.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organization', 'entity_type', 'status', 'assignee'],
+                condition=Q(organization__isnull=False, assignee__isnull=False),
+                name='dashboard_rollup_unique_org_assignee'
+            ),
+            models.UniqueConstraint(
+                fields=['organization', 'entity_type', 'status'],
+                condition=Q(organization__isnull=False, assignee__isnull=True),
+                name='dashboard_rollup_unique_org_total'
+            ),
+            models.UniqueConstraint(
+                fields=['entity_type', 'status', 'assignee'],
+                condition=Q(organization__isnull=True, assignee__isnull=False),
+                name='dashboard_rollup_unique_assignee'
+            ),
+            models.UniqueConstraint(
+                fields=['entity_type', 'status'],
+                condition=Q(organization__isnull=True, assignee__isnull=True),
+                name='dashboard_rollup_unique_total'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.status} = {self.count}"
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized, full-text indexed copy of a searchable object.
+
+    Projects, tasks, clients, support tickets and organization members each
+    get one document, kept current by model signals (see
+    ``apps.dashboard.search``). ``search_vector`` is a stored generated
+    column weighting the title over the subtitle over the body, and is
+    covered by a GIN index so searches do not scan the source tables.
+    ``title`` and ``subtitle`` (names, emails, usernames) also have trigram
+    GIN indexes for the type-ahead autocomplete.
+    """
+    ENTITY_PROJECT = 'project'
+    ENTITY_TASK = 'task'
+    ENTITY_CLIENT = 'client'
+    ENTITY_TICKET = 'ticket'
+    ENTITY_MEMBER = 'member'
+
+    ENTITY_TYPES = [
+        (ENTITY_PROJECT, 'Project'),
+        (ENTITY_TASK, 'Task'),
+        (ENTITY_CLIENT, 'Client'),
+        (ENTITY_TICKET, 'Support Ticket'),
+        (ENTITY_MEMBER, 'Organization Member'),
+    ]
+
+    # Text search configuration used to build and query the vectors
+    SEARCH_CONFIG = 'english'
+
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPES)
+    object_id = models.UUIDField()
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='search_documents'
+    )
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True, default='')
+    body = models.TextField(blank=True, default='')
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('subtitle', weight='B', config=SEARCH_CONFIG)
+            + SearchVector('body', weight='C', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Search Document'
+        verbose_name_plural = 'Search Documents'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['entity_type', 'object_id'],
+                name='dashboard_search_document_unique_object'
+            ),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='dashboard_search_vector_gin'),
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='dashboard_search_title_trgm'),
+            GinIndex(fields=['subtitle'], opclasses=['gin_trgm_ops'], name='dashboard_search_subtitle_trgm'),
+            models.Index(fields=['organization', 'entity_type']),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}: {self.title}"
@@ -0,0 +1,319 @@
+"""
+Incrementally maintained status counters for the dashboards.
+
+Dashboards used to count projects, tasks, tickets and clients by status
+straight from the entity tables on every request. Instead, ``StatusRollup``
+keeps one row per (organization, entity type, status[, assignee]) and the
+model signals adjust those rows with ``F()`` increments whenever an entity is
+created, changes status/assignee/organization, or is deleted.
+
+Changes that bypass ``save()``/``delete()`` (``QuerySet.update()``, raw SQL,
+fixtures loaded with ``raw=True``) are not seen by the signals; the
+``check_dashboard_rollups`` and ``rebuild_dashboard_rollups`` management
+commands detect and repair any such drift.
+"""
+import logging
+from collections import defaultdict, namedtuple
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from apps.organization.utils import resolve_organization_id
+
+from .models import StatusRollup
+
+logger = logging.getLogger(__name__)
+
+
+class RollupSpec(namedtuple('RollupSpec', ['model', 'assignee_field', 'organization_path'])):
+    """
+    How an entity type maps onto rollup rows.
+
+    Attributes:
+        model: App label and model name of the counted model
+        assignee_field: Foreign key to the OrganizationMember the entity is assigned to
+        organization_path: Lookup path from the entity to its organization
+    """
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    @property
+    def parent_field(self):
+        """First hop of ``organization_path`` (the field the organization is derived from)."""
+        return self.organization_path.split('__', 1)[0]
+
+    @property
+    def tracked_fields(self):
+        return ('status', self.assignee_field, self.parent_field)
+
+
+ROLLUP_SPECS = {
+    StatusRollup.ENTITY_PROJECT: RollupSpec('projects.Project', 'project_manager', 'client__organization'),
+    StatusRollup.ENTITY_TASK: RollupSpec('tasks.Task', 'developer', 'project__client__organization'),
+    StatusRollup.ENTITY_TICKET: RollupSpec('support.SupportTicket', 'support', 'client__organization'),
+    StatusRollup.ENTITY_CLIENT: RollupSpec('clients.Client', 'salesperson', 'organization'),
+}
+
+RollupKey = namedtuple('RollupKey', ['entity_type', 'organization_id', 'status', 'assignee_id'])
+
+
+def _resolve_organization_id(spec, parent_id):
+    """Resolve the organization of an entity from the value of its parent field."""
+    return resolve_organization_id(spec.get_model(), spec.organization_path, parent_id)
+
+
+def _attname(spec, field_name):
+    return spec.get_model()._meta.get_field(field_name).attname
+
+
+def apply_delta(key, delta):
+    """
+    Add ``delta`` to the rollup row identified by ``key``.
+
+    The row is updated in place with an ``F()`` expression so concurrent
+    writers never lose increments. A missing row is created for positive
+    deltas; a missing row for a negative delta means the rollups have
+    drifted, which is logged rather than raised so the triggering write
+    still goes through.
+    """
+    if not delta or key.status is None:
+        return
+
+    rows = StatusRollup.objects.filter(
+        organization_id=key.organization_id,
+        entity_type=key.entity_type,
+        status=key.status,
+        assignee_id=key.assignee_id,
+    )
+    if rows.update(count=F('count') + delta, updated_at=timezone.now()):
+        return
+
+    if delta < 0:
+        logger.warning(
+            f"Missing dashboard rollup row for {key}; "
+            f"run the check_dashboard_rollups command to repair it"
+        )
+        return
+
+    try:
+        with transaction.atomic():
+            StatusRollup.objects.create(
+                organization_id=key.organization_id,
+                entity_type=key.entity_type,
+                status=key.status,
+                assignee_id=key.assignee_id,
+                count=delta,
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        rows.update(count=F('count') + delta, updated_at=timezone.now())
+
+
+def _apply_state(entity_type, organization_id, status, assignee_id, delta):
+    """Apply ``delta`` to the organization total and, if assigned, the assignee row."""
+    apply_delta(RollupKey(entity_type, organization_id, status, None), delta)
+    if assignee_id is not None:
+        apply_delta(RollupKey(entity_type, organization_id, status, assignee_id), delta)
+
+
+def _descendants(entity_type):
+    """
+    Yield ``(entity_type, lookup)`` for entity types whose organization is
+    derived through ``entity_type`` (e.g. tasks through their project).
+    """
+    path = ROLLUP_SPECS[entity_type].organization_path
+    for other_type, other in ROLLUP_SPECS.items():
+        other_path = other.organization_path
+        if other_type != entity_type and other_path.endswith('__' + path):
+            yield other_type, other_path[:-len(path) - 2]
+
+
+def _move_descendants(entity_type, instance, old_organization_id, new_organization_id):
+    """Move the counts of entities that inherit their organization from ``instance``."""
+    for other_type, lookup in _descendants(entity_type):
+        spec = ROLLUP_SPECS[other_type]
+        rows = (
+            spec.get_model().objects
+            .filter(**{lookup: instance.pk})
+            .values('status', assignee_value=F(_attname(spec, spec.assignee_field)))
+            .annotate(total=Count('pk'))
+            .order_by()
+        )
+        for row in rows:
+            _apply_state(other_type, old_organization_id, row['status'], row['assignee_value'], -row['total'])
+            _apply_state(other_type, new_organization_id, row['status'], row['assignee_value'], row['total'])
+
+
+def record_save(entity_type, instance, created):
+    """
+    Update the rollups after ``instance`` was saved.
+
+    Relies on the model's ``tracker`` (django-model-utils ``FieldTracker``)
+    covering the status, assignee and parent fields of the entity.
+    """
+    spec = ROLLUP_SPECS[entity_type]
+    tracker = instance.tracker
+
+    if not created and not any(tracker.has_changed(field) for field in spec.tracked_fields):
+        return
+
+    parent_id = getattr(instance, _attname(spec, spec.parent_field))
+    organization_id = _resolve_organization_id(spec, parent_id)
+    assignee_id = getattr(instance, _attname(spec, spec.assignee_field))
+
+    if not created:
+        previous_parent_id = tracker.previous(spec.parent_field)
+        if previous_parent_id == parent_id:
+            previous_organization_id = organization_id
+        else:
+            previous_organization_id = _resolve_organization_id(spec, previous_parent_id)
+
+        previous = (previous_organization_id, tracker.previous('status'), tracker.previous(spec.assignee_field))
+        if previous == (organization_id, instance.status, assignee_id):
+            return
+        _apply_state(entity_type, *previous, -1)
+
+        if previous_organization_id != organization_id:
+            _move_descendants(entity_type, instance, previous_organization_id, organization_id)
+
+    _apply_state(entity_type, organization_id, instance.status, assignee_id, 1)
+
+
+def record_delete(entity_type, instance):
+    """Update the rollups after ``instance`` was deleted."""
+    spec = ROLLUP_SPECS[entity_type]
+    tracker = instance.tracker
+    organization_id = _resolve_organization_id(spec, tracker.previous(spec.parent_field))
+    _apply_state(
+        entity_type,
+        organization_id,
+        tracker.previous('status'),
+        tracker.previous(spec.assignee_field),
+        -1
+    )
+
+
+def compute_rollups(organization_id=None, entity_types=None):
+    """
+    Count entities from the source tables, the way the rollups should look.
+
+    Args:
+        organization_id: Only count entities of this organization
+        entity_types: Only count these entity types (defaults to all)
+
+    Returns:
+        dict: Mapping of RollupKey to count
+    """
+    counts = defaultdict(int)
+    for entity_type in entity_types or ROLLUP_SPECS:
+        spec = ROLLUP_SPECS[entity_type]
+        queryset = spec.get_model().objects.all()
+        if organization_id is not None:
+            queryset = queryset.filter(**{spec.organization_path: organization_id})
+
+        rows = (
+            queryset
+            .values(
+                'status',
+                organization_value=F(spec.organization_path),
+                assignee_value=F(_attname(spec, spec.assignee_field)),
+            )
+            .annotate(total=Count('pk'))
+            .order_by()
+        )
+        for row in rows:
+            org_id, status, assignee_id = row['organization_value'], row['status'], row['assignee_value']
+            counts[RollupKey(entity_type, org_id, status, None)] += row['total']
+            if assignee_id is not None:
+                counts[RollupKey(entity_type, org_id, status, assignee_id)] += row['total']
+    return dict(counts)
+
+
+def _stored_rollups(organization_id=None, entity_types=None):
+    queryset = StatusRollup.objects.filter(entity_type__in=list(entity_types or ROLLUP_SPECS))
+    if organization_id is not None:
+        queryset = queryset.filter(organization_id=organization_id)
+    return queryset
+
+
+@transaction.atomic
+def rebuild_rollups(organization_id=None, entity_types=None):
+    """
+    Replace the stored rollups with counts recomputed from the source tables.
+
+    Writes that happen while the rebuild is running may be lost, so run it
+    when traffic is low (or scope it to a single organization).
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    counts = compute_rollups(organization_id, entity_types)
+    _stored_rollups(organization_id, entity_types).delete()
+    StatusRollup.objects.bulk_create([
+        StatusRollup(
+            organization_id=key.organization_id,
+            entity_type=key.entity_type,
+            status=key.status,
+            assignee_id=key.assignee_id,
+            count=count,
+        )
+        for key, count in counts.items()
+    ], batch_size=1000)
+    return len(counts)
+
+
+def check_rollups(organization_id=None, entity_types=None):
+    """
+    Compare the stored rollups with the source tables.
+
+    Returns:
+        list: ``(key, stored, actual)`` tuples for every counter that differs
+    """
+    expected = compute_rollups(organization_id, entity_types)
+    stored = defaultdict(int)
+    for row in _stored_rollups(organization_id, entity_types).values(
+        'entity_type', 'organization_id', 'status', 'assignee_id', 'count'
+    ):
+        key = RollupKey(row['entity_type'], row['organization_id'], row['status'], row['assignee_id'])
+        stored[key] += row['count']
+
+    mismatches = []
+    for key in set(expected) | set(stored):
+        if expected.get(key, 0) != stored.get(key, 0):
+            mismatches.append((key, stored.get(key, 0), expected.get(key, 0)))
+    return sorted(mismatches, key=lambda item: tuple(str(part) for part in item[0]))
+
+
+def get_status_counts(entity_type, include_total=False, **filters):
+    """
+    Read per-status counts of an entity type from the rollups.
+
+    Keyword arguments filter the rollup rows, e.g.
+    ``organization=org, assignee__isnull=True`` for organization totals or
+    ``assignee__user=user`` for everything assigned to a user. Statuses
+    without any rows are reported as 0.
+
+    Args:
+        entity_type: One of the ``StatusRollup`` entity types
+        include_total: Also return the sum over all statuses under ``'total'``
+
+    Returns:
+        dict: Mapping of status value to count
+    """
+    model = ROLLUP_SPECS[entity_type].get_model()
+    counts = {value: 0 for value, _ in model._meta.get_field('status').choices}
+    rows = (
+        StatusRollup.objects
+        .filter(entity_type=entity_type, **filters)
+        .values('status')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    for row in rows:
+        counts[row['status']] = row['total']
+    if include_total:
+        counts = {'total': sum(counts.values()), **counts}
+    return counts
@@ -0,0 +1,386 @@
+"""
+Full-text search index for the global search.
+
+Every searchable object (project, task, client, support ticket and
+organization member) is mirrored into one ``SearchDocument`` row holding its
+organization and the text to search. The row's ``search_vector`` is a stored
+generated column with a GIN index, so a search is a single index lookup on
+one table, ranked with ``SearchRank`` and filtered to the caller's
+organizations.
+
+Documents are written from the model signals (see ``apps.dashboard.signals``)
+whenever an object is saved or deleted. When a client or project moves to
+another organization, the documents of the objects below it are moved along
+with it. Text copied from related objects (e.g. the project title shown on a
+task) is refreshed the next time the object itself is saved or the index is
+rebuilt with the ``rebuild_search_index`` management command.
+
+``autocomplete`` serves the type-ahead search boxes from the same table:
+titles and subtitles (names, emails, usernames) have ``pg_trgm`` GIN
+indexes, so prefix and fuzzy matches are index lookups rather than
+``icontains`` scans joined across the source tables. Each call runs under a
+``statement_timeout`` so a slow keystroke fails fast instead of queueing.
+"""
+import logging
+from collections import namedtuple
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import OperationalError, connection, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When, Window
+from django.db.models.functions import Greatest, RowNumber
+
+from apps.organization.utils import get_object_organization_id, resolve_organization_id
+
+from .models import SearchDocument
+
+logger = logging.getLogger(__name__)
+
+# Length of the description snippet returned with each result
+SNIPPET_LENGTH = 100
+
+# SQLSTATE of a statement cancelled by statement_timeout
+QUERY_CANCELED = '57014'
+
+
+class SearchTimeout(Exception):
+    """Raised when an autocomplete query exceeds its time budget."""
+
+
+def _join(*parts):
+    return ' '.join(str(part) for part in parts if part)
+
+
+def _project_text(project):
+    return project.title, project.client.name if project.client_id else '', project.description
+
+
+def _task_text(task):
+    return task.title, task.project.title if task.project_id else '', task.description
+
+
+def _client_text(client):
+    return (
+        client.name,
+        _join(client.contact_person, client.email),
+        _join(client.notes, client.city, client.state, client.country),
+    )
+
+
+def _ticket_text(ticket):
+    return ticket.issue, ticket.client.name if ticket.client_id else '', ticket.description
+
+
+def _member_text(member):
+    user = member.user
+    return (
+        user.get_full_name() or user.username,
+        _join(user.username, user.email, member.get_role_display()),
+        '',
+    )
+
+
+class SearchSpec(namedtuple('SearchSpec', ['model', 'organization_path', 'related', 'get_text', 'url'])):
+    """
+    How a model is mirrored into search documents.
+
+    Attributes:
+        model: App label and model name of the indexed model
+        organization_path: Lookup path from the model to its organization
+        related: Relations to ``select_related`` when indexing in bulk
+        get_text: Callable returning ``(title, subtitle, body)`` for an instance
+        url: Frontend URL of an object, formatted with its ``id``
+    """
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    @property
+    def parent_field(self):
+        return self.organization_path.split('__', 1)[0]
+
+
+SEARCH_SPECS = {
+    SearchDocument.ENTITY_PROJECT: SearchSpec(
+        'projects.Project', 'client__organization', ['client'], _project_text, '/projects/{id}'
+    ),
+    SearchDocument.ENTITY_TASK: SearchSpec(
+        'tasks.Task', 'project__client__organization', ['project__client'], _task_text, '/tasks/{id}'
+    ),
+    SearchDocument.ENTITY_CLIENT: SearchSpec(
+        'clients.Client', 'organization', [], _client_text, '/clients/{id}'
+    ),
+    SearchDocument.ENTITY_TICKET: SearchSpec(
+        'support.SupportTicket', 'client__organization', ['client'], _ticket_text, '/support/tickets/{id}'
+    ),
+    SearchDocument.ENTITY_MEMBER: SearchSpec(
+        'organization.OrganizationMember', 'organization', ['user'], _member_text, '/organization/members/{id}'
+    ),
+}
+
+
+def get_entity_type(model):
+    """Return the search entity type of ``model``, or None if it is not indexed."""
+    label = model._meta.label
+    for entity_type, spec in SEARCH_SPECS.items():
+        if spec.model == label:
+            return entity_type
+    return None
+
+
+def _organization_value(spec, instance):
+    """Organization id of an instance, read from loaded relations when possible."""
+    *relations, organization_field = spec.organization_path.split('__')
+    value = instance
+    for part in relations:
+        if not value._meta.get_field(part).is_cached(value):
+            return get_object_organization_id(instance, spec.organization_path)
+        value = getattr(value, part)
+        if value is None:
+            return None
+    return getattr(value, value._meta.get_field(organization_field).attname)
+
+
+def build_document(entity_type, instance):
+    """Build the (unsaved) search document of ``instance``."""
+    spec = SEARCH_SPECS[entity_type]
+    title, subtitle, body = spec.get_text(instance)
+    title_field = SearchDocument._meta.get_field('title')
+    subtitle_field = SearchDocument._meta.get_field('subtitle')
+    return SearchDocument(
+        entity_type=entity_type,
+        object_id=instance.pk,
+        organization_id=_organization_value(spec, instance),
+        title=(title or '')[:title_field.max_length],
+        subtitle=(subtitle or '')[:subtitle_field.max_length],
+        body=body or '',
+    )
+
+
+def index_objects(entity_type, instances, batch_size=500):
+    """
+    Insert or refresh the search documents of ``instances``.
+
+    Returns:
+        int: Number of documents written
+    """
+    return _upsert([build_document(entity_type, instance) for instance in instances], batch_size)
+
+
+def _upsert(documents, batch_size=500):
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['entity_type', 'object_id'],
+        update_fields=['organization', 'title', 'subtitle', 'body', 'updated_at'],
+    )
+    return len(documents)
+
+
+def _descendants(entity_type):
+    """
+    Yield ``(entity_type, lookup)`` for entity types whose organization is
+    derived through ``entity_type`` (e.g. tasks through their project).
+    """
+    path = SEARCH_SPECS[entity_type].organization_path
+    for other_type, other in SEARCH_SPECS.items():
+        other_path = other.organization_path
+        if other_type != entity_type and other_path.endswith('__' + path):
+            yield other_type, other_path[:-len(path) - 2]
+
+
+def record_save(entity_type, instance):
+    """
+    Update the index after ``instance`` was saved.
+
+    If the model's ``tracker`` shows that the object moved to another
+    organization, the documents of the objects below it are moved too.
+    """
+    spec = SEARCH_SPECS[entity_type]
+    document = build_document(entity_type, instance)
+    _upsert([document])
+
+    tracker = getattr(instance, 'tracker', None)
+    if not tracker or spec.parent_field not in tracker.fields or not tracker.has_changed(spec.parent_field):
+        return
+    previous_organization_id = resolve_organization_id(
+        type(instance), spec.organization_path, tracker.previous(spec.parent_field)
+    )
+    if previous_organization_id == document.organization_id:
+        return
+    for other_type, lookup in _descendants(entity_type):
+        other_ids = SEARCH_SPECS[other_type].get_model().objects.filter(**{lookup: instance.pk}).values('pk')
+        SearchDocument.objects.filter(entity_type=other_type, object_id__in=other_ids).update(
+            organization_id=document.organization_id
+        )
+
+
+def record_delete(entity_type, instance):
+    """Remove the search document of a deleted object."""
+    SearchDocument.objects.filter(entity_type=entity_type, object_id=instance.pk).delete()
+
+
+def reindex_user(user):
+    """Refresh the member documents of ``user`` (name, email)."""
+    spec = SEARCH_SPECS[SearchDocument.ENTITY_MEMBER]
+    members = spec.get_model().objects.filter(user=user).select_related('user', 'organization')
+    return index_objects(SearchDocument.ENTITY_MEMBER, members)
+
+
+def rebuild_index(entity_types=None, chunk_size=1000):
+    """
+    Re-index every object of the given entity types and drop documents of
+    objects that no longer exist.
+
+    Returns:
+        dict: Mapping of entity type to number of documents written
+    """
+    written = {}
+    for entity_type in entity_types or SEARCH_SPECS:
+        spec = SEARCH_SPECS[entity_type]
+        model = spec.get_model()
+        queryset = model.objects.select_related(*spec.related).order_by()
+
+        written[entity_type] = 0
+        chunk = []
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(instance)
+            if len(chunk) >= chunk_size:
+                written[entity_type] += index_objects(entity_type, chunk)
+                chunk = []
+        if chunk:
+            written[entity_type] += index_objects(entity_type, chunk)
+
+        SearchDocument.objects.filter(entity_type=entity_type).exclude(
+            object_id__in=model.objects.values('pk')
+        ).delete()
+    return written
+
+
+def search(query, organization_ids=None, entity_types=None, limit=20):
+    """
+    Run a full-text search over the index.
+
+    Args:
+        query: Search terms, in web search syntax ("quoted phrases", -exclusions, or)
+        organization_ids: Only return documents of these organizations
+            (None searches everything, for superusers)
+        entity_types: Only return these entity types (defaults to all)
+        limit: Maximum number of results
+
+    Returns:
+        list: Result dicts ordered by rank, with keys 'type', 'id', 'name',
+            'description', 'url' and 'rank'
+    """
+    search_query = SearchQuery(query, search_type='websearch', config=SearchDocument.SEARCH_CONFIG)
+    documents = SearchDocument.objects.filter(search_vector=search_query)
+    if organization_ids is not None:
+        documents = documents.filter(organization_id__in=organization_ids)
+    if entity_types:
+        documents = documents.filter(entity_type__in=entity_types)
+
+    documents = (
+        documents
+        .annotate(rank=SearchRank(F('search_vector'), search_query))
+        .order_by('-rank', '-updated_at')
+        .values('entity_type', 'object_id', 'title', 'subtitle', 'body', 'rank')
+    )[:limit]
+
+    results = []
+    for document in documents:
+        description = document['body'] or document['subtitle']
+        if len(description) > SNIPPET_LENGTH:
+            description = description[:SNIPPET_LENGTH] + '...'
+        results.append({
+            'type': document['entity_type'],
+            'id': str(document['object_id']),
+            'name': document['title'],
+            'description': description,
+            'url': SEARCH_SPECS[document['entity_type']].url.format(id=document['object_id']),
+            'rank': round(document['rank'], 4),
+        })
+    return results
+
+
+def autocomplete(query, organization_ids=None, entity_types=None, per_type=5, timeout_ms=None):
+    """
+    Return the best prefix/fuzzy matches of ``query`` for each entity type.
+
+    Documents match when a word of their title or subtitle is similar to
+    the query (``pg_trgm`` word similarity, served by the trigram indexes).
+    Within each entity type, titles starting with the query come first,
+    then the closest matches.
+
+    Args:
+        query: The text typed so far
+        organization_ids: Only return documents of these organizations
+            (None searches everything, for superusers)
+        entity_types: Only return these entity types (defaults to all)
+        per_type: Maximum number of results per entity type
+        timeout_ms: Time budget of the query in milliseconds
+            (defaults to AUTOCOMPLETE_TIMEOUT_MS)
+
+    Returns:
+        list: Result dicts grouped by entity type, best match first, with
+            keys 'type', 'id', 'name', 'description' and 'url'
+
+    Raises:
+        SearchTimeout: If the query did not finish within the budget
+    """
+    if timeout_ms is None:
+        timeout_ms = getattr(settings, 'AUTOCOMPLETE_TIMEOUT_MS', 200)
+
+    documents = SearchDocument.objects.filter(
+        Q(title__trigram_word_similar=query) | Q(subtitle__trigram_word_similar=query)
+    )
+    if organization_ids is not None:
+        documents = documents.filter(organization_id__in=organization_ids)
+    if entity_types:
+        documents = documents.filter(entity_type__in=entity_types)
+
+    ordering = [
+        F('is_prefix').desc(),
+        F('similarity').desc(),
+        F('title').asc(),
+    ]
+    documents = (
+        documents
+        .annotate(
+            is_prefix=Case(
+                When(title__istartswith=query, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            similarity=Greatest(
+                TrigramWordSimilarity(query, 'title'),
+                TrigramWordSimilarity(query, 'subtitle'),
+            ),
+        )
+        .annotate(position=Window(RowNumber(), partition_by=[F('entity_type')], order_by=ordering))
+        .filter(position__lte=per_type)
+        .order_by('entity_type', 'position')
+        .values('entity_type', 'object_id', 'title', 'subtitle')
+    )
+
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [int(timeout_ms)])
+            rows = list(documents)
+    except OperationalError as e:
+        if getattr(e.__cause__, 'pgcode', None) == QUERY_CANCELED:
+            raise SearchTimeout(f"Autocomplete for {query!r} exceeded {timeout_ms}ms") from e
+        raise
+
+    return [
+        {
+            'type': row['entity_type'],
+            'id': str(row['object_id']),
+            'name': row['title'],
+            'description': row['subtitle'],
+            'url': SEARCH_SPECS[row['entity_type']].url.format(id=row['object_id']),
+        }
+        for row in rows
+    ]
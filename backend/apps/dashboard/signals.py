@@ -0,0 +1,144 @@
+# apps/dashboard/signals.py
+import logging
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from apps.organization.models import OrganizationMember
+from apps.organization.utils import get_object_organization_id, resolve_organization_id
+from apps.clients.models import Client
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.support.models import SupportTicket
+from apps.payments.models import Payment
+from apps.users.models import User
+from . import search
+from .cache import bump_versions
+
+logger = logging.getLogger(__name__)
+
+
+def _user_organizations(user):
+    """Get the organizations a user is a member of"""
+    return set(user.organization_memberships.values_list('organization_id', flat=True))
+
+
+# Models whose changes invalidate the cached dashboards, with the lookup
+# path from each model to its organization, or a function returning the
+# organizations of an instance
+DASHBOARD_SOURCES = {
+    Project: 'client__organization',
+    Task: 'project__client__organization',
+    SupportTicket: 'client__organization',
+    Payment: 'client__organization',
+    Client: 'organization',
+    OrganizationMember: 'organization',
+    User: _user_organizations,
+}
+
+# Saves that touch only these fields do not change any dashboard
+IGNORED_UPDATE_FIELDS = {
+    User: {'last_login'},
+}
+
+
+def _affected_organizations(instance, organization_path):
+    """
+    Get the organizations whose dashboards an instance change affects:
+    its current organization and, if it moved, the previous one
+    """
+    if callable(organization_path):
+        organizations = organization_path(instance)
+        organizations.discard(None)
+        return organizations
+    
+    organizations = {get_object_organization_id(instance, organization_path)}
+    
+    parent_field = organization_path.split('__', 1)[0]
+    tracker = getattr(instance, 'tracker', None)
+    if tracker and parent_field in tracker.fields and tracker.has_changed(parent_field):
+        organizations.add(resolve_organization_id(
+            type(instance), organization_path, tracker.previous(parent_field)
+        ))
+    
+    organizations.discard(None)
+    return organizations
+
+
+def invalidate_dashboard_cache(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Bump the dashboard cache versions of the organizations an instance
+    belongs to, once the surrounding transaction has committed
+    """
+    if raw:
+        return
+    if update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS.get(sender, set()):
+        return
+    
+    try:
+        organizations = _affected_organizations(instance, DASHBOARD_SOURCES[sender])
+    except Exception as e:
+        logger.error(f"Error resolving organization of {sender.__name__} {instance.pk}: {str(e)}")
+        organizations = set()
+    
+    def bump():
+        if not organizations:
+            bump_versions()
+        for organization_id in organizations:
+            bump_versions(organization_id)
+    
+    transaction.on_commit(bump)
+
+
+for model in DASHBOARD_SOURCES:
+    post_save.connect(
+        invalidate_dashboard_cache, sender=model,
+        dispatch_uid=f'dashboard_cache_save_{model._meta.label_lower}'
+    )
+    post_delete.connect(
+        invalidate_dashboard_cache, sender=model,
+        dispatch_uid=f'dashboard_cache_delete_{model._meta.label_lower}'
+    )
+
+
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """Write the search document of a saved object"""
+    if raw:
+        return
+    
+    try:
+        search.record_save(search.get_entity_type(sender), instance)
+    except Exception as e:
+        logger.error(f"Error indexing {sender.__name__} {instance.pk} for search: {str(e)}")
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    """Remove the search document of a deleted object"""
+    try:
+        search.record_delete(search.get_entity_type(sender), instance)
+    except Exception as e:
+        logger.error(f"Error removing {sender.__name__} {instance.pk} from search: {str(e)}")
+
+
+def update_member_search_index(sender, instance, raw=False, created=False, **kwargs):
+    """Refresh the member documents of a user whose name or email may have changed"""
+    if raw or created:
+        return
+    
+    try:
+        search.reindex_user(instance)
+    except Exception as e:
+        logger.error(f"Error indexing memberships of user {instance.pk} for search: {str(e)}")
+
+
+for entity_type, spec in search.SEARCH_SPECS.items():
+    model = spec.get_model()
+    post_save.connect(
+        update_search_index, sender=model,
+        dispatch_uid=f'search_index_save_{model._meta.label_lower}'
+    )
+    post_delete.connect(
+        remove_from_search_index, sender=model,
+        dispatch_uid=f'search_index_delete_{model._meta.label_lower}'
+    )
+
+post_save.connect(update_member_search_index, sender=User, dispatch_uid='search_index_save_user')
@@ -0,0 +1,106 @@
+"""
+Declarative statistics for dashboard views.
+
+A dashboard widget usually needs several numbers computed over the same
+queryset (one count per status, a few sums or averages). Issuing one
+``.count()`` per number costs a round trip each, so ``DashboardStats``
+collects the named aggregates first and compiles them into a single
+``aggregate()`` call using filtered aggregates (``Count(..., filter=Q(...))``).
+
+Example::
+
+    stats = (
+        DashboardStats(Task.objects.filter(project__in=projects))
+        .count('total')
+        .count_choices('status', Task.STATUS_CHOICES)
+        .count('overdue', due_date__lt=now, status__in=['pending', 'in_progress'])
+    )
+    task_stats = stats.evaluate()   # one query
+"""
+from django.db.models import Avg, Count, Max, Min, Q, Sum
+
+
+class DashboardStats:
+    """
+    Collects named aggregates over a queryset and evaluates them in one query.
+
+    Each ``count``/``sum``/``avg`` call registers an aggregate under ``name``;
+    optional ``Q`` objects and keyword lookups restrict the rows the aggregate
+    sees. Methods return ``self`` so definitions can be chained.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self._aggregates = {}
+
+    def _add(self, name, aggregate):
+        if name in self._aggregates:
+            raise ValueError(f"Statistic '{name}' is already defined")
+        self._aggregates[name] = aggregate
+        return self
+
+    @staticmethod
+    def _build_filter(conditions, filters):
+        condition = Q(*conditions, **filters)
+        return condition if condition else None
+
+    def count(self, name, *conditions, distinct=False, **filters):
+        """Count rows matching the optional conditions."""
+        return self._add(name, Count(
+            'pk',
+            filter=self._build_filter(conditions, filters),
+            distinct=distinct,
+        ))
+
+    def count_choices(self, field, choices, prefix=''):
+        """
+        Register one counter per choice of ``field``.
+
+        ``choices`` may be a Django choices list (``[(value, label), ...]``)
+        or a plain iterable of values. Counter names are the choice values,
+        optionally prefixed.
+        """
+        for choice in choices:
+            value = choice[0] if isinstance(choice, (list, tuple)) else choice
+            self.count(f'{prefix}{value}', **{field: value})
+        return self
+
+    def sum(self, name, expression, *conditions, default=0, **filters):
+        """Sum ``expression`` over rows matching the optional conditions."""
+        return self._add(name, Sum(
+            expression,
+            filter=self._build_filter(conditions, filters),
+            default=default,
+        ))
+
+    def avg(self, name, expression, *conditions, **filters):
+        """Average ``expression`` over rows matching the optional conditions."""
+        return self._add(name, Avg(
+            expression,
+            filter=self._build_filter(conditions, filters),
+        ))
+
+    def min(self, name, expression, *conditions, **filters):
+        """Minimum of ``expression`` over rows matching the optional conditions."""
+        return self._add(name, Min(
+            expression,
+            filter=self._build_filter(conditions, filters),
+        ))
+
+    def max(self, name, expression, *conditions, **filters):
+        """Maximum of ``expression`` over rows matching the optional conditions."""
+        return self._add(name, Max(
+            expression,
+            filter=self._build_filter(conditions, filters),
+        ))
+
+    def evaluate(self):
+        """
+        Run all registered aggregates in a single query.
+
+        Returns:
+            dict: Mapping of statistic name to its value
+        """
+        if not self._aggregates:
+            return {}
+        return self.queryset.aggregate(**self._aggregates)
@@ -0,0 +1,138 @@
+"""
+Time-series helpers for dashboard charts.
+
+``growth_series`` returns the number of new rows per period together with
+the running total, for any queryset with a datetime field, in one query:
+rows are bucketed with ``Trunc*``, counted per bucket and accumulated with a
+window ``SUM`` over the buckets. Rows older than the window fall into a
+single leading bucket that only seeds the running total. Periods without
+rows are filled in on the Python side.
+"""
+from datetime import timedelta
+
+from django.db.models import Case, Count, DateTimeField, F, Func, IntegerField, Value, When, Window
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+TRUNC_FUNCTIONS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+class _RunningTotal(Func):
+    """``SUM(<aggregate>)`` evaluated as a window over the grouped rows."""
+    function = 'SUM'
+    window_compatible = True
+    output_field = IntegerField()
+
+
+class _GroupedWindow(Window):
+    """
+    Window over an aggregate of a grouped query.
+
+    Django would otherwise add the window itself to the GROUP BY clause;
+    its ordering expression is already grouped on.
+    """
+
+    def get_group_by_cols(self):
+        return []
+
+
+def truncate(value, granularity):
+    """Truncate a datetime to the start of its day, week (Monday) or month."""
+    if granularity not in TRUNC_FUNCTIONS:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == 'week':
+        value -= timedelta(days=value.weekday())
+    elif granularity == 'month':
+        value = value.replace(day=1)
+    return value
+
+
+def next_period(value, granularity):
+    """Return the start of the period following ``value`` (a period start)."""
+    if granularity == 'day':
+        return value + timedelta(days=1)
+    if granularity == 'week':
+        return value + timedelta(days=7)
+    return (value.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def period_start(periods, granularity='month', end=None):
+    """
+    Return the start of the window covering the last ``periods`` periods
+    (including the current one).
+    """
+    start = truncate(end or timezone.now(), granularity)
+    for _ in range(periods - 1):
+        if granularity == 'month':
+            start = (start - timedelta(days=1)).replace(day=1)
+        else:
+            start -= timedelta(days=1 if granularity == 'day' else 7)
+    return start
+
+
+def growth_series(queryset, date_field, start, end=None, granularity='month'):
+    """
+    Count new rows per period and the running total at the end of each period.
+
+    Args:
+        queryset: Rows to count (already filtered, e.g. by organization)
+        date_field: Name of the datetime field the rows are bucketed by
+        start: Start of the window; truncated to a period start
+        end: End of the window (defaults to now)
+        granularity: 'day', 'week' or 'month'
+
+    Returns:
+        list: One dict per period, oldest first, with keys
+            'period' (start of the period), 'new' and 'total'
+    """
+    end = end or timezone.now()
+    first_period = truncate(start, granularity)
+    last_period = truncate(end, granularity)
+
+    # Rows before the window share one NULL bucket that sorts first, so the
+    # window SUM starts from the total at the beginning of the window
+    bucket = TRUNC_FUNCTIONS[granularity](Case(
+        When(**{f'{date_field}__lt': first_period}, then=Value(None)),
+        default=F(date_field),
+        output_field=DateTimeField(),
+    ))
+    rows = (
+        queryset
+        .filter(**{f'{date_field}__lt': next_period(last_period, granularity)})
+        .annotate(bucket=bucket)
+        .values('bucket')
+        .annotate(
+            new=Count('pk'),
+            total=_GroupedWindow(_RunningTotal(Count('pk')), order_by=F('bucket').asc(nulls_first=True)),
+        )
+        .order_by(F('bucket').asc(nulls_first=True))
+    )
+
+    running_total = 0
+    buckets = {}
+    for row in rows:
+        if row['bucket'] is None:
+            running_total = row['total']
+        else:
+            buckets[row['bucket']] = row
+
+    series = []
+    period = first_period
+    while period <= last_period:
+        row = buckets.get(period)
+        if row:
+            running_total = row['total']
+        series.append({
+            'period': period,
+            'new': row['new'] if row else 0,
+            'total': running_total,
+        })
+        period = next_period(period, granularity)
+    return series
@@ -37,6 +37,8 @@ urlpatterns = [
     path('profile/', views.UserProfileView.as_view(), name='user-profile'),
     path('notifications/', views.UserNotificationsView.as_view(), name='user-notifications'),
     path('search/', views.GlobalSearchView.as_view(), name='global-search'),
+    path('autocomplete/', views.AutocompleteView.as_view(), name='autocomplete'),
+    path('batch/', views.BatchDashboardView.as_view(), name='batch'),
     
     # System health monitoring (admin only)
     path('system/health/', SystemHealthView.as_view(), name='system-health'),
@@ -1,31 +1,38 @@
 import logging
+import uuid
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework import status
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import Avg, Count, Q, F, Sum
+from django.db.models import Count, Q, F, Sum
 from django.conf import settings
-import psutil
 import os
-import platform
-import socket
-from datetime import datetime, timedelta
-from django.db import connection
 
 from .permissions import (
     IsSuperAdmin, IsOrganizationAdmin, IsProjectManager, 
     IsDeveloper, IsSalesperson, IsSupportStaff, IsVerifier
 )
+from .models import StatusRollup
+from .rollups import get_status_counts
+from .batch import WIDGETS, parse_widgets, run_widgets
+from .search import SEARCH_SPECS, SearchTimeout, autocomplete, search
+from .stats import DashboardStats
 from apps.users.models import User
-from apps.organization.models import Organization, OrganizationMember
+from apps.organization.models import OrganizationMember
 from apps.projects.models import Project
-from apps.projects.tasks import Task
+from apps.tasks.models import Task
 from apps.clients.models import Client
 from apps.support.models import SupportTicket
-from apps.payments.models import Payment
+from apps.payments.ledger import revenue_totals
+from apps.notifications.inbox import get_inbox, inbox_size
+from apps.activity_logs.feed import (
+    DEFAULT_PAGE_SIZE, InvalidCursor, get_feed_page, get_feed_queryset, serialize_activity
+)
+from system_monitor.sampler import get_sampler
 
 logger = logging.getLogger(__name__)
 
@@ -52,33 +59,31 @@ class ProjectManagerDashboardView(BaseDashboardView):
         user = request.user
         
         # Get projects managed by this user
-        managed_projects = Project.objects.filter(manager=user)
+        managed_projects = Project.objects.filter(project_manager__user=user)
         
-        # Project statistics
-        project_stats = {
-            'total': managed_projects.count(),
-            'in_progress': managed_projects.filter(status='in_progress').count(),
-            'on_hold': managed_projects.filter(status='on_hold').count(),
-            'completed': managed_projects.filter(status='completed').count(),
-            'overdue': managed_projects.filter(
-                due_date__lt=time_periods['today'], 
-                status__in=['in_progress', 'on_hold']
-            ).count()
-        }
+        # Project statistics (status counts come from the rollups)
+        project_stats = get_status_counts(
+            StatusRollup.ENTITY_PROJECT,
+            include_total=True,
+            assignee__user=user
+        )
+        project_stats['overdue'] = managed_projects.filter(
+            deadline__lt=time_periods['today'],
+            status__in=['in_progress', 'on_hold']
+        ).count()
         
-        # Task statistics across all managed projects
-        tasks = Task.objects.filter(project__in=managed_projects)
-        task_stats = {
-            'total': tasks.count(),
-            'completed': tasks.filter(status='completed').count(),
-            'in_progress': tasks.filter(status='in_progress').count(),
-            'not_started': tasks.filter(status='not_started').count(),
-            'blocked': tasks.filter(status='blocked').count()
-        }
+        # Task statistics across all managed projects (single aggregate query)
+        tasks = Task.objects.filter(project__project_manager__user=user)
+        task_stats = (
+            DashboardStats(tasks)
+            .count('total')
+            .count_choices('status', Task.STATUS_CHOICES)
+            .evaluate()
+        )
         
         # Team workload
         team_workload = list(
-            tasks.values('assigned_to__email')
+            tasks.values('developer__user__email')
                 .annotate(
                     total_tasks=Count('id'),
                     completed_tasks=Count('id', filter=Q(status='completed')),
@@ -90,10 +95,10 @@ class ProjectManagerDashboardView(BaseDashboardView):
         # Upcoming deadlines (next 7 days)
         upcoming_deadlines = tasks.filter(
             due_date__range=[
-                time_periods['today'],
-                time_periods['today'] + timedelta(days=7)
+                time_periods['now'],
+                time_periods['now'] + timedelta(days=7)
             ]
-        ).order_by('due_date')[:5]
+        ).select_related('project').order_by('due_date')[:5]
         
         return Response({
             'project_stats': project_stats,
@@ -103,7 +108,7 @@ class ProjectManagerDashboardView(BaseDashboardView):
                 'id': str(task.id),
                 'title': task.title,
                 'due_date': task.due_date.isoformat(),
-                'project': task.project.name,
+                'project': task.project.title,
                 'status': task.status
             } for task in upcoming_deadlines],
             'timestamp': time_periods['now'].isoformat()
@@ -119,20 +124,18 @@ class DeveloperDashboardView(BaseDashboardView):
         user = request.user
         
         # Get assigned tasks
-        tasks = Task.objects.filter(assigned_to=user)
+        tasks = Task.objects.filter(developer__user=user).select_related('project')
         
-        # Task statistics
-        task_stats = {
-            'total': tasks.count(),
-            'completed': tasks.filter(status='completed').count(),
-            'in_progress': tasks.filter(status='in_progress').count(),
-            'not_started': tasks.filter(status='not_started').count(),
-            'blocked': tasks.filter(status='blocked').count()
-        }
+        # Task statistics (from the rollups)
+        task_stats = get_status_counts(
+            StatusRollup.ENTITY_TASK,
+            include_total=True,
+            assignee__user=user
+        )
         
-        # Current tasks (in progress or not started)
+        # Current tasks (in progress or pending)
         current_tasks = tasks.filter(
-            status__in=['in_progress', 'not_started']
+            status__in=['in_progress', 'pending']
         ).order_by('due_date')
         
         # Recent activity
@@ -145,14 +148,14 @@ class DeveloperDashboardView(BaseDashboardView):
                 'title': task.title,
                 'status': task.status,
                 'due_date': task.due_date.isoformat() if task.due_date else None,
-                'project': task.project.name
+                'project': task.project.title
             } for task in current_tasks],
             'recent_activity': [{
                 'id': str(task.id),
                 'title': task.title,
                 'status': task.status,
                 'updated_at': task.updated_at.isoformat(),
-                'project': task.project.name
+                'project': task.project.title
             } for task in recent_activity],
             'timestamp': time_periods['now'].isoformat()
         })
@@ -165,42 +168,27 @@ class SalesDashboardView(BaseDashboardView):
     def get(self, request, format=None):
         time_periods = self.get_time_periods()
         user = request.user
+        now = time_periods['now']
         
         # Get clients managed by this salesperson
-        clients = Client.objects.filter(sales_person=user)
+        clients = Client.objects.filter(salesperson__user=user)
         
-        # Sales pipeline
-        pipeline = {
-            'leads': clients.filter(status='lead').count(),
-            'contacted': clients.filter(status='contacted').count(),
-            'proposal_sent': clients.filter(status='proposal_sent').count(),
-            'negotiation': clients.filter(status='negotiation').count(),
-            'closed_won': clients.filter(status='closed_won').count(),
-            'closed_lost': clients.filter(status='closed_lost').count()
-        }
+        # Sales pipeline (from the rollups)
+        pipeline = get_status_counts(
+            StatusRollup.ENTITY_CLIENT,
+            include_total=True,
+            assignee__user=user
+        )
         
-        # Recent deals
-        recent_deals = clients.order_by('-updated_at')[:5]
+        # Recent deals, valued by the cost of their projects
+        recent_deals = clients.annotate(
+            value=Sum('projects__cost')
+        ).order_by('-updated_at')[:5]
         
-        # Revenue metrics (if payment module is enabled)
+        # Revenue metrics from the daily revenue ledger (if payment module is enabled)
         revenue_metrics = {}
         if 'apps.payments' in settings.INSTALLED_APPS:
-            revenue_metrics = {
-                'monthly_revenue': Payment.objects.filter(
-                    client__in=clients,
-                    payment_date__month=time_periods['now'].month,
-                    payment_date__year=time_periods['now'].year
-                ).aggregate(total=Sum('amount'))['total'] or 0,
-                'quarterly_revenue': Payment.objects.filter(
-                    client__in=clients,
-                    payment_date__quarter=(time_periods['now'].month-1)//3 + 1,
-                    payment_date__year=time_periods['now'].year
-                ).aggregate(total=Sum('amount'))['total'] or 0,
-                'annual_revenue': Payment.objects.filter(
-                    client__in=clients,
-                    payment_date__year=time_periods['now'].year
-                ).aggregate(total=Sum('amount'))['total'] or 0
-            }
+            revenue_metrics = revenue_totals(salesperson__user=user)
         
         return Response({
             'pipeline': pipeline,
@@ -208,11 +196,11 @@ class SalesDashboardView(BaseDashboardView):
                 'id': str(client.id),
                 'name': client.name,
                 'status': client.status,
-                'value': client.estimated_value,
-                'last_contact': client.last_contact_date.isoformat() if client.last_contact_date else None
+                'value': client.value or 0,
+                'last_contact': client.updated_at.isoformat() if client.updated_at else None
             } for client in recent_deals],
             'revenue_metrics': revenue_metrics,
-            'timestamp': time_periods['now'].isoformat()
+            'timestamp': now.isoformat()
         })
 
 
@@ -225,26 +213,32 @@ class SupportDashboardView(BaseDashboardView):
         user = request.user
         
         # Get tickets assigned to this support staff
-        tickets = SupportTicket.objects.filter(assigned_to=user)
+        tickets = SupportTicket.objects.filter(support__user=user)
         
-        # Ticket statistics
-        ticket_stats = {
-            'total': tickets.count(),
-            'open': tickets.filter(status='open').count(),
-            'in_progress': tickets.filter(status='in_progress').count(),
-            'waiting': tickets.filter(status='waiting').count(),
-            'resolved': tickets.filter(status='resolved').count(),
-            'closed': tickets.filter(status='closed').count()
-        }
+        # Ticket statistics (from the rollups)
+        ticket_stats = get_status_counts(
+            StatusRollup.ENTITY_TICKET,
+            include_total=True,
+            assignee__user=user
+        )
         
-        # Recent tickets
-        recent_tickets = tickets.order_by('-created_at')[:5]
+        # Resolution metrics (single aggregate query)
+        resolved = Q(status__in=['resolved', 'closed'])
+        performance = (
+            DashboardStats(tickets)
+            .avg('avg_resolution', F('resolved_at') - F('created_at'), resolved)
+            .count(
+                'resolved_this_week',
+                resolved,
+                resolved_at__gte=time_periods['now'] - timedelta(days=7)
+            )
+            .evaluate()
+        )
+        avg_resolution = performance['avg_resolution']
+        tickets_resolved_this_week = performance['resolved_this_week']
         
-        # Average resolution time (in hours)
-        resolved_tickets = tickets.filter(status__in=['resolved', 'closed'])
-        avg_resolution = resolved_tickets.aggregate(
-            avg_time=Avg(F('resolved_at') - F('created_at'))
-        )['avg_time']
+        # Recent tickets
+        recent_tickets = tickets.select_related('client').order_by('-created_at')[:5]
         
         if avg_resolution:
             avg_resolution_hours = avg_resolution.total_seconds() / 3600
@@ -255,7 +249,7 @@ class SupportDashboardView(BaseDashboardView):
             'ticket_stats': ticket_stats,
             'recent_tickets': [{
                 'id': str(ticket.id),
-                'subject': ticket.subject,
+                'subject': ticket.issue,
                 'status': ticket.status,
                 'priority': ticket.priority,
                 'created_at': ticket.created_at.isoformat(),
@@ -263,9 +257,7 @@ class SupportDashboardView(BaseDashboardView):
             } for ticket in recent_tickets],
             'performance_metrics': {
                 'avg_resolution_time_hours': round(avg_resolution_hours, 2),
-                'tickets_resolved_this_week': resolved_tickets.filter(
-                    resolved_at__gte=time_periods['week_ago']
-                ).count()
+                'tickets_resolved_this_week': tickets_resolved_this_week
             },
             'timestamp': time_periods['now'].isoformat()
         })
@@ -331,74 +323,26 @@ class SystemHealthView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
     
     def get(self, request, format=None):
-        """Get system health metrics."""
+        """
+        Get system health metrics.
+        
+        Metrics are collected by the background sampler of the
+        system_monitor app; this returns its latest snapshot plus a short
+        history of CPU, memory and disk usage.
+        """
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            
-            # Memory metrics
-            memory = psutil.virtual_memory()
-            memory_used_gb = round(memory.used / (1024 ** 3), 2)
-            memory_total_gb = round(memory.total / (1024 ** 3), 2)
-            memory_percent = memory.percent
-            
-            # Disk metrics
-            disk = psutil.disk_usage('/')
-            disk_used_gb = round(disk.used / (1024 ** 3), 2)
-            disk_total_gb = round(disk.total / (1024 ** 3), 2)
-            disk_percent = disk.percent
-            
-            # System info
-            boot_time = datetime.fromtimestamp(psutil.boot_time())
-            uptime = str(datetime.now() - boot_time).split('.')[0]  # Remove microseconds
-            
-            # Database status
-            try:
-                with connection.cursor() as cursor:
-                    cursor.execute("SELECT 1")
-                    db_status = 'connected'
-                    db_tables = len(connection.introspection.table_names())
-            except Exception as e:
-                db_status = f'error: {str(e)}'
-                db_tables = 0
-            
-            # Service status (example services - customize as needed)
-            services = [
-                self._check_service('Django', ['python', 'manage.py']),
-                self._check_service('PostgreSQL', ['postgres']),
-                self._check_service('Redis', ['redis-server']),
-                self._check_service('Celery', ['celery']),
-            ]
+            sampler = get_sampler()
+            # Only the very first request of a process has to wait for a sample
+            snapshot = sampler.latest() or sampler.sample()
             
             return Response({
-                'status': 'healthy',
-                'timestamp': datetime.now().isoformat(),
-                'system': {
-                    'os': f"{platform.system()} {platform.release()}",
-                    'hostname': socket.gethostname(),
-                    'python_version': platform.python_version(),
-                },
-                'cpu': {
-                    'usage_percent': cpu_percent,
-                    'cores': cpu_count,
-                },
-                'memory': {
-                    'used_gb': memory_used_gb,
-                    'total_gb': memory_total_gb,
-                    'usage_percent': memory_percent,
-                },
-                'disk': {
-                    'used_gb': disk_used_gb,
-                    'total_gb': disk_total_gb,
-                    'usage_percent': disk_percent,
-                },
-                'uptime': uptime,
-                'database': {
-                    'status': db_status,
-                    'tables': db_tables,
-                },
-                'services': services,
+                **snapshot,
+                'history': [{
+                    'timestamp': item['timestamp'],
+                    'cpu_percent': item['cpu']['usage_percent'],
+                    'memory_percent': item['memory']['usage_percent'],
+                    'disk_percent': item['disk']['usage_percent'],
+                } for item in sampler.history()],
             })
             
         except Exception as e:
@@ -406,176 +350,245 @@ class SystemHealthView(APIView):
                 {'error': f'Failed to fetch system metrics: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def _check_service(self, name, process_names):
-        """Check if a service is running by process name."""
-        try:
-            for proc in psutil.process_iter(['name', 'cmdline']):
-                try:
-                    if any(name.lower() in ' '.join(proc.info['cmdline'] or []).lower() 
-                          for name in process_names):
-                        return {
-                            'name': name,
-                            'status': 'running',
-                            'pid': proc.pid,
-                            'memory_mb': round(proc.memory_info().rss / (1024 * 1024), 2)
-                        }
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-            return {'name': name, 'status': 'stopped'}
-        except Exception as e:
-            return {'name': name, 'status': f'error: {str(e)}'}
 
 
 class UserNotificationsView(APIView):
-    """View for user notifications."""
+    """
+    Unread notification count and latest unread notifications.
+    
+    Query parameters:
+        limit: Number of notifications returned (default and maximum
+            ``NOTIFICATION_INBOX_SIZE``)
+    
+    Both are served from the cache (see ``apps.notifications.inbox``), so
+    polling this view does not query the notification table.
+    """
     
     def get(self, request, format=None):
         """Get user notifications."""
-        # TODO: Implement actual notification fetching
-        return Response({
-            'unread_count': 0,
-            'notifications': []
-        })
+        try:
+            limit = max(int(request.query_params.get('limit', inbox_size())), 1)
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(get_inbox(request.user.id, limit=limit))
 
 
 class ActivitiesView(BaseDashboardView):
-    """View for recent activities."""
+    """
+    Activity feed, newest first, with cursor pagination.
+    
+    Query parameters:
+        organization: Show the feed of this organization (the user must be an
+            active member of it, or a superuser)
+        cursor: Opaque cursor from a previous response's next/previous link
+        page_size: Number of activities per page (default 20, at most 100)
+    
+    Without an organization, superusers get the feed of all activities and
+    other users their own activities. ``count`` is the number of activities
+    on the returned page.
+    """
 
     def get(self, request, format=None):
-        """Get recent activities for the current user."""
+        user = request.user
+        organization_id = request.query_params.get('organization')
+        
+        if organization_id:
+            try:
+                organization_id = uuid.UUID(organization_id)
+            except ValueError:
+                return Response(
+                    {'error': 'organization must be an organization ID'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            is_member = OrganizationMember.objects.filter(
+                user=user, organization_id=organization_id, is_active=True
+            ).exists()
+            if not (user.is_superuser or is_member):
+                return Response(
+                    {'error': 'You are not a member of this organization'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            queryset = get_feed_queryset(organization=organization_id)
+        elif user.is_superuser:
+            queryset = get_feed_queryset()
+        else:
+            queryset = get_feed_queryset(user=user)
+        
         try:
-            # Get recent activities from GlobalSearchView's method
-            activities = GlobalSearchView().get_recent_activities(limit=20)
-            
-            # Return in the format expected by the frontend
-            return Response({
-                'count': len(activities),
-                'next': None,
-                'previous': None,
-                'results': activities
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            logger.error(f"Error retrieving activities: {str(e)}")
-            return Response({
-                'count': 0,
-                'next': None,
-                'previous': None,
-                'results': []
-            }, status=status.HTTP_200_OK)
+            page_size = int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            page_size = DEFAULT_PAGE_SIZE
+        
+        try:
+            page = get_feed_page(queryset, request.query_params.get('cursor'), page_size)
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        url = request.build_absolute_uri()
+        return Response({
+            'count': len(page['results']),
+            'next': replace_query_param(url, 'cursor', page['next']) if page['next'] else None,
+            'previous': replace_query_param(url, 'cursor', page['previous']) if page['previous'] else None,
+            'results': [serialize_activity(activity) for activity in page['results']]
+        }, status=status.HTTP_200_OK)
+
+
+def get_search_organization_ids(user):
+    """
+    Organizations a user may search: those they are an active member of,
+    or None (no restriction) for superusers.
+    """
+    if user.is_superuser:
+        return None
+    return list(
+        OrganizationMember.objects
+        .filter(user=user, is_active=True)
+        .values_list('organization_id', flat=True)
+    )
+
+
+def get_search_entity_types(request):
+    """Entity types requested with ``?type=`` (repeatable), ignoring unknown ones."""
+    return [
+        entity_type for entity_type in request.query_params.getlist('type')
+        if entity_type in SEARCH_SPECS
+    ]
+
+
+def get_search_limit(request, default, maximum):
+    try:
+        limit = int(request.query_params.get('limit', default))
+    except ValueError:
+        limit = default
+    return max(1, min(limit, maximum))
 
 
 class GlobalSearchView(APIView):
-    """Global search across the platform."""
+    """
+    Global full-text search across projects, tasks, clients, support tickets
+    and organization members.
+    
+    Query parameters:
+        q: Search terms (web search syntax: "quoted phrases", -exclusions, or)
+        type: Only return this entity type (can be repeated)
+        limit: Maximum number of results (default 20, at most 50)
+    
+    Results are ranked by relevance and limited to the organizations the
+    user is an active member of; superusers search all organizations.
+    """
+    permission_classes = [IsAuthenticated]
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 50
 
     def get(self, request, format=None):
         query = request.query_params.get('q', '').strip()
         if not query:
             return Response({'results': []})
 
-        results = []
-        user = request.user
-        
-        # Search in projects (adjust based on user permissions)
-        projects = Project.objects.filter(
-            Q(name__icontains=query) | Q(description__icontains=query)
-        )
-        
-        for project in projects[:5]:  # Limit to 5 results per type
-            results.append({
-                'type': 'project',
-                'id': str(project.id),
-                'name': project.name,
-                'description': project.description[:100] + '...' if project.description else '',
-                'url': f'/projects/{project.id}'
-            })
-        
-        # Add more search types (tasks, clients, etc.) as needed
-        
+        entity_types = get_search_entity_types(request)
+        limit = get_search_limit(request, self.DEFAULT_LIMIT, self.MAX_LIMIT)
+        organization_ids = get_search_organization_ids(request.user)
+        if organization_ids == []:
+            return Response({'results': []})
+
+        try:
+            results = search(query, organization_ids, entity_types, limit)
+        except Exception as e:
+            logger.error(f"Error running global search: {str(e)}", exc_info=True)
+            return Response(
+                {'error': 'Search is currently unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
         return Response({'results': results})
-        # Calculate time periods
-        now = timezone.now()
-        today = now.date()
-        week_ago = today - timedelta(days=7)
-        
-        # User statistics
-        total_users = User.objects.count()
-        active_users_today = User.objects.filter(
-            last_login__date=today
-        ).count()
-        
-        new_users_this_week = User.objects.filter(
-            date_joined__date__gte=week_ago
-        ).count()
-        
-        # Organization statistics
-        total_organizations = Organization.objects.count()
-        active_organizations = Organization.objects.filter(
-            is_active=True
-        ).count()
-        
-        # System statistics
-        system_health = self.get_system_health()
-        
-        # Recent activity (last 10 activities)
-        recent_activities = self.get_recent_activities()
-        
-        # Compile the response
-        data = {
-            'user_stats': {
-                'total': total_users,
-                'active_today': active_users_today,
-                'new_this_week': new_users_this_week,
-            },
-            'organization_stats': {
-                'total': total_organizations,
-                'active': active_organizations,
-            },
-            'system': system_health,
-            'recent_activities': recent_activities,
-            'last_updated': now.isoformat()
-        }
-        
-        return Response(data, status=status.HTTP_200_OK)
+
+
+class AutocompleteView(APIView):
+    """
+    Type-ahead suggestions for the search boxes.
     
-    def get_system_health(self):
-        """Get system health metrics."""
-        # This is a placeholder - you might want to add more sophisticated checks
-        return {
-            'status': 'healthy',
-            'database': 'online',
-            'storage': {
-                'used_percent': 45,  # This should be calculated based on actual storage
-                'status': 'ok'
-            },
-            'services': {
-                'database': True,
-                'cache': True,
-                'background_worker': True
-            }
-        }
+    Query parameters:
+        q: The text typed so far (at least MIN_QUERY_LENGTH characters)
+        type: Only return this entity type (can be repeated)
+        limit: Maximum number of results per entity type (default 5, at most 10)
     
-    def get_recent_activities(self, limit=10):
-        """Get recent system activities."""
-        # This is a simplified version - you might want to use Django's logging system
-        # or a dedicated activity tracking app for production
-        activities = []
-        
-        # Get recent user signups
-        recent_signups = User.objects.order_by('-date_joined')[:5]
-        for user in recent_signups:
-            activities.append({
-                'type': 'user_signup',
-                'user': {
-                    'id': str(user.id),
-                    'email': user.email,
-                    'name': user.get_full_name() or user.username
-                },
-                'timestamp': user.date_joined.isoformat(),
-                'message': f"New user registered: {user.email}"
-            })
-        
-        # Sort all activities by timestamp and return the most recent
-        activities.sort(key=lambda x: x['timestamp'], reverse=True)
-        return activities[:limit]
+    Returns the best prefix/fuzzy matches per entity type within the user's
+    organizations. Queries that exceed the AUTOCOMPLETE_TIMEOUT_MS budget
+    return no results with ``timed_out`` set rather than an error, so the
+    client simply waits for the next keystroke.
+    """
+    permission_classes = [IsAuthenticated]
+    MIN_QUERY_LENGTH = 2
+    MAX_QUERY_LENGTH = 100
+    DEFAULT_LIMIT = 5
+    MAX_LIMIT = 10
+
+    def get(self, request, format=None):
+        query = request.query_params.get('q', '').strip()[:self.MAX_QUERY_LENGTH]
+        if len(query) < self.MIN_QUERY_LENGTH:
+            return Response({'results': [], 'timed_out': False})
+
+        entity_types = get_search_entity_types(request)
+        per_type = get_search_limit(request, self.DEFAULT_LIMIT, self.MAX_LIMIT)
+        organization_ids = get_search_organization_ids(request.user)
+        if organization_ids == []:
+            return Response({'results': [], 'timed_out': False})
+
+        try:
+            results = autocomplete(query, organization_ids, entity_types, per_type)
+        except SearchTimeout as e:
+            logger.warning(str(e))
+            return Response({'results': [], 'timed_out': True})
+        except Exception as e:
+            logger.error(f"Error running autocomplete: {str(e)}", exc_info=True)
+            return Response(
+                {'error': 'Autocomplete is currently unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        return Response({'results': results, 'timed_out': False})
+
+
+class BatchDashboardView(APIView):
+    """
+    Evaluate several dashboard endpoints ("widgets") in one request.
+    
+    POST body (or ``?widgets=a,b`` on GET)::
+    
+        {"widgets": ["admin-overview", {"name": "activities", "params": {"page_size": 5}}]}
+    
+    Widget names are the URL names of the dashboard endpoints (see
+    ``apps.dashboard.batch.WIDGETS``). Each widget is checked against its
+    own view's permissions, so one forbidden widget does not fail the batch.
+    Widgets are evaluated concurrently.
+    
+    Returns:
+        {"widgets": {"<name>": {"status": <http status>, "data": <response body>}}}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, format=None):
+        names = [name for name in request.query_params.get('widgets', '').split(',') if name]
+        return self._run(request, names)
+
+    def post(self, request, format=None):
+        widgets = request.data.get('widgets') if isinstance(request.data, dict) else None
+        if not isinstance(widgets, list):
+            return Response(
+                {'error': 'widgets must be a list of widget names'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return self._run(request, widgets)
+
+    def _run(self, request, items):
+        try:
+            widgets = parse_widgets(items)
+        except ValueError as e:
+            return Response({'error': str(e), 'available': list(WIDGETS)}, status=status.HTTP_400_BAD_REQUEST)
+        if not widgets:
+            return Response(
+                {'error': 'No widgets requested', 'available': list(WIDGETS)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({'widgets': run_widgets(request, widgets)})
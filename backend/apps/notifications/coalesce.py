@@ -0,0 +1,67 @@
+"""
+Coalescing of chatty notifications.
+
+Events that would each queue a notification task (a task dragged across
+the board changes status several times in a few seconds) are grouped per
+recipient, subject object and kind of event. The first event of a group
+queues the notification task ``NOTIFICATION_COALESCE_WINDOW`` seconds later;
+events arriving before it runs are absorbed. The task reads the subject's
+state when it runs, so the single notification it sends describes the
+latest state, and it calls ``release`` first so that later events start a
+new window.
+
+The group markers live in the cache, so events are only coalesced across
+processes when the cache is shared (Redis). A window of 0 queues every
+event immediately.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def coalesce_window():
+    return getattr(settings, 'NOTIFICATION_COALESCE_WINDOW', 30)
+
+
+def coalesce_key(recipient_id, subject, kind):
+    return f'notifications:coalesce:{recipient_id}:{subject}:{kind}'
+
+
+def schedule_coalesced(task, recipient_id, subject, kind, *args):
+    """
+    Queue ``task`` for an event unless one is already queued for its group.
+
+    The task is called with ``args`` (those of the group's first event) and a
+    ``coalesce_key`` keyword argument to pass to ``release``.
+
+    Returns:
+        bool: Whether the task was queued
+    """
+    window = coalesce_window()
+    if window <= 0:
+        task.delay(*args)
+        return True
+
+    key = coalesce_key(recipient_id, subject, kind)
+    try:
+        # Expires on its own if the task never runs, so events are not absorbed forever
+        first = cache.add(key, 1, window * 2 + 60)
+    except Exception as e:
+        logger.warning(f"Notification coalescing unavailable: {str(e)}")
+        first = True
+    if first:
+        task.apply_async(args=args, kwargs={'coalesce_key': key}, countdown=window)
+    return first
+
+
+def release(key):
+    """End a group's window; called by the task before it reads the subject's state."""
+    if not key:
+        return
+    try:
+        cache.delete(key)
+    except Exception as e:
+        logger.warning(f"Notification coalescing unavailable: {str(e)}")
@@ -1,17 +1,41 @@
+import asyncio
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from . import presence
+
 class NotificationConsumer(AsyncWebsocketConsumer):
+    group_name = None
+
     async def connect(self):
         user = self.scope['user']
-        if user.is_authenticated:
-            self.group_name = f'notifications_{user.id}'
-            await self.channel_layer.group_add(self.group_name, self.channel_name)
-            await self.accept()
+        if not user.is_authenticated:
+            await self.close()
+            return
+        self.user_id = user.id
+        self.group_name = presence.user_group(user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        if presence.presence_enabled():
+            # Counted before accepting, so nothing sent once the socket is open is skipped
+            await presence.connected(self.user_id)
+            self.heartbeat_task = asyncio.ensure_future(self.keep_alive())
+        await self.accept()
 
     async def disconnect(self, close_code):
+        if self.group_name is None:
+            return
+        heartbeat_task = getattr(self, 'heartbeat_task', None)
+        if heartbeat_task is not None:
+            heartbeat_task.cancel()
+            await presence.disconnected(self.user_id)
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
+    async def keep_alive(self):
+        # Refresh the presence TTL while the socket is open
+        while True:
+            await asyncio.sleep(presence.heartbeat_interval())
+            await presence.heartbeat(self.user_id)
+
     async def receive(self, text_data):
         # You may ignore or handle pings
         pass
@@ -20,3 +44,12 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             'message': event['message']
         }))
+
+
+    async def inbox_changed(self, event):
+        await self.send(text_data=json.dumps({
+            'type': 'inbox_changed',
+            'action': event.get('action'),
+            'count': event.get('count'),
+            'unread_count': event.get('unread_count'),
+        }))
@@ -0,0 +1,185 @@
+"""
+Cached unread counts and latest unread notifications.
+
+The notification badge is polled by every open browser tab, so a user's
+unread count is kept in the cache and adjusted with ``incr``/``decr`` as
+notifications are created, read and deleted, and their latest unread
+notifications are cached until their inbox changes. A poll is then a single
+``get_many``; the notification table is only read when an entry is missing
+(evicted, expired or never computed), through the
+``(recipient, read, created_at)`` index.
+
+Counters expire after ``NOTIFICATION_UNREAD_COUNT_TIMEOUT`` seconds so that
+any drift (an adjustment racing the recount that seeds the counter) does not
+outlive it. Any cache backend error degrades to reading the database.
+"""
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+def _count_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _latest_key(user_id):
+    return f'notifications:latest:{user_id}'
+
+
+def inbox_size():
+    """Number of latest unread notifications kept in the cache."""
+    return getattr(settings, 'NOTIFICATION_INBOX_SIZE', 10)
+
+
+def _count_unread(user_id):
+    return Notification.objects.filter(recipient_id=user_id, read=False).count()
+
+
+def _latest_unread(user_id):
+    return [
+        {
+            'id': str(notification['id']),
+            'message': notification['message'],
+            'created_at': notification['created_at'].isoformat(),
+        }
+        for notification in Notification.objects
+        .filter(recipient_id=user_id, read=False)
+        .order_by('-created_at')
+        .values('id', 'message', 'created_at')[:inbox_size()]
+    ]
+
+
+def get_inbox(user_id, limit=None):
+    """
+    Return a user's unread count and latest unread notifications.
+
+    Returns:
+        dict: 'unread_count' and 'notifications' (at most ``limit``, capped at
+            ``NOTIFICATION_INBOX_SIZE``, newest first)
+    """
+    limit = min(limit or inbox_size(), inbox_size())
+    count_key, latest_key = _count_key(user_id), _latest_key(user_id)
+    try:
+        cached = cache.get_many([count_key, latest_key])
+    except Exception as e:
+        logger.warning(f"Notification inbox cache unavailable: {str(e)}")
+        cached = None
+
+    if cached is None:
+        return {'unread_count': _count_unread(user_id), 'notifications': _latest_unread(user_id)[:limit]}
+
+    count = cached.get(count_key)
+    latest = cached.get(latest_key)
+    if count is None:
+        count = _count_unread(user_id)
+        try:
+            cache.add(count_key, count, getattr(settings, 'NOTIFICATION_UNREAD_COUNT_TIMEOUT', 3600))
+        except Exception as e:
+            logger.warning(f"Notification inbox cache unavailable: {str(e)}")
+    if latest is None:
+        latest = _latest_unread(user_id)
+        try:
+            cache.add(latest_key, latest, getattr(settings, 'NOTIFICATION_UNREAD_COUNT_TIMEOUT', 3600))
+        except Exception as e:
+            logger.warning(f"Notification inbox cache unavailable: {str(e)}")
+
+    return {'unread_count': max(count, 0), 'notifications': latest[:limit]}
+
+
+def get_unread_count(user_id):
+    return get_inbox(user_id, limit=0)['unread_count']
+
+
+def _adjust(changes):
+    for user_id, delta in changes.items():
+        try:
+            cache.delete(_latest_key(user_id))
+            if delta:
+                try:
+                    cache.incr(_count_key(user_id), delta)
+                except ValueError:
+                    # No counter cached; the next read counts from the database
+                    pass
+        except Exception as e:
+            logger.warning(f"Could not update unread notification count of user {user_id}: {str(e)}")
+
+
+def adjust_unread_counts(changes):
+    """
+    Apply changes to users' unread counts once the current transaction commits.
+
+    Args:
+        changes: Mapping of user id to the change in their number of unread
+            notifications (0 still refreshes their latest notifications)
+    """
+    changes = dict(changes)
+    if changes:
+        transaction.on_commit(lambda: _adjust(changes))
+
+
+def adjust_unread_count(user_id, delta):
+    adjust_unread_counts({user_id: delta})
+
+
+def select_notifications(user_id, ids=None, before=None, all=False):
+    """Notifications of a user by id list, created before a time, or all of them."""
+    queryset = Notification.objects.filter(recipient_id=user_id)
+    if ids is not None:
+        return queryset.filter(id__in=ids)
+    if before is not None:
+        return queryset.filter(created_at__lt=before)
+    if all:
+        return queryset
+    return queryset.none()
+
+
+def mark_read(queryset):
+    """
+    Mark notifications read with a single UPDATE.
+
+    Returns:
+        int: Number of notifications that were unread
+    """
+    changes = Counter()
+    with transaction.atomic():
+        with connections[queryset.db].cursor() as cursor:
+            sql, params = queryset.filter(read=False).values('id').query.sql_with_params()
+            cursor.execute(
+                f'UPDATE {Notification._meta.db_table} SET read = TRUE '
+                f'WHERE id IN ({sql}) RETURNING recipient_id',
+                params
+            )
+            for (recipient_id,) in cursor.fetchall():
+                changes[recipient_id] -= 1
+        adjust_unread_counts(changes)
+    return -sum(changes.values())
+
+
+def dismiss(queryset):
+    """
+    Delete notifications with a single DELETE.
+
+    Returns:
+        int: Number of notifications deleted
+    """
+    changes = Counter()
+    with transaction.atomic():
+        with connections[queryset.db].cursor() as cursor:
+            sql, params = queryset.values('id').query.sql_with_params()
+            cursor.execute(
+                f'DELETE FROM {Notification._meta.db_table} '
+                f'WHERE id IN ({sql}) RETURNING recipient_id, read',
+                params
+            )
+            rows = cursor.fetchall()
+        for recipient_id, read in rows:
+            changes[recipient_id] -= 0 if read else 1
+        adjust_unread_counts(changes)
+    return len(rows)
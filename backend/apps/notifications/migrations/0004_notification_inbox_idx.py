@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-17 05:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_notificatio_recipie_f39341_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'read', 'created_at'], name='notification_inbox_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.contrib.auth import get_user_model
+from model_utils import FieldTracker
 
 User = get_user_model()
 
@@ -11,5 +12,16 @@ class Notification(models.Model):
     read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Keeps the cached unread counts up to date (see apps.notifications.inbox)
+    tracker = FieldTracker(fields=['read'])
+
+    class Meta:
+        indexes = [
+            # Cursor pagination of a user's notifications
+            models.Index(fields=['recipient', 'created_at']),
+            # Unread counts and latest unread notifications
+            models.Index(fields=['recipient', 'read', 'created_at'], name='notification_inbox_idx'),
+        ]
+
     def __str__(self):
         return f"Notification for {self.recipient.username}"
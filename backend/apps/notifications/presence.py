@@ -0,0 +1,106 @@
+"""
+WebSocket presence of users.
+
+``NotificationConsumer`` keeps a per-user count of open sockets in the
+cache: it increments it on connect, decrements it on disconnect and
+refreshes its expiry every ``NOTIFICATION_PRESENCE_TTL / 3`` seconds while
+the socket is open. A process that dies without disconnecting stops
+refreshing, so its connections are forgotten once the TTL passes.
+
+Senders check presence before touching the channel layer, so pushes to
+users without an open socket cost one cache read (one ``get_many`` for a
+batch) instead of a channel layer round trip per recipient.
+
+Presence must be visible to every process that sends notifications (Celery
+workers included), so it is only used with a shared cache:
+``NOTIFICATION_PRESENCE_ENABLED`` defaults to whether ``REDIS_CACHE_URL``
+is set. When it is disabled, or the cache fails, every user is treated as
+online.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def user_group(user_id):
+    """Channel layer group of a user's open sockets."""
+    return f'user_{user_id}'
+
+
+def _presence_key(user_id):
+    return f'notifications:presence:{user_id}'
+
+
+def presence_enabled():
+    return getattr(settings, 'NOTIFICATION_PRESENCE_ENABLED', False)
+
+
+def presence_ttl():
+    return getattr(settings, 'NOTIFICATION_PRESENCE_TTL', 60)
+
+
+def heartbeat_interval():
+    return presence_ttl() / 3
+
+
+async def connected(user_id):
+    """Count a newly opened socket of a user."""
+    key = _presence_key(user_id)
+    try:
+        if not await cache.aadd(key, 1, presence_ttl()):
+            await cache.aincr(key)
+            await cache.atouch(key, presence_ttl())
+    except ValueError:
+        # Expired between add and incr
+        await cache.aadd(key, 1, presence_ttl())
+    except Exception as e:
+        logger.warning(f"Could not record presence of user {user_id}: {str(e)}")
+
+
+async def disconnected(user_id):
+    """Stop counting a closed socket of a user."""
+    key = _presence_key(user_id)
+    try:
+        if await cache.adecr(key) <= 0:
+            await cache.adelete(key)
+    except ValueError:
+        # Already expired
+        pass
+    except Exception as e:
+        logger.warning(f"Could not record presence of user {user_id}: {str(e)}")
+
+
+async def heartbeat(user_id):
+    """Keep the presence of a user with an open socket from expiring."""
+    key = _presence_key(user_id)
+    try:
+        if not await cache.atouch(key, presence_ttl()):
+            # Evicted; the user has at least this socket open
+            await cache.aadd(key, 1, presence_ttl())
+    except Exception as e:
+        logger.warning(f"Could not record presence of user {user_id}: {str(e)}")
+
+
+def online_user_ids(user_ids):
+    """
+    Return the users among ``user_ids`` that have an open socket.
+
+    Every user is returned when presence is disabled or unavailable.
+    """
+    user_ids = set(user_ids)
+    if not presence_enabled() or not user_ids:
+        return user_ids
+    keys = {_presence_key(user_id): user_id for user_id in user_ids}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"Presence unavailable, delivering to all users: {str(e)}")
+        return user_ids
+    return {keys[key] for key, count in found.items() if count and count > 0}
+
+
+def is_online(user_id):
+    return bool(online_user_ids([user_id]))
@@ -5,3 +5,16 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = '__all__'
+
+
+class NotificationSelectionSerializer(serializers.Serializer):
+    """Notifications of the current user targeted by a bulk action; exactly one field is given."""
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False, max_length=1000)
+    before = serializers.DateTimeField(required=False, help_text="Notifications created before this time")
+    all = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        given = [field for field in ('ids', 'before', 'all') if attrs.get(field) not in (None, False)]
+        if len(given) != 1:
+            raise serializers.ValidationError("Give exactly one of 'ids', 'before' or 'all': true")
+        return attrs
@@ -1,6 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from apps.users.models import User
+from .inbox import adjust_unread_count
 from .models import Notification
 from .tasks import create_notification
 
@@ -8,3 +9,19 @@ from .tasks import create_notification
 def notify_new_user(sender, instance, created, **kwargs):
     if created and instance.role == 'admin':
         create_notification.delay(instance.id, "You have been successfully assigned as admin to this organization.")
+
+
+@receiver(post_save, sender=Notification)
+def update_unread_count(sender, instance, created, **kwargs):
+    if created:
+        delta = 0 if instance.read else 1
+    elif instance.tracker.has_changed('read'):
+        delta = -1 if instance.read else 1
+    else:
+        return
+    adjust_unread_count(instance.recipient_id, delta)
+
+
+@receiver(post_delete, sender=Notification)
+def remove_unread_count(sender, instance, **kwargs):
+    adjust_unread_count(instance.recipient_id, 0 if instance.read else -1)
@@ -1,9 +1,17 @@
+import asyncio
 import json
+import logging
+from collections import Counter
 from datetime import datetime
+from django.conf import settings
 from django.utils import timezone
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from .inbox import adjust_unread_counts
 from .models import Notification
+from .presence import is_online, online_user_ids, user_group
+
+logger = logging.getLogger(__name__)
 
 def send_notification(recipient, message, **kwargs):
     """
@@ -34,16 +42,17 @@ def send_notification(recipient, message, **kwargs):
         message=full_message
     )
     
-    # Send WebSocket notification if channels is configured
+    # Send WebSocket notification if channels is configured and the user has a socket open
     try:
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f"user_{recipient.id}", {
-                'type': 'send_notification',
-                'message': full_message,
-                'timestamp': timezone.now().isoformat()
-            }
-        )
+        if is_online(recipient.id):
+            channel_layer = get_channel_layer()
+            async_to_sync(channel_layer.group_send)(
+                user_group(recipient.id), {
+                    'type': 'send_notification',
+                    'message': full_message,
+                    'timestamp': timezone.now().isoformat()
+                }
+            )
     except Exception as e:
         print(f"WebSocket notification error: {e}")
     
@@ -53,6 +62,131 @@ def send_notification(recipient, message, **kwargs):
     
     return notification
 
+def send_bulk_notifications(recipients, message, **kwargs):
+    """
+    Send the same notification to many users at once
+
+    Args:
+        recipients: Iterable of users to notify (duplicates are notified once)
+        message: The notification message
+        **kwargs: As for send_notification
+
+    Returns:
+        dict: Delivery stats, see send_notification_batch
+    """
+    return send_notification_batch(((recipient, message) for recipient in recipients), **kwargs)
+
+def send_notification_batch(items, **kwargs):
+    """
+    Send a batch of notifications with one insert and concurrent WebSocket pushes
+
+    Unlike calling send_notification in a loop, the rows are written with a
+    single bulk_create and the WebSocket messages are sent from one event
+    loop, at most NOTIFICATION_PUSH_CONCURRENCY at a time.
+
+    Args:
+        items: Iterable of (recipient, message) pairs; a recipient gets at
+            most one notification per distinct message
+        **kwargs: As for send_notification (data, send_email)
+
+    Returns:
+        dict: 'created' (number of notifications written), 'pushed' and
+            'push_failed' (WebSocket messages sent and failed) and
+            'offline' (not pushed as the recipient has no socket open)
+    """
+    send_email = kwargs.pop('send_email', False)
+    data = kwargs.pop('data', {})
+
+    notifications = []
+    seen = set()
+    for recipient, message in items:
+        full_message = f"{message}\n\nAdditional details: {data}" if data else message
+        if (recipient.pk, full_message) in seen:
+            continue
+        seen.add((recipient.pk, full_message))
+        notifications.append(Notification(recipient=recipient, message=full_message))
+
+    if not notifications:
+        return {'created': 0, 'pushed': 0, 'push_failed': 0, 'offline': 0}
+
+    Notification.objects.bulk_create(notifications)
+    adjust_unread_counts(Counter(notification.recipient_id for notification in notifications))
+    online = online_user_ids(notification.recipient_id for notification in notifications)
+    online_notifications = [notification for notification in notifications if notification.recipient_id in online]
+    pushed, failed = push_notifications(online_notifications)
+
+    if send_email:
+        for notification in notifications:
+            send_notification_email(notification.recipient, notification.message, 'info')
+
+    return {
+        'created': len(notifications),
+        'pushed': pushed,
+        'push_failed': failed,
+        'offline': len(notifications) - len(online_notifications),
+    }
+
+def push_notifications(notifications):
+    """
+    Send notifications to their recipients' WebSocket groups concurrently
+
+    Returns:
+        tuple: Number of messages sent and number that failed
+    """
+    if not notifications:
+        return 0, 0
+    try:
+        channel_layer = get_channel_layer()
+    except Exception as e:
+        logger.warning(f"WebSocket notification error: {str(e)}")
+        return 0, len(notifications)
+    if channel_layer is None:
+        return 0, len(notifications)
+
+    timestamp = timezone.now().isoformat()
+    concurrency = getattr(settings, 'NOTIFICATION_PUSH_CONCURRENCY', 100)
+
+    async def push(limit, notification):
+        async with limit:
+            await channel_layer.group_send(
+                user_group(notification.recipient_id), {
+                    'type': 'send_notification',
+                    'message': notification.message,
+                    'timestamp': timestamp
+                }
+            )
+
+    async def push_all():
+        limit = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(push(limit, notification) for notification in notifications), return_exceptions=True)
+
+    results = async_to_sync(push_all)()
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        logger.warning(f"WebSocket notification error for {len(errors)} of {len(results)} notifications: {errors[0]}")
+    return len(results) - len(errors), len(errors)
+
+def push_inbox_changed(user_id, **event):
+    """
+    Tell a user's open sockets that their inbox changed in bulk
+
+    Sent once per bulk action instead of once per notification, so clients
+    refetch their inbox rather than apply each change.
+    """
+    try:
+        if not is_online(user_id):
+            return
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            user_group(user_id), {
+                'type': 'inbox_changed',
+                'timestamp': timezone.now().isoformat(),
+                **event
+            }
+        )
+    except Exception as e:
+        logger.warning(f"WebSocket notification error: {str(e)}")
+
 def send_notification_to_admin(user, message, **kwargs):
     """Legacy function - now uses the main send_notification"""
     return send_notification(user, message, notification_type='admin', **kwargs)
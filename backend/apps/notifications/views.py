@@ -1,10 +1,18 @@
+from django.db import transaction
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .inbox import dismiss, get_unread_count, mark_read, select_notifications
 from .models import Notification
-from .serializers import NotificationSerializer
+from .serializers import NotificationSelectionSerializer, NotificationSerializer
+from .utils import push_inbox_changed
+from backend.pagination import CreatedAtCursorPagination
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
     queryset = Notification.objects.none()
 
     def get_queryset(self):
@@ -17,3 +25,40 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
             return Notification.objects.none()
             
         return self.request.user.notifications.order_by('-created_at')
+
+    def _bulk(self, request, operation, name):
+        selection = NotificationSelectionSerializer(data=request.data)
+        selection.is_valid(raise_exception=True)
+        user_id = request.user.id
+        count = operation(select_notifications(user_id, **selection.validated_data))
+
+        # Counters are adjusted once the update commits, which it has unless
+        # the request runs inside an outer transaction
+        unread_count = get_unread_count(user_id)
+        if count:
+            transaction.on_commit(
+                lambda: push_inbox_changed(user_id, action=name, count=count, unread_count=unread_count)
+            )
+        response = {'count': count, 'unread_count': unread_count}
+        return Response(response)
+
+    @action(detail=False, methods=['post'])
+    def mark_read(self, request):
+        """
+        Mark the current user's notifications read in one update.
+
+        Body: ``{"ids": [...]}``, ``{"before": "<datetime>"}`` or
+        ``{"all": true}``. Returns the number of notifications that were
+        unread and the new unread count.
+        """
+        return self._bulk(request, mark_read, 'mark_read')
+
+    @action(detail=False, methods=['post'])
+    def dismiss(self, request):
+        """
+        Delete the current user's notifications in one statement.
+
+        Takes the same body as ``mark_read`` and returns the number of
+        notifications deleted and the new unread count.
+        """
+        return self._bulk(request, dismiss, 'dismiss')
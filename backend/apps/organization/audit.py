@@ -0,0 +1,6 @@
+"""Audited organization models (see apps.activity_logs.registry)."""
+from apps.activity_logs.registry import register
+
+from .models import OrganizationMember
+
+register(OrganizationMember, fields=['role', 'is_active'], actor='user')
@@ -2,6 +2,7 @@ import uuid
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
+from model_utils import FieldTracker
 from apps.users.models import User
 
 class OrganizationRoleChoices(models.TextChoices):
@@ -29,6 +30,9 @@ class OrganizationMember(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Track changes to these fields
+    tracker = FieldTracker(fields=['role', 'is_active'])
+
     class Meta:
         unique_together = ('user', 'organization')
         ordering = ['-created_at']
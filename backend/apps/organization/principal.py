@@ -0,0 +1,168 @@
+"""
+Request-scoped view of who the current user is across organizations.
+
+Permission classes and role-filtered querysets all need the user's active
+memberships. ``get_principal`` loads them in one query, keeps them on the
+request for the rest of the request, and caches them across requests per
+user. The cache entry is dropped whenever one of the user's memberships is
+saved or deleted (see ``apps.organization.signals``).
+
+Access tokens can carry the memberships as claims (see
+``apps.users.authentication``). Each user has a membership version that is
+changed whenever the cached memberships are invalidated; claims issued under
+an older version are ignored.
+"""
+import logging
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import OrganizationMember, OrganizationRoleChoices
+
+logger = logging.getLogger(__name__)
+
+Membership = namedtuple('Membership', ['member_id', 'organization_id', 'role'])
+
+
+def _cache_key(user_id):
+    return f'principal:memberships:{user_id}'
+
+
+def _version_key(user_id):
+    return f'principal:version:{user_id}'
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def load_memberships(user_id):
+    """Load the active memberships of a user, using the cross-request cache."""
+    key = _cache_key(user_id)
+    try:
+        memberships = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Principal cache unavailable: {str(e)}")
+        memberships = None
+    if memberships is not None:
+        return memberships
+
+    memberships = [
+        Membership(*row) for row in
+        OrganizationMember.objects
+        .filter(user_id=user_id, is_active=True)
+        .order_by('created_at')
+        .values_list('id', 'organization_id', 'role')
+    ]
+    try:
+        cache.set(key, memberships, getattr(settings, 'PRINCIPAL_CACHE_TIMEOUT', 300))
+    except Exception as e:
+        logger.warning(f"Principal cache unavailable: {str(e)}")
+    return memberships
+
+
+def get_membership_version(user_id):
+    """
+    Current membership version of a user, or None if the cache is unavailable.
+
+    A version that was evicted from the cache is replaced by a new one, so
+    claims issued before the eviction are never trusted again.
+    """
+    key = _version_key(user_id)
+    try:
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, _new_version(), None)
+            version = cache.get(key)
+        return version
+    except Exception as e:
+        logger.warning(f"Principal cache unavailable: {str(e)}")
+        return None
+
+
+def invalidate_principal(user_id):
+    """Drop the cached memberships of a user and revoke their membership claims."""
+    try:
+        cache.delete(_cache_key(user_id))
+        cache.set(_version_key(user_id), _new_version(), None)
+    except Exception as e:
+        logger.warning(f"Could not invalidate principal of user {user_id}: {str(e)}")
+
+
+class Principal:
+    """
+    The current user together with their active organization memberships.
+
+    Role checks take one or more ``OrganizationRoleChoices`` values and are
+    true if the user holds any of them in any (or the given) organization.
+    """
+
+    def __init__(self, user, memberships=()):
+        self.user = user
+        self.memberships = list(memberships)
+
+    @property
+    def is_authenticated(self):
+        return bool(self.user and self.user.is_authenticated)
+
+    @property
+    def is_superadmin(self):
+        """Global superadmins bypass organization role checks."""
+        return self.is_authenticated and (self.user.is_superuser or self.user.role == 'superadmin')
+
+    @property
+    def organization_ids(self):
+        return list(dict.fromkeys(membership.organization_id for membership in self.memberships))
+
+    def _matching(self, roles, organization_id):
+        for membership in self.memberships:
+            if roles and membership.role not in roles:
+                continue
+            if organization_id is not None and str(membership.organization_id) != str(organization_id):
+                continue
+            yield membership
+
+    def has_role(self, *roles, organization_id=None):
+        """Whether the user holds any of ``roles`` (any role if none given)."""
+        return any(self._matching(roles, organization_id))
+
+    def roles_in(self, organization_id):
+        """Roles the user holds in an organization."""
+        return {membership.role for membership in self._matching((), organization_id)}
+
+    def member_ids(self, *roles, organization_id=None):
+        """Ids of the user's memberships with any of ``roles``."""
+        return [membership.member_id for membership in self._matching(roles, organization_id)]
+
+    def organization_ids_with(self, *roles):
+        """Organizations in which the user holds any of ``roles``."""
+        return list(dict.fromkeys(membership.organization_id for membership in self._matching(roles, None)))
+
+    @property
+    def is_organization_admin(self):
+        return self.has_role(OrganizationRoleChoices.ADMIN)
+
+
+def get_principal(request):
+    """
+    Return the principal of a request, loading it once per request.
+
+    Works with both Django and DRF requests.
+    """
+    user = getattr(request, 'user', None)
+    principal = getattr(request, '_principal', None)
+    if principal is not None and principal.user is user:
+        return principal
+
+    if user is not None and user.is_authenticated:
+        # Users authenticated from membership claims bring their memberships along
+        memberships = getattr(user, 'claimed_memberships', None)
+        if memberships is None:
+            memberships = load_memberships(user.pk)
+        principal = Principal(user, memberships)
+    else:
+        principal = Principal(user)
+    request._principal = principal
+    return principal
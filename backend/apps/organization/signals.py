@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import OrganizationMember, OrganizationRoleChoices
+from .principal import invalidate_principal
 from .tasks import send_admin_assignment_email
 
 @receiver(post_save, sender=OrganizationMember)
@@ -12,3 +14,11 @@ def notify_admin_assignment(sender, instance, created, **kwargs):
             user_id=instance.user.id,
             org_name=instance.organization.name
         )
+
+
+@receiver(post_save, sender=OrganizationMember)
+@receiver(post_delete, sender=OrganizationMember)
+def invalidate_member_principal(sender, instance, **kwargs):
+    """Drop the cached memberships of the member's user once the change is committed"""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_principal(user_id))
@@ -113,3 +113,42 @@ def get_organization_members(organization, role=None, is_active=True):
         
     OrganizationMember = get_organization_member_model()
     return OrganizationMember.objects.filter(**filters).select_related('user')
+
+def resolve_organization_id(model, organization_path, parent_id):
+    """
+    Resolve the organization of an object from the value of a foreign key
+    
+    Args:
+        model: The model class of the object
+        organization_path: Lookup path from the model to its organization,
+            e.g. 'project__client__organization'
+        parent_id: Value of the first field on that path (the foreign key id)
+        
+    Returns:
+        The organization id, or None if it cannot be resolved
+    """
+    if parent_id is None:
+        return None
+        
+    parent_field, _, remainder = organization_path.partition('__')
+    if not remainder:
+        # The first field is the organization itself
+        return parent_id
+        
+    parent_model = model._meta.get_field(parent_field).related_model
+    return parent_model.objects.filter(pk=parent_id).values_list(remainder, flat=True).first()
+
+def get_object_organization_id(instance, organization_path):
+    """
+    Get the organization id of a model instance
+    
+    Args:
+        instance: The model instance
+        organization_path: Lookup path from the model to its organization
+        
+    Returns:
+        The organization id, or None if the object has no organization
+    """
+    parent_field = organization_path.split('__', 1)[0]
+    attname = instance._meta.get_field(parent_field).attname
+    return resolve_organization_id(type(instance), organization_path, getattr(instance, attname))
@@ -14,6 +14,7 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes
 from apps.users.permissions import IsSuperAdmin, IsAdmin, HasOrganizationAccess
+from apps.dashboard.timeseries import growth_series, period_start
 from .models import Organization, AdminAssignment, Salesperson, Verifier, ProjectManager, Developer, Support, OrganizationMember
 from .serializers import (
     OrganizationSerializer, OrganizationDetailSerializer, OrganizationCreateSerializer,
@@ -69,26 +70,17 @@ class DashboardViewSet(APIView):
         # This is a placeholder - adjust based on your actual metrics
         team_productivity = 94  # Example value
         
-        # Calculate member growth over the last 6 months
-        six_months_ago = now - timedelta(days=180)
-        monthly_member_growth = []
-        
-        for i in range(6):
-            month = now - timedelta(days=30 * (5 - i))
-            month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            count = OrganizationMember.objects.filter(
-                created_at__range=(month_start, month_end)
-            ).count()
-            
-            monthly_member_growth.append({
-                'month': month.strftime('%b'),
-                'new': count,
-                'active': OrganizationMember.objects.filter(
-                    created_at__lte=month_end
-                ).count()
-            })
+        # Calculate member growth over the last 6 months (single query)
+        monthly_member_growth = [
+            {
+                'month': item['period'].strftime('%b'),
+                'new': item['new'],
+                'active': item['total']
+            }
+            for item in growth_series(
+                OrganizationMember.objects.all(), 'created_at', period_start(6, end=now), end=now
+            )
+        ]
         
         # Get project status distribution (example, adjust based on your Project model)
         # project_status = Project.objects.values('status').annotate(count=Count('id'))
@@ -242,26 +234,18 @@ class OrganizationViewSet(viewsets.ModelViewSet):
             is_active=True
         ).count()
         
-        # Get member growth data for the last 6 months
-        monthly_member_growth = []
-        for i in range(6):
-            month = now - timedelta(days=30 * (5 - i))
-            month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            new_members = organization.members.filter(
-                created_at__range=(month_start, month_end),
-                is_active=True
-            ).count()
-            
-            monthly_member_growth.append({
-                'month': month.strftime('%b %Y'),
-                'new_members': new_members,
-                'total_members': organization.members.filter(
-                    created_at__lte=month_end,
-                    is_active=True
-                ).count()
-            })
+        # Get member growth data for the last 6 months (single query)
+        monthly_member_growth = [
+            {
+                'month': item['period'].strftime('%b %Y'),
+                'new_members': item['new'],
+                'total_members': item['total']
+            }
+            for item in growth_series(
+                organization.members.filter(is_active=True),
+                'created_at', period_start(6, end=now), end=now
+            )
+        ]
         
         # Get role distribution
         role_distribution = organization.members.filter(
@@ -7,6 +7,7 @@ from apps.organization.models import OrganizationMember, OrganizationRoleChoices
 from django.db.models import Count, Q
 
 from apps.users.permissions import IsSuperAdmin, IsOrganizationAdmin
+from apps.dashboard.timeseries import growth_series, period_start
 from ..models import Organization, OrganizationMember
 
 class DashboardViewSet(APIView):
@@ -36,26 +37,17 @@ class DashboardViewSet(APIView):
         # This is a placeholder - adjust based on your actual metrics
         team_productivity = 94  # Example value
         
-        # Calculate member growth over the last 6 months
-        six_months_ago = now - timedelta(days=180)
-        monthly_member_growth = []
-        
-        for i in range(6):
-            month = now - timedelta(days=30 * (5 - i))
-            month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            count = OrganizationMember.objects.filter(
-                created_at__range=(month_start, month_end)
-            ).count()
-            
-            monthly_member_growth.append({
-                'month': month.strftime('%b'),
-                'new': count,
-                'active': OrganizationMember.objects.filter(
-                    created_at__lte=month_end
-                ).count()
-            })
+        # Calculate member growth over the last 6 months (single query)
+        monthly_member_growth = [
+            {
+                'month': item['period'].strftime('%b'),
+                'new': item['new'],
+                'active': item['total']
+            }
+            for item in growth_series(
+                OrganizationMember.objects.all(), 'created_at', period_start(6, end=now), end=now
+            )
+        ]
         
         # Get project status distribution (example, adjust based on your Project model)
         project_status = [
@@ -140,26 +132,18 @@ class OrganizationAdminDashboardView(APIView):
         # Calculate team productivity (example metric)
         team_productivity = 85  # Example value
         
-        # Calculate member growth over the last 6 months for this organization
-        monthly_member_growth = []
-        for i in range(6):
-            month = now - timedelta(days=30 * (5 - i))
-            month_start = month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-            
-            count = OrganizationMember.objects.filter(
-                organization=organization,
-                created_at__range=(month_start, month_end)
-            ).count()
-            
-            monthly_member_growth.append({
-                'month': month.strftime('%b'),
-                'new': count,
-                'active': OrganizationMember.objects.filter(
-                    organization=organization,
-                    created_at__lte=month_end
-                ).count()
-            })
+        # Calculate member growth over the last 6 months for this organization (single query)
+        monthly_member_growth = [
+            {
+                'month': item['period'].strftime('%b'),
+                'new': item['new'],
+                'active': item['total']
+            }
+            for item in growth_series(
+                OrganizationMember.objects.filter(organization=organization),
+                'created_at', period_start(6, end=now), end=now
+            )
+        ]
         
         # Get project status distribution (example, adjust based on your Project model)
         project_status = [
@@ -0,0 +1,286 @@
+"""
+Daily revenue ledger.
+
+``DailyRevenue`` keeps one row per (organization, salesperson, currency,
+day) with the total of the payments completed that day. A payment counts
+towards the ledger while its status is ``completed``; it is attributed to the
+organization and salesperson of its client and to the local day of its
+``completed_at``.
+
+The payment signals adjust the affected rows with ``F()`` increments when a
+payment completes, is refunded/cancelled, changes amount, currency or
+client, or is deleted; client signals move the revenue of a client whose
+salesperson or organization changes, and the revenue of a deleted
+salesperson is moved to the rows without one. Changes that bypass ``save()`` are not
+seen and can be repaired with the ``rebuild_revenue_ledger`` command.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.dashboard.stats import DashboardStats
+
+from .models import DailyRevenue, Payment
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = 'completed'
+
+LedgerKey = namedtuple('LedgerKey', ['organization_id', 'salesperson_id', 'currency', 'day'])
+
+
+def apply_delta(key, amount, count):
+    """
+    Add ``amount`` and ``count`` to the ledger row identified by ``key``.
+
+    The row is updated in place with ``F()`` expressions so concurrent
+    writers never lose increments; a missing row is created.
+    """
+    if not amount and not count:
+        return
+
+    rows = DailyRevenue.objects.filter(
+        organization_id=key.organization_id,
+        salesperson_id=key.salesperson_id,
+        currency=key.currency,
+        day=key.day,
+    )
+    changes = {
+        'amount': F('amount') + amount,
+        'payment_count': F('payment_count') + count,
+        'updated_at': timezone.now(),
+    }
+    if rows.update(**changes):
+        return
+
+    if count < 0:
+        logger.warning(
+            f"Missing revenue ledger row for {key}; "
+            f"run the rebuild_revenue_ledger command to repair it"
+        )
+        return
+
+    try:
+        with transaction.atomic():
+            DailyRevenue.objects.create(
+                organization_id=key.organization_id,
+                salesperson_id=key.salesperson_id,
+                currency=key.currency,
+                day=key.day,
+                amount=amount,
+                payment_count=count,
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        rows.update(**changes)
+
+
+def _client_attribution(client_id):
+    """``(organization_id, salesperson_id)`` of a client, or ``(None, None)``."""
+    from apps.clients.models import Client
+
+    if client_id is None:
+        return None, None
+    return (
+        Client.objects.filter(pk=client_id).values_list('organization_id', 'salesperson_id').first()
+        or (None, None)
+    )
+
+
+def _entry(status, amount, currency, client_id, completed_at):
+    """Ledger key and amount a payment in the given state contributes, or None."""
+    if status != COMPLETED or completed_at is None or amount is None:
+        return None
+    organization_id, salesperson_id = _client_attribution(client_id)
+    key = LedgerKey(organization_id, salesperson_id, currency, timezone.localdate(completed_at))
+    return key, Decimal(amount)
+
+
+def record_save(payment, created):
+    """
+    Update the ledger after ``payment`` was saved.
+
+    Relies on the payment's ``tracker`` covering the status, amount,
+    currency, client and completion time.
+    """
+    tracker = payment.tracker
+    if not created and not tracker.changed():
+        return
+
+    current = _entry(payment.status, payment.amount, payment.currency, payment.client_id, payment.completed_at)
+    previous = None
+    if not created:
+        previous = _entry(
+            tracker.previous('status'),
+            tracker.previous('amount'),
+            tracker.previous('currency'),
+            tracker.previous('client'),
+            tracker.previous('completed_at'),
+        )
+
+    if previous == current:
+        return
+    if previous:
+        apply_delta(previous[0], -previous[1], -1)
+    if current:
+        apply_delta(current[0], current[1], 1)
+
+
+def record_delete(payment):
+    """Update the ledger after ``payment`` was deleted."""
+    tracker = payment.tracker
+    previous = _entry(
+        tracker.previous('status'),
+        tracker.previous('amount'),
+        tracker.previous('currency'),
+        tracker.previous('client'),
+        tracker.previous('completed_at'),
+    )
+    if previous:
+        apply_delta(previous[0], -previous[1], -1)
+
+
+def move_client_revenue(client, old_attribution, new_attribution):
+    """
+    Re-attribute the completed payments of ``client`` after its organization
+    or salesperson changed.
+
+    Args:
+        client: The client
+        old_attribution: ``(organization_id, salesperson_id)`` before the change
+        new_attribution: ``(organization_id, salesperson_id)`` after the change
+    """
+    if old_attribution == new_attribution:
+        return
+    rows = (
+        Payment.objects
+        .filter(client=client, status=COMPLETED, completed_at__isnull=False)
+        .values('currency', day=TruncDate('completed_at'))
+        .annotate(total=Sum('amount'), payments=Count('pk'))
+        .order_by()
+    )
+    for row in rows:
+        apply_delta(LedgerKey(*old_attribution, row['currency'], row['day']), -row['total'], -row['payments'])
+        apply_delta(LedgerKey(*new_attribution, row['currency'], row['day']), row['total'], row['payments'])
+
+
+@transaction.atomic
+def release_salesperson(member_id):
+    """
+    Move the revenue attributed to a salesperson who is being deleted to the
+    rows without a salesperson.
+
+    Their clients' ``salesperson`` is set to NULL without sending signals, so
+    the ledger has to follow here; the member's rows are merged into the
+    no-salesperson row of the same organization, currency and day and then
+    deleted.
+    """
+    rows = DailyRevenue.objects.select_for_update().filter(salesperson_id=member_id)
+    for row in rows:
+        apply_delta(LedgerKey(row.organization_id, None, row.currency, row.day), row.amount, row.payment_count)
+    rows.delete()
+
+
+def compute_ledger(organization_id=None, chunk_size=5000):
+    """
+    Aggregate the completed payments the way the ledger should look.
+
+    Payments are aggregated in primary-key ranges of ``chunk_size`` rows so
+    no single query has to group the whole payments table.
+
+    Returns:
+        dict: Mapping of LedgerKey to ``[amount, count]``
+    """
+    payments = Payment.objects.filter(status=COMPLETED, completed_at__isnull=False)
+    if organization_id is not None:
+        payments = payments.filter(client__organization=organization_id)
+
+    ledger = defaultdict(lambda: [Decimal('0'), 0])
+    last_pk = None
+    while True:
+        chunk = payments.order_by('pk')
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+
+        rows = (
+            Payment.objects
+            .filter(pk__in=pks)
+            .values(
+                'currency',
+                organization_value=F('client__organization'),
+                salesperson_value=F('client__salesperson'),
+                day=TruncDate('completed_at'),
+            )
+            .annotate(total=Sum('amount'), payments=Count('pk'))
+            .order_by()
+        )
+        for row in rows:
+            key = LedgerKey(row['organization_value'], row['salesperson_value'], row['currency'], row['day'])
+            ledger[key][0] += row['total']
+            ledger[key][1] += row['payments']
+    return dict(ledger)
+
+
+@transaction.atomic
+def rebuild_ledger(organization_id=None, chunk_size=5000):
+    """
+    Replace the ledger with totals recomputed from the payments.
+
+    Returns:
+        int: Number of ledger rows written
+    """
+    ledger = compute_ledger(organization_id, chunk_size)
+    stored = DailyRevenue.objects.all()
+    if organization_id is not None:
+        stored = stored.filter(organization_id=organization_id)
+    stored.delete()
+    DailyRevenue.objects.bulk_create([
+        DailyRevenue(
+            organization_id=key.organization_id,
+            salesperson_id=key.salesperson_id,
+            currency=key.currency,
+            day=key.day,
+            amount=amount,
+            payment_count=count,
+        )
+        for key, (amount, count) in ledger.items()
+    ], batch_size=1000)
+    return len(ledger)
+
+
+def revenue_totals(today=None, rolling_days=30, **filters):
+    """
+    Revenue totals for the current month, quarter and year and a rolling window.
+
+    Keyword arguments filter the ledger rows, e.g. ``organization=org`` or
+    ``salesperson__user=user``. Amounts of all currencies are added up.
+
+    Returns:
+        dict: 'monthly_revenue', 'quarterly_revenue', 'annual_revenue' and
+            'rolling_revenue' (last ``rolling_days`` days including today)
+    """
+    today = today or timezone.localdate()
+    month_start = today.replace(day=1)
+    quarter_start = month_start.replace(month=(today.month - 1) // 3 * 3 + 1)
+    year_start = month_start.replace(month=1)
+    rolling_start = today - timedelta(days=rolling_days - 1)
+
+    rows = DailyRevenue.objects.filter(day__gte=min(year_start, rolling_start), day__lte=today, **filters)
+    return (
+        DashboardStats(rows)
+        .sum('monthly_revenue', 'amount', day__gte=month_start)
+        .sum('quarterly_revenue', 'amount', day__gte=quarter_start)
+        .sum('annual_revenue', 'amount', day__gte=year_start)
+        .sum('rolling_revenue', 'amount', day__gte=rolling_start)
+        .evaluate()
+    )
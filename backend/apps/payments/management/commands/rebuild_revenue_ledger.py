@@ -0,0 +1,29 @@
+"""
+Management command to rebuild the daily revenue ledger from the payments.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.payments.ledger import rebuild_ledger
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily revenue ledger from the completed payments'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            help='Only rebuild the ledger of this organization (UUID)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Number of payments aggregated per query'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_ledger(
+            organization_id=options['organization'],
+            chunk_size=options['chunk_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt revenue ledger ({written} rows written)"))
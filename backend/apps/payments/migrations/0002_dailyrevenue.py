@@ -0,0 +1,49 @@
+# Generated by Django 5.0.7 on 2026-10-17 04:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0007_seed_subscription_plans'),
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3)),
+                ('day', models.DateField(help_text='Day the payments were completed')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('payment_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_revenue', to='organization.organization')),
+                ('salesperson', models.ForeignKey(blank=True, help_text='Salesperson of the paying clients (empty if none)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_revenue', to='organization.organizationmember')),
+            ],
+            options={
+                'verbose_name': 'Daily Revenue',
+                'verbose_name_plural': 'Daily Revenue',
+                'indexes': [models.Index(fields=['organization', 'day'], name='payments_da_organiz_23e109_idx'), models.Index(fields=['salesperson', 'day'], name='payments_da_salespe_86aeb4_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrevenue',
+            constraint=models.UniqueConstraint(condition=models.Q(('organization__isnull', False), ('salesperson__isnull', False)), fields=('organization', 'salesperson', 'currency', 'day'), name='payments_revenue_unique_org_salesperson'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrevenue',
+            constraint=models.UniqueConstraint(condition=models.Q(('organization__isnull', False), ('salesperson__isnull', True)), fields=('organization', 'currency', 'day'), name='payments_revenue_unique_org'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrevenue',
+            constraint=models.UniqueConstraint(condition=models.Q(('organization__isnull', True), ('salesperson__isnull', False)), fields=('salesperson', 'currency', 'day'), name='payments_revenue_unique_salesperson'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrevenue',
+            constraint=models.UniqueConstraint(condition=models.Q(('organization__isnull', True), ('salesperson__isnull', True)), fields=('currency', 'day'), name='payments_revenue_unique_unassigned'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.7 on 2026-10-17 05:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0007_seed_subscription_plans'),
+        ('payments', '0002_dailyrevenue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyrevenue',
+            name='salesperson',
+            field=models.ForeignKey(blank=True, help_text='Salesperson of the paying clients (empty if none)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_revenue', to='organization.organizationmember'),
+        ),
+    ]
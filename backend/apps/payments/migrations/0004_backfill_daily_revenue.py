@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def backfill_ledger(apps, schema_editor):
+    """
+    Add the payments completed before the revenue ledger existed.
+    """
+    from apps.payments.ledger import rebuild_ledger
+
+    rebuild_ledger(chunk_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_dailyrevenue_salesperson_set_null'),
+        ('clients', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
 import uuid
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
+from model_utils import FieldTracker
 from apps.clients.models import Client
-from apps.organization.models import OrganizationMember
+from apps.organization.models import Organization, OrganizationMember
 from apps.projects.models import Project
 
 class Payment(models.Model):
@@ -83,6 +85,9 @@ class Payment(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     verified_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    
+    # Used by the revenue ledger to detect status/amount/attribution changes
+    tracker = FieldTracker(fields=['status', 'amount', 'currency', 'client', 'completed_at'])
 
     def __str__(self):
         return f"{self.amount} {self.currency} - {self.get_status_display()} ({self.client.name})"
@@ -101,4 +106,71 @@ class Payment(models.Model):
             self.verified_at = timezone.now()
         if self.status == 'completed' and not self.completed_at:
             self.completed_at = timezone.now()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class DailyRevenue(models.Model):
+    """
+    Daily revenue ledger.
+    
+    One row holds the total of the completed payments of one day, in one
+    currency, for an organization and the salesperson of the paying client.
+    Rows are maintained incrementally when payments complete, change or are
+    refunded (see ``apps.payments.ledger``), so revenue over any period is a
+    sum over at most one row per day instead of a scan of the payments.
+    """
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='daily_revenue'
+    )
+    salesperson = models.ForeignKey(
+        OrganizationMember,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='daily_revenue',
+        help_text="Salesperson of the paying clients (empty if none)"
+    )
+    currency = models.CharField(max_length=3)
+    day = models.DateField(help_text="Day the payments were completed")
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payment_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Daily Revenue'
+        verbose_name_plural = 'Daily Revenue'
+        indexes = [
+            models.Index(fields=['organization', 'day']),
+            models.Index(fields=['salesperson', 'day']),
+        ]
+        # NULLs never collide in a plain unique constraint, so each
+        # combination of missing organization/salesperson gets its own one.
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organization', 'salesperson', 'currency', 'day'],
+                condition=Q(organization__isnull=False, salesperson__isnull=False),
+                name='payments_revenue_unique_org_salesperson'
+            ),
+            models.UniqueConstraint(
+                fields=['organization', 'currency', 'day'],
+                condition=Q(organization__isnull=False, salesperson__isnull=True),
+                name='payments_revenue_unique_org'
+            ),
+            models.UniqueConstraint(
+                fields=['salesperson', 'currency', 'day'],
+                condition=Q(organization__isnull=True, salesperson__isnull=False),
+                name='payments_revenue_unique_salesperson'
+            ),
+            models.UniqueConstraint(
+                fields=['currency', 'day'],
+                condition=Q(organization__isnull=True, salesperson__isnull=True),
+                name='payments_revenue_unique_unassigned'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} {self.currency}: {self.amount}"
@@ -1,8 +1,10 @@
 # apps/payments/signals.py
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 from .models import Payment
-from .tasks import process_payment_async, send_payment_reminder
+from . import ledger
+from .tasks import process_payment_async
+from apps.organization.models import OrganizationMember
 from django.db import transaction
 
 @receiver(post_save, sender=Payment)
@@ -13,15 +15,6 @@ def handle_payment_notifications(sender, instance, created, **kwargs):
     if created and instance.client:
         # Process payment asynchronously
         process_payment_async.delay(instance.id)
-        
-        # Schedule payment reminder for due date
-        if instance.due_date:
-            # Calculate seconds until due date (for demo, using 1 minute before due)
-            # In production, you might want to schedule this for 1 day before due
-            send_payment_reminder.apply_async(
-                args=[instance.id],
-                eta=instance.due_date
-            )
 
 @receiver(pre_save, sender=Payment)
 def log_payment_status_change(sender, instance, **kwargs):
@@ -35,4 +28,27 @@ def log_payment_status_change(sender, instance, **kwargs):
                 # Log status change or trigger additional actions
                 pass
         except Payment.DoesNotExist:
-            pass
\ No newline at end of file
+            pass
+
+@receiver(post_save, sender=Payment)
+def update_revenue_ledger(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the daily revenue ledger in sync with completed payments
+    """
+    if raw:
+        return
+    ledger.record_save(instance, created)
+
+@receiver(post_delete, sender=Payment)
+def remove_payment_from_ledger(sender, instance, **kwargs):
+    """
+    Remove a deleted payment from the daily revenue ledger
+    """
+    ledger.record_delete(instance)
+
+@receiver(pre_delete, sender=OrganizationMember)
+def release_salesperson_revenue(sender, instance, **kwargs):
+    """
+    Keep a deleted salesperson's revenue in the ledger, without a salesperson
+    """
+    ledger.release_salesperson(instance.pk)
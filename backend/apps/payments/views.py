@@ -6,18 +6,21 @@ from .models import Payment
 from .serializers import PaymentSerializer
 from apps.users.permissions import IsAdmin, IsOrganizationMember
 from apps.organization.models import OrganizationMember, OrganizationRoleChoices
+from apps.organization.principal import get_principal
+from backend.pagination import CreatedAtCursorPagination
 
 class PaymentViewSet(viewsets.ModelViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    pagination_class = CreatedAtCursorPagination
     
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
         - Admins can perform all actions
         - Organization admins can view and manage payments for their organization
-        - Finance team members can view and process payments
-        - Regular users can only view their own payments
+        - Verifiers can view and process payments
+        - Other users can only list (an empty set of) payments
         """
         if self.action in ['list', 'retrieve']:
             permission_classes = [permissions.IsAuthenticated]
@@ -26,7 +29,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
                 IsAdmin | 
                 IsOrganizationMember(roles=[
                     OrganizationRoleChoices.ADMIN,
-                    OrganizationRoleChoices.FINANCE
+                    OrganizationRoleChoices.VERIFIER
                 ])
             ]
         else:
@@ -34,20 +37,18 @@ class PaymentViewSet(viewsets.ModelViewSet):
                 IsAdmin | 
                 IsOrganizationMember(roles=[
                     OrganizationRoleChoices.ADMIN,
-                    OrganizationRoleChoices.FINANCE
+                    OrganizationRoleChoices.VERIFIER
                 ])
             ]
             
-        return [permission() if not callable(permission) else permission 
-                for permission in permission_classes]
+        return [permission() for permission in permission_classes]
     
     def get_queryset(self):
         """
         Filter payments based on user role:
         - Admins see all payments
-        - Organization admins see payments for their organization
-        - Finance team members see all payments
-        - Regular users see only their own payments
+        - Organization admins and verifiers see payments for their organizations
+        - Other users see no payments
         """
         user = self.request.user
         queryset = super().get_queryset()
@@ -56,20 +57,17 @@ class PaymentViewSet(viewsets.ModelViewSet):
         if user.is_staff or user.is_superuser:
             return queryset
             
-        try:
-            # Get the user's organization membership
-            member = OrganizationMember.objects.get(user=user)
-            
-            # If user is an admin or finance team member, return all payments for their organization
-            if member.role in [OrganizationRoleChoices.ADMIN, OrganizationRoleChoices.FINANCE]:
-                return queryset.filter(organization=member.organization)
-                
-            # For regular users, return only their own payments
-            return queryset.filter(client__user=user)
-                
-        except OrganizationMember.DoesNotExist:
-            # For users without an organization membership, return only their own payments
-            return queryset.filter(client__user=user)
+        # Admins and verifiers see the payments of their organizations
+        principal = get_principal(self.request)
+        organization_ids = principal.organization_ids_with(
+            OrganizationRoleChoices.ADMIN,
+            OrganizationRoleChoices.VERIFIER
+        )
+        if organization_ids:
+            return queryset.filter(client__organization__in=organization_ids)
+        
+        # Other users are not linked to any payments
+        return queryset.none()
     
     def perform_create(self, serializer):
         """Set the organization and processed_by fields when creating a payment."""
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.utils import timezone
+from model_utils import FieldTracker
 from apps.organization.models import OrganizationMember, OrganizationRoleChoices
 from apps.clients.models import Client
 
@@ -87,6 +88,9 @@ class Project(models.Model):
     def __str__(self):
         return f"{self.title} ({self.client.name})"
     
+    # Track changes to these fields
+    tracker = FieldTracker(fields=['status', 'project_manager', 'client'])
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
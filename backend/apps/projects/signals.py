@@ -3,6 +3,8 @@ from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from .models import Project
 from .tasks import update_project_progress, check_project_deadlines, generate_project_report
+from apps.dashboard import rollups
+from apps.dashboard.models import StatusRollup
 
 @receiver(post_save, sender=Project)
 def handle_project_updates(sender, instance, created, **kwargs):
@@ -25,11 +27,21 @@ def handle_project_updates(sender, instance, created, **kwargs):
             if instance.status == 'completed':
                 generate_project_report.delay(instance.id)
 
+@receiver(post_save, sender=Project)
+def update_project_rollups(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the dashboard status rollups in sync with project changes
+    """
+    if raw:
+        return
+    rollups.record_save(StatusRollup.ENTITY_PROJECT, instance, created)
+
 @receiver(post_delete, sender=Project)
 def cleanup_after_project_deletion(sender, instance, **kwargs):
     """
     Handle cleanup after project deletion
     """
-    # Any necessary cleanup can be done here
-    # For example, cleaning up related files or temporary data
-    pass
\ No newline at end of file
+    rollups.record_delete(StatusRollup.ENTITY_PROJECT, instance)
+    
+    # Any other necessary cleanup can be done here
+    # For example, cleaning up related files or temporary data
\ No newline at end of file
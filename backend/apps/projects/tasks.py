@@ -1,11 +1,15 @@
+from collections import defaultdict
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.contrib.auth import get_user_model
 from django.utils import timezone
 from .models import Project
-from apps.notifications.utils import send_notification
+from apps.notifications.utils import send_notification_batch
 from apps.tasks.models import Task
 
 logger = get_task_logger(__name__)
+User = get_user_model()
 
 @shared_task(bind=True, max_retries=3)
 def update_project_progress(self, project_id):
@@ -63,31 +67,43 @@ def check_project_deadlines():
     Check for upcoming project deadlines and notify stakeholders
     """
     try:
-        warning_date = timezone.now() + timezone.timedelta(days=7)  # 7 days before deadline
+        today = timezone.localdate()
+        warning_date = today + timezone.timedelta(days=7)  # 7 days before deadline
         upcoming_projects = Project.objects.filter(
-            end_date__lte=warning_date,
-            end_date__gte=timezone.now(),
+            deadline__lte=warning_date,
+            deadline__gte=today,
             status__in=['planning', 'in_progress']
-        )
-        
+        ).select_related('project_manager__user')
+
+        # Developers working on each project, with one query
+        team = defaultdict(set)
+        assignments = Task.objects.filter(
+            project__in=upcoming_projects,
+            developer__user__isnull=False
+        ).values_list('project_id', 'developer__user_id').distinct()
+        for project_id, user_id in assignments:
+            team[project_id].add(user_id)
+        users = User.objects.in_bulk({user_id for user_ids in team.values() for user_id in user_ids})
+
+        notifications = []
         for project in upcoming_projects:
+            deadline = project.deadline.strftime('%Y-%m-%d')
             # Notify project manager
-            if project.manager and project.manager.user:
-                send_notification(
-                    recipient=project.manager.user,
-                    message=f"Project '{project.title}' is approaching its deadline on {project.end_date.strftime('%Y-%m-%d')}",
-                    notification_type="project_deadline_approaching"
-                )
-                
+            if project.project_manager and project.project_manager.user:
+                notifications.append((
+                    project.project_manager.user,
+                    f"Project '{project.title}' is approaching its deadline on {deadline}"
+                ))
+
             # Notify team members
-            team_members = project.team_members.all()
-            for member in team_members:
-                if member.user:
-                    send_notification(
-                        recipient=member.user,
-                        message=f"Project '{project.title}' deadline is approaching on {project.end_date.strftime('%Y-%m-%d')}",
-                        notification_type="project_deadline_reminder"
-                    )
+            for user_id in team[project.id]:
+                notifications.append((
+                    users[user_id],
+                    f"Project '{project.title}' deadline is approaching on {deadline}"
+                ))
+
+        stats = send_notification_batch(notifications)
+        logger.info(f"Project deadline notifications: {stats}")
         
         return f"Checked deadlines for {upcoming_projects.count()} projects"
         
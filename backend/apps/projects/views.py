@@ -1,7 +1,8 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404
+from django.db.models import Q
+from django.http import Http404
 
 # Import models
 from .models import Project
@@ -10,7 +11,8 @@ from .models import Project
 from .serializers import ProjectSerializer
 
 # Import organization models
-from apps.organization.models import OrganizationMember, OrganizationRoleChoices
+from apps.organization.models import OrganizationRoleChoices
+from apps.organization.principal import get_principal
 from apps.users.permissions import IsAdmin, IsOrganizationMember
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -46,14 +48,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
             # Any authenticated user can view projects (filtering happens in get_queryset)
             permission_classes = [permissions.IsAuthenticated]
             
-        return [permission() if not callable(permission) else permission 
-                for permission in permission_classes]
+        return [permission() for permission in permission_classes]
     
     def get_queryset(self):
         """
         Return projects based on user's role:
         - Admins see all projects
-        - Organization members see projects based on their role
+        - Organization members see projects based on their roles
         """
         user = self.request.user
         queryset = Project.objects.all()
@@ -62,21 +63,21 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if user.is_staff or user.is_superuser:
             return queryset
             
-        # Get organization member record if exists
-        try:
-            member = OrganizationMember.objects.get(user=user)
-        except OrganizationMember.DoesNotExist:
+        # Filter based on the user's roles (in any of their organizations)
+        principal = get_principal(self.request)
+        visible = Q()
+        for role, field in (
+            (OrganizationRoleChoices.SALESPERSON, 'salesperson'),
+            (OrganizationRoleChoices.PROJECT_MANAGER, 'project_manager'),
+            (OrganizationRoleChoices.VERIFIER, 'verifier'),
+        ):
+            member_ids = principal.member_ids(role)
+            if member_ids:
+                visible |= Q(**{f'{field}__in': member_ids})
+        
+        if not visible:
             return queryset.none()
-            
-        # Filter based on role
-        if member.role == OrganizationRoleChoices.SALESPERSON:
-            return queryset.filter(salesperson=member)
-        elif member.role == OrganizationRoleChoices.PROJECT_MANAGER:
-            return queryset.filter(project_manager=member)
-        elif member.role == OrganizationRoleChoices.VERIFIER:
-            return queryset.filter(verifier=member)
-            
-        return queryset.none()
+        return queryset.filter(visible)
     
     def perform_create(self, serializer):
         """Set the created_by field to the current user."""
@@ -89,7 +90,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         project = self.get_object()
         project.is_verified = True
-        project.verifier = get_object_or_404(OrganizationMember, user=request.user, role=OrganizationRoleChoices.VERIFIER)
+        member_ids = get_principal(request).member_ids(
+            OrganizationRoleChoices.VERIFIER,
+            organization_id=project.client.organization_id
+        )
+        if not member_ids:
+            raise Http404("You are not a verifier of this project's organization")
+        project.verifier_id = member_ids[0]
         project.save()
         
         serializer = self.get_serializer(project)
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.utils import timezone
+from model_utils import FieldTracker
 from apps.organization.models import OrganizationMember
 from apps.projects.models import Project
 from apps.clients.models import Client
@@ -71,6 +72,9 @@ class SupportTicket(models.Model):
     def __str__(self):
         return f"{self.issue} ({self.get_status_display()})"
         
+    # Track changes to these fields
+    tracker = FieldTracker(fields=['status', 'support', 'client'])
+    
     class Meta:
         ordering = ['-priority', 'created_at']
         indexes = [
@@ -1,35 +1,53 @@
 # apps/support/signals.py
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from .models import SupportTicket
 from .tasks import notify_ticket_assigned, auto_close_resolved_tickets
+from apps.dashboard import rollups
+from apps.dashboard.models import StatusRollup
 
 @receiver(post_save, sender=SupportTicket)
 def handle_support_ticket_updates(sender, instance, created, **kwargs):
     """
     Handle support ticket updates and delegate to Celery tasks
     """
-    if created and instance.assigned_to:
+    if created and instance.support:
         # Notify assigned agent about new ticket
         notify_ticket_assigned.delay(instance.id)
     elif instance.tracker.has_changed('status'):
         # Handle status changes
         if instance.status == "resolved":
             # Schedule auto-close for resolved tickets
-            auto_close_resolved_tickets.delay(instance.id)
+            auto_close_resolved_tickets.delay()
         elif instance.status == "escalated":
             # Handle escalation if needed
             pass
 
+@receiver(post_save, sender=SupportTicket)
+def update_ticket_rollups(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the dashboard status rollups in sync with ticket changes
+    """
+    if raw:
+        return
+    rollups.record_save(StatusRollup.ENTITY_TICKET, instance, created)
+
+@receiver(post_delete, sender=SupportTicket)
+def remove_ticket_from_rollups(sender, instance, **kwargs):
+    """
+    Remove a deleted ticket from the dashboard status rollups
+    """
+    rollups.record_delete(StatusRollup.ENTITY_TICKET, instance)
+
 @receiver(pre_save, sender=SupportTicket)
 def check_ticket_assignee_change(sender, instance, **kwargs):
     """
     Check if ticket assignee has changed and notify the new assignee
     """
-    if instance.pk and instance.assigned_to:
+    if instance.pk and instance.support:
         try:
             old_instance = SupportTicket.objects.get(pk=instance.pk)
-            if old_instance.assigned_to != instance.assigned_to:
+            if old_instance.support != instance.support:
                 # Notify new assignee
                 notify_ticket_assigned.delay(instance.id)
         except SupportTicket.DoesNotExist:
@@ -2,7 +2,7 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.utils import timezone
 from .models import SupportTicket
-from apps.notifications.utils import send_notification
+from apps.notifications.utils import send_notification, send_notification_batch
 
 logger = get_task_logger(__name__)
 
@@ -36,6 +36,7 @@ def escalate_overdue_tickets():
             due_date__lt=timezone.now()
         )
         
+        notifications = []
         for ticket in overdue_tickets:
             # Escalate the ticket
             ticket.priority = 'high'
@@ -44,11 +45,12 @@ def escalate_overdue_tickets():
             
             # Notify manager
             if ticket.assigned_to and ticket.assigned_to.manager:
-                send_notification(
-                    recipient=ticket.assigned_to.manager.user,
-                    message=f"Ticket #{ticket.id} has been escalated: {ticket.title}",
-                    notification_type="ticket_escalated"
-                )
+                notifications.append((
+                    ticket.assigned_to.manager.user,
+                    f"Ticket #{ticket.id} has been escalated: {ticket.title}"
+                ))
+
+        send_notification_batch(notifications)
                 
         return f"Escalated {overdue_tickets.count()} overdue tickets"
         
@@ -68,17 +70,16 @@ def auto_close_resolved_tickets():
             updated_at__lte=close_date
         )
         
+        notifications = []
         for ticket in tickets_to_close:
             ticket.status = 'closed'
             ticket.closed_at = timezone.now()
             ticket.save()
             
             if ticket.created_by:
-                send_notification(
-                    recipient=ticket.created_by,
-                    message=f"Your ticket has been closed: {ticket.title}",
-                    notification_type="ticket_closed"
-                )
+                notifications.append((ticket.created_by, f"Your ticket has been closed: {ticket.title}"))
+
+        send_notification_batch(notifications)
                 
         return f"Auto-closed {tickets_to_close.count()} resolved tickets"
         
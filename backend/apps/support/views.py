@@ -7,6 +7,7 @@ from .models import SupportTicket
 from .serializers import SupportTicketSerializer
 from apps.users.permissions import IsAdmin, IsOrganizationMember
 from apps.organization.models import OrganizationRoleChoices
+from apps.organization.principal import get_principal
 from apps.clients.models import Client
 
 class SupportTicketViewSet(viewsets.ModelViewSet):
@@ -27,15 +28,14 @@ class SupportTicketViewSet(viewsets.ModelViewSet):
                 IsOrganizationMember(roles=[OrganizationRoleChoices.SUPPORT])
             ]
             
-        return [permission() if not callable(permission) else permission 
-                for permission in permission_classes]
+        return [permission() for permission in permission_classes]
     
     def get_queryset(self):
         """
         Filter tickets based on user role:
         - Admins see all tickets
-        - Support staff see tickets assigned to them or unassigned
-        - Regular users see only their own tickets
+        - Support staff see tickets assigned to them or unassigned in their organizations
+        - Other users see no tickets
         """
         user = self.request.user
         queryset = super().get_queryset()
@@ -44,22 +44,21 @@ class SupportTicketViewSet(viewsets.ModelViewSet):
         if user.is_staff or user.is_superuser:
             return queryset
             
-        try:
-            # Get the user's organization membership
-            member = OrganizationMember.objects.get(user=user)
-            
-            # If user is support staff, return their assigned tickets and unassigned tickets
-            if member.role == OrganizationRoleChoices.SUPPORT:
-                return queryset.filter(
-                    models.Q(support=member) | 
-                    models.Q(support__isnull=True)
+        # Support staff see their assigned tickets and the unassigned
+        # tickets of their organizations
+        principal = get_principal(self.request)
+        support_ids = principal.member_ids(OrganizationRoleChoices.SUPPORT)
+        if support_ids:
+            return queryset.filter(
+                models.Q(support__in=support_ids) |
+                models.Q(
+                    support__isnull=True,
+                    client__organization__in=principal.organization_ids_with(OrganizationRoleChoices.SUPPORT)
                 )
-                
-        except OrganizationMember.DoesNotExist:
-            pass
-            
-        # For regular users, return only their own tickets
-        return queryset.filter(client__user=user)
+            )
+        
+        # Other users are not linked to any tickets
+        return queryset.none()
     
     def perform_create(self, serializer):
         """Set the client to the current user's client profile."""
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0007_seed_subscription_plans'),
+        ('projects', '0001_initial'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='tasks_task_created_5b4d0b_idx'),
+        ),
+    ]
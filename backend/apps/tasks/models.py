@@ -58,7 +58,7 @@ class Task(models.Model):
         return f"{self.title} ({self.get_status_display()})"
         
     # Track changes to these fields
-    tracker = FieldTracker(fields=['status', 'due_date', 'developer'])
+    tracker = FieldTracker(fields=['status', 'due_date', 'developer', 'project'])
     
     class Meta:
         ordering = ['-created_at']
@@ -68,4 +68,6 @@ class Task(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['priority']),
             models.Index(fields=['due_date']),
+            # Cursor pagination of the task list
+            models.Index(fields=['created_at', 'id']),
         ]
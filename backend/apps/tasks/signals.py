@@ -2,10 +2,13 @@
 import logging
 from datetime import timedelta
 from django.utils import timezone
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from .models import Task
 from . import tasks  # Import Celery tasks
+from apps.dashboard import rollups
+from apps.notifications.coalesce import schedule_coalesced
+from apps.dashboard.models import StatusRollup
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +29,9 @@ def handle_task_updates(sender, instance, created, **kwargs):
             # Queue status update notification
             old_status = instance.tracker.previous('status')
             logger.info(f"Task {instance.id} status changed from {old_status} to {instance.status}")
-            tasks.notify_task_status_update.delay(
+            schedule_coalesced(
+                tasks.notify_task_status_update,
+                instance.developer.user_id, f'task:{instance.id}', 'status',
                 str(instance.id),
                 old_status,
                 instance.status
@@ -35,6 +40,22 @@ def handle_task_updates(sender, instance, created, **kwargs):
         logger.error(f"Error in handle_task_updates for task {getattr(instance, 'id', 'unknown')}: {str(e)}", 
                    exc_info=True)
 
+@receiver(post_save, sender=Task)
+def update_task_rollups(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the dashboard status rollups in sync with task changes
+    """
+    if raw:
+        return
+    rollups.record_save(StatusRollup.ENTITY_TASK, instance, created)
+
+@receiver(post_delete, sender=Task)
+def remove_task_from_rollups(sender, instance, **kwargs):
+    """
+    Remove a deleted task from the dashboard status rollups
+    """
+    rollups.record_delete(StatusRollup.ENTITY_TASK, instance)
+
 @receiver(pre_save, sender=Task)
 def check_deadline(sender, instance, **kwargs):
     """
@@ -63,7 +84,9 @@ def check_deadline(sender, instance, **kwargs):
         
         if is_deadline_approaching:
             logger.info(f"Task {instance.id} deadline is approaching: {due_date}")
-            tasks.notify_task_status_update.delay(
+            schedule_coalesced(
+                tasks.notify_task_status_update,
+                instance.developer.user_id, f'task:{instance.id}', 'deadline',
                 str(instance.id),
                 "",
                 f"deadline_approaching:{due_date.isoformat()}"
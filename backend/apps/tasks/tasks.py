@@ -4,7 +4,8 @@ from celery.utils.log import get_task_logger
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from .models import Task
-from apps.notifications.utils import send_notification
+from apps.notifications.coalesce import release
+from apps.notifications.utils import send_notification, send_notification_batch
 
 logger = get_task_logger(__name__)
 User = get_user_model()
@@ -31,19 +32,38 @@ def notify_task_assigned(self, task_id):
         raise self.retry(exc=exc, countdown=60)
 
 @shared_task
-def notify_task_status_update(task_id, old_status, new_status):
+def notify_task_status_update(task_id, old_status, new_status, coalesce_key=None):
     """
     Send notification when task status is updated
+
+    Queued through apps.notifications.coalesce, so one run covers all the
+    changes of a coalescing window: the notification describes the task as
+    it is now, and a status changed back to ``old_status`` is not notified.
     """
+    release(coalesce_key)
     try:
-        task = Task.objects.get(id=task_id)
-        if task.developer and task.developer.user:
-            send_notification(
-                recipient=task.developer.user,
-                message=f"Task status updated from {old_status} to {new_status}: {task.title}",
-                notification_type="task_status_update"
-            )
-            logger.info(f"Status update notification sent for task: {task_id}")
+        task = Task.objects.select_related('developer__user').get(id=task_id)
+        if not (task.developer and task.developer.user):
+            return
+
+        if new_status.startswith('deadline_approaching:'):
+            if not task.due_date or task.status not in ['pending', 'in_progress']:
+                return
+            message = f"Task '{task.title}' is due soon! (Due: {task.due_date.strftime('%Y-%m-%d %H:%M')})"
+        else:
+            if coalesce_key:
+                new_status = task.status
+            if new_status == old_status:
+                logger.info(f"Task {task_id} status is back to {old_status}, not notifying")
+                return
+            message = f"Task status updated from {old_status} to {new_status}: {task.title}"
+
+        send_notification(
+            recipient=task.developer.user,
+            message=message,
+            notification_type="task_status_update"
+        )
+        logger.info(f"Status update notification sent for task: {task_id}")
     except Task.DoesNotExist:
         logger.error(f"Task {task_id} not found for status update notification")
     except Exception as e:
@@ -63,14 +83,13 @@ def check_task_deadlines():
             status__in=['pending', 'in_progress']
         )
         
-        for task in tasks:
-            if task.developer and task.developer.user:
-                send_notification(
-                    recipient=task.developer.user,
-                    message=f"Task '{task.title}' is due soon! (Due: {task.due_date.strftime('%Y-%m-%d %H:%M')})",
-                    notification_type="deadline_approaching"
-                )
-                logger.info(f"Deadline notification sent for task: {task.id}")
+        notifications = [
+            (task.developer.user, f"Task '{task.title}' is due soon! (Due: {task.due_date.strftime('%Y-%m-%d %H:%M')})")
+            for task in tasks.select_related('developer__user')
+            if task.developer and task.developer.user
+        ]
+        stats = send_notification_batch(notifications)
+        logger.info(f"Deadline notifications sent: {stats}")
         
         return f"Checked {tasks.count()} tasks for deadlines"
     except Exception as e:
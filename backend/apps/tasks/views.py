@@ -7,6 +7,8 @@ from .models import Task
 from .serializers import TaskSerializer, TaskListSerializer
 from apps.users.permissions import IsAdmin, IsOrganizationMember
 from apps.organization.models import OrganizationRoleChoices
+from apps.organization.principal import get_principal
+from backend.pagination import CreatedAtCursorPagination
 
 class TaskViewSet(viewsets.ModelViewSet):
     """
@@ -17,6 +19,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    pagination_class = CreatedAtCursorPagination
     
     def get_serializer_class(self):
         """Use different serializers for list and detail views."""
@@ -38,23 +41,24 @@ class TaskViewSet(viewsets.ModelViewSet):
         if user.is_staff or user.is_superuser:
             return queryset
             
-        try:
-            # Get the user's organization membership
-            member = OrganizationMember.objects.get(user=user)
-            
-            # If user is a project manager, return tasks from their projects
-            if member.role == OrganizationRoleChoices.PROJECT_MANAGER:
-                return queryset.filter(project__project_manager=member)
-                
-            # If user is a developer, return their assigned tasks
-            if member.role == OrganizationRoleChoices.DEVELOPER:
-                return queryset.filter(assigned_to=member)
-                
-        except OrganizationMember.DoesNotExist:
-            pass
-            
+        # Filter based on the user's roles (in any of their organizations)
+        principal = get_principal(self.request)
+        visible = Q()
+        
+        # Project managers see the tasks of their projects
+        manager_ids = principal.member_ids(OrganizationRoleChoices.PROJECT_MANAGER)
+        if manager_ids:
+            visible |= Q(project__project_manager__in=manager_ids)
+        
+        # Developers see their assigned tasks
+        developer_ids = principal.member_ids(OrganizationRoleChoices.DEVELOPER)
+        if developer_ids:
+            visible |= Q(developer__in=developer_ids)
+        
         # Default: return empty queryset
-        return Task.objects.none()
+        if not visible:
+            return queryset.none()
+        return queryset.filter(visible)
     
     def get_permissions(self):
         """
@@ -76,8 +80,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         else:
             permission_classes = [permissions.IsAuthenticated]
             
-        return [permission() if not callable(permission) else permission 
-                for permission in permission_classes]
+        return [permission() for permission in permission_classes]
     
     def perform_create(self, serializer):
         """Set the created_by field to the current user."""
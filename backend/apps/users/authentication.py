@@ -0,0 +1,110 @@
+"""
+JWT authentication backed by membership claims.
+
+When ``JWT_MEMBERSHIP_CLAIMS`` is enabled, tokens issued or refreshed by the
+token endpoints carry a ``principal`` claim with the user's basic account
+fields, their active organization memberships and the membership version
+they were read under (see ``apps.organization.principal``).
+
+``MembershipClaimsAuthentication`` builds the user from those claims instead
+of loading the ``users_user`` row, and hands the memberships to the request
+principal, so permission checks and role-filtered querysets need no queries
+of their own. The user is a real ``User`` instance whose remaining fields are
+deferred: reading one of them loads it from the database on demand.
+
+Changing a membership or a user's role, status or superuser flag changes the
+membership version; tokens carrying an older version (or issued while the
+cache was unavailable) fall back to the regular database lookup. The version
+must be seen by every worker, so claims are only enabled by default when the
+cache is shared (``REDIS_CACHE_URL``).
+"""
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.organization.principal import Membership, get_membership_version, load_memberships
+
+PRINCIPAL_CLAIM = 'principal'
+
+# User fields carried in the claim; all other fields are deferred
+CLAIMED_USER_FIELDS = ('username', 'email', 'role', 'is_active', 'is_staff', 'is_superuser')
+
+
+def membership_claims_enabled():
+    return getattr(settings, 'JWT_MEMBERSHIP_CLAIMS', False)
+
+
+def build_principal_claim(user):
+    """
+    Claim describing ``user`` and their memberships, or None if the
+    membership version cannot be determined.
+    """
+    version = get_membership_version(user.pk)
+    if version is None:
+        return None
+    return {
+        'v': version,
+        'user': {field: getattr(user, field) for field in CLAIMED_USER_FIELDS},
+        'memberships': [
+            [str(membership.member_id), str(membership.organization_id), membership.role]
+            for membership in load_memberships(user.pk)
+        ],
+    }
+
+
+def add_principal_claim(token, user):
+    """Embed the principal claim of ``user`` in ``token`` if claims are enabled."""
+    if not membership_claims_enabled():
+        return token
+    claim = build_principal_claim(user)
+    if claim is not None:
+        token[PRINCIPAL_CLAIM] = claim
+    elif PRINCIPAL_CLAIM in token:
+        del token[PRINCIPAL_CLAIM]
+    return token
+
+
+def user_from_claim(user_id, claim):
+    """Build a ``User`` from a principal claim without querying the database."""
+    User = get_user_model()
+    values = {User._meta.pk.attname: User._meta.pk.to_python(user_id)}
+    values.update((field, claim['user'][field]) for field in CLAIMED_USER_FIELDS)
+    # from_db() expects the values in concrete field order
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+    user = User.from_db(DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names])
+    user.claimed_memberships = [
+        Membership(uuid.UUID(member_id), uuid.UUID(organization_id), role)
+        for member_id, organization_id, role in claim['memberships']
+    ]
+    return user
+
+
+class MembershipClaimsAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts up-to-date membership claims.
+
+    Tokens without a principal claim, or whose claim is stale, are
+    authenticated the usual way.
+    """
+
+    def get_user(self, validated_token):
+        claim = validated_token.get(PRINCIPAL_CLAIM)
+        if not claim or not membership_claims_enabled():
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or claim.get('v') != get_membership_version(user_id):
+            return super().get_user(validated_token)
+
+        try:
+            user = user_from_claim(user_id, claim)
+        except (KeyError, TypeError, ValueError):
+            return super().get_user(validated_token)
+
+        if not user.is_active:
+            return super().get_user(validated_token)
+        return user
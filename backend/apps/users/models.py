@@ -4,6 +4,7 @@ from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin
 )
 from django.utils.translation import gettext_lazy as _
+from model_utils import FieldTracker
 
 class RoleChoices(models.TextChoices):
     USER = 'user', 'User'  # Default role for all users
@@ -109,6 +110,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     REQUIRED_FIELDS = ['email']
 
     objects = UserManager()
+    # Fields embedded in token membership claims (see apps.users.authentication)
+    tracker = FieldTracker(fields=['username', 'email', 'role', 'is_active', 'is_staff', 'is_superuser'])
 
     def __str__(self):
         return self.username
@@ -1,5 +1,6 @@
 from rest_framework import permissions
-from apps.organization.models import OrganizationMember, OrganizationRoleChoices
+from apps.organization.models import OrganizationRoleChoices
+from apps.organization.principal import get_principal
 
 
 class BaseRolePermission(permissions.BasePermission):
@@ -7,20 +8,17 @@ class BaseRolePermission(permissions.BasePermission):
     roles = []
     
     def has_permission(self, request, view):
-        if not (request.user and request.user.is_authenticated):
+        principal = get_principal(request)
+        if not principal.is_authenticated:
             return False
             
         # Superadmins have all permissions
-        if request.user.is_superuser or request.user.role == 'superadmin':
+        if principal.is_superadmin:
             return True
             
         # Check if user has any of the required roles in any organization
         if self.roles:
-            return OrganizationMember.objects.filter(
-                user=request.user,
-                role__in=self.roles,
-                is_active=True
-            ).exists()
+            return principal.has_role(*self.roles)
             
         return False
 
@@ -37,7 +35,7 @@ class IsSuperAdmin(permissions.BasePermission):
 
 class IsAdmin(BaseRolePermission):
     """Allows access only to admin users."""
-    role = 'admin'
+    roles = [OrganizationRoleChoices.ADMIN]
 
 
 class IsOrganizationAdmin(permissions.BasePermission):
@@ -47,21 +45,14 @@ class IsOrganizationAdmin(permissions.BasePermission):
     2. Organization admins (user has ADMIN role in any organization)
     """
     def has_permission(self, request, view):
+        principal = get_principal(request)
+        
         # Allow global superadmins
-        if request.user and request.user.is_authenticated and \
-           (request.user.is_superuser or request.user.role == 'superadmin'):
+        if principal.is_superadmin:
             return True
             
         # Check for organization admin role
-        return bool(
-            request.user and 
-            request.user.is_authenticated and
-            OrganizationMember.objects.filter(
-                user=request.user,
-                role=OrganizationRoleChoices.ADMIN,
-                is_active=True
-            ).exists()
-        )
+        return principal.is_authenticated and principal.is_organization_admin
 
 
 class IsSelfOrAdmin(permissions.BasePermission):
@@ -80,15 +71,12 @@ class IsSelfOrAdmin(permissions.BasePermission):
             return True
             
         # Allow access for superadmins
-        if request.user.is_superuser or request.user.role == 'superadmin':
+        principal = get_principal(request)
+        if principal.is_superadmin:
             return True
             
         # Check for organization admin role
-        return OrganizationMember.objects.filter(
-            user=request.user,
-            role=OrganizationRoleChoices.ADMIN,
-            is_active=True
-        ).exists()
+        return principal.is_organization_admin
 
 
 class IsSalesperson(BaseRolePermission):
@@ -119,32 +107,27 @@ class IsSupport(BaseRolePermission):
 class IsOrganizationMember(permissions.BasePermission):
     """
     Allows access to users with specific roles in any organization.
-    Can be initialized with a list of allowed roles.
+    Can be initialized with a list of allowed roles; the instance can then
+    be composed with permission classes (``IsAdmin | IsOrganizationMember(roles=[...])``).
     """
     def __init__(self, roles=None):
         self.roles = roles or []
     
+    def __call__(self, *args, **kwargs):
+        # DRF instantiates composed permissions by calling each operand
+        return self
+    
     def has_permission(self, request, view):
-        if not (request.user and request.user.is_authenticated):
+        principal = get_principal(request)
+        if not principal.is_authenticated:
             return False
             
         # Superadmins have all permissions
-        if request.user.is_superuser or request.user.role == 'superadmin':
+        if principal.is_superadmin:
             return True
             
-        # If no specific roles are required, just check organization membership
-        if not self.roles:
-            return OrganizationMember.objects.filter(
-                user=request.user,
-                is_active=True
-            ).exists()
-            
-        # Check for specific roles
-        return OrganizationMember.objects.filter(
-            user=request.user,
-            role__in=self.roles,
-            is_active=True
-        ).exists()
+        # Without specific roles, any active membership will do
+        return principal.has_role(*self.roles)
 
 
 class IsAdminOrSelf(permissions.BasePermission):
@@ -1,12 +1,13 @@
 # This file makes Python treat the directory as a package
 
 # Import all serializers from their respective module files
-from .user_serializers import UserSerializer, OrganizationMemberSerializer, CustomTokenObtainPairSerializer
+from .user_serializers import UserSerializer, OrganizationMemberSerializer, CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer
 from .registration_serializers import UserRegistrationSerializer
 
 __all__ = [
     'UserSerializer',
     'OrganizationMemberSerializer',
     'CustomTokenObtainPairSerializer',
+    'CustomTokenRefreshSerializer',
     'UserRegistrationSerializer',
 ]
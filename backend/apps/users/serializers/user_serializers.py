@@ -3,7 +3,12 @@ User-related serializers.
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.users.authentication import add_principal_claim, membership_claims_enabled
 
 User = get_user_model()
 
@@ -295,5 +300,35 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['is_staff'] = user.is_staff
         # Ensure superusers always have the superadmin role in the token
         token['role'] = 'superadmin' if user.is_superuser else getattr(user, 'role', None)
+        # Memberships for MembershipClaimsAuthentication, when enabled
+        add_principal_claim(token, user)
         
         return token
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that re-reads the membership claims.
+
+    The refresh token still carries the claims from when it was issued, so
+    the new access token gets the user's current memberships instead.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if not membership_claims_enabled():
+            return data
+
+        access = AccessToken(data['access'])
+        user_id = access[api_settings.USER_ID_CLAIM]
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('User not found or inactive', code='user_inactive')
+
+        add_principal_claim(access, user)
+        data['access'] = str(access)
+        if 'refresh' in data:
+            refresh = RefreshToken(data['refresh'], verify=False)
+            add_principal_claim(refresh, user)
+            data['refresh'] = str(refresh)
+        return data
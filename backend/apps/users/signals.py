@@ -1,7 +1,9 @@
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from apps.organization.principal import invalidate_principal
 from .models import User
 from .tasks import send_welcome_email_task
 
@@ -36,3 +38,12 @@ def send_welcome_email_on_creation(sender, instance, created, **kwargs):
         send_welcome_email_task.delay(instance.id, password=raw_password)
     else:
         send_welcome_email_task.delay(instance.id)
+
+
+@receiver(post_save, sender=User)
+def revoke_membership_claims(sender, instance, created, **kwargs):
+    """Invalidate token membership claims once a claimed field of the user changes"""
+    if created or not instance.tracker.changed():
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_principal(user_id))
@@ -0,0 +1,48 @@
+"""
+Tests for membership claims authentication.
+"""
+import uuid
+
+from django.test import SimpleTestCase
+
+from apps.organization.principal import Principal
+from apps.users.authentication import user_from_claim
+
+
+class UserFromClaimTests(SimpleTestCase):
+    """Test building users from token membership claims."""
+
+    def setUp(self):
+        self.user_id = uuid.uuid4()
+        self.member_id = uuid.uuid4()
+        self.organization_id = uuid.uuid4()
+        self.claim = {
+            'v': 1,
+            'user': {
+                'username': 'jane',
+                'email': 'jane@example.com',
+                'role': 'user',
+                'is_active': True,
+                'is_staff': False,
+                'is_superuser': False,
+            },
+            'memberships': [[str(self.member_id), str(self.organization_id), 'admin']],
+        }
+
+    def test_claimed_fields(self):
+        """Claimed fields are set without querying the database."""
+        user = user_from_claim(str(self.user_id), self.claim)
+        self.assertEqual(user.pk, self.user_id)
+        self.assertEqual(user.username, 'jane')
+        self.assertEqual(user.email, 'jane@example.com')
+        self.assertFalse(user.is_superuser)
+        self.assertFalse(user._state.adding)
+        self.assertIn('first_name', user.get_deferred_fields())
+
+    def test_claimed_memberships(self):
+        """Memberships are handed to the principal with their original types."""
+        user = user_from_claim(str(self.user_id), self.claim)
+        principal = Principal(user, user.claimed_memberships)
+        self.assertTrue(principal.is_organization_admin)
+        self.assertEqual(principal.organization_ids, [self.organization_id])
+        self.assertEqual(principal.member_ids('admin'), [self.member_id])
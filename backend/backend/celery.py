@@ -27,6 +27,7 @@ app.autodiscover_tasks(packages=[
     'apps.tasks',
     'apps.support',
     'apps.notifications',
+    'apps.activity_logs',
 ])
 
 # Configure periodic tasks
@@ -62,6 +63,12 @@ app.conf.beat_schedule = {
         'task': 'apps.tasks.tasks.send_daily_task_reminders',
         'schedule': crontab(hour=9, minute=0, day_of_week='1-5'),  # Weekdays at 9:00 AM
     },
+
+    # Create upcoming activity log partitions and drop expired ones daily at 1:00 AM
+    'maintain-activity-log-partitions': {
+        'task': 'apps.activity_logs.tasks.maintain_activity_log_partitions',
+        'schedule': crontab(hour=1, minute=0),
+    },
 }
 
 @app.task(bind=True)
@@ -0,0 +1,180 @@
+"""
+Pagination classes for high-volume list endpoints.
+
+``CreatedAtCursorPagination`` pages newest first on ``(created_at, id)``
+with an opaque cursor instead of a page number. A page is fetched with a
+range condition on that pair rather than an ``OFFSET``, so a deep page costs
+the same as the first one and no ``COUNT(*)`` is run. Clients that need a total
+can ask for one with ``?include_count=true`` and get an estimate: the
+planner's row count for an unfiltered table, or a briefly cached exact count
+otherwise.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+
+def _table_estimate(queryset):
+    """Planner estimate of the rows in the queryset's table (and its partitions)."""
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            # A partitioned table is estimated from its partitions
+            """
+            SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)
+            FROM pg_class c
+            WHERE c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s))
+               OR (c.oid = to_regclass(%s) AND c.relkind <> 'p')
+            """,
+            [queryset.model._meta.db_table] * 2
+        )
+        return int(cursor.fetchone()[0])
+
+
+def estimate_count(queryset):
+    """
+    Cheap estimate of ``queryset.count()``.
+
+    Unfiltered querysets on PostgreSQL use the table statistics; anything
+    else is counted exactly and cached for ``PAGINATION_COUNT_CACHE_TIMEOUT``
+    seconds.
+    """
+    if connections[queryset.db].vendor == 'postgresql' and not queryset.query.where:
+        estimate = _table_estimate(queryset)
+        if estimate:
+            return estimate
+
+    query = str(queryset.order_by().query)
+    key = f'pagination:count:{hashlib.md5(query.encode()).hexdigest()}'
+    try:
+        count = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Pagination count cache unavailable: {str(e)}")
+        count = None
+    if count is None:
+        count = queryset.count()
+        try:
+            cache.set(key, count, getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+        except Exception as e:
+            logger.warning(f"Pagination count cache unavailable: {str(e)}")
+    return count
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Newest-first keyset pagination for models with a ``created_at`` field.
+
+    DRF's ``CursorPagination`` only filters on the first ordering field and
+    steps over rows sharing a timestamp with an offset. Here a cursor holds
+    the ``(created_at, id)`` of the row at the edge of a page and the next
+    page is the rows strictly past that pair, as in
+    ``apps.activity_logs.feed``. The order is fixed, so ``?ordering=`` does
+    not apply to paginated lists.
+    """
+    ordering = ('-created_at', '-pk')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'include_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.estimated_count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.estimated_count = estimate_count(queryset)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        if self.cursor and self.cursor.position is not None:
+            created_at, pk = self._decode_position(self.cursor.position, queryset.model)
+            if reverse:
+                # Newer than the first row of the following page
+                queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+            else:
+                # Older than the last row of the previous page
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+
+        if reverse:
+            queryset = queryset.order_by('created_at', 'pk')
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        # One extra row tells whether there is another page in this direction
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        if (self.has_next or self.has_previous) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self._encode_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self._encode_position(self.page[0])))
+
+    def _encode_position(self, instance):
+        return f'{instance.created_at.isoformat()}|{instance.pk}'
+
+    def _decode_position(self, position, model):
+        """
+        Parse a cursor position into ``(created_at, pk)``.
+
+        Raises:
+            NotFound: If the position is malformed
+        """
+        created_at, _, pk = position.partition('|')
+        try:
+            created_at = parse_datetime(created_at)
+            pk = model._meta.pk.to_python(pk)
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None or pk is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.estimated_count is not None:
+            response['count'] = self.estimated_count
+            response['count_is_estimate'] = True
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count'] = {
+            'type': 'integer',
+            'example': 123,
+            'description': 'Estimated total, only with ?include_count=true',
+        }
+        return schema
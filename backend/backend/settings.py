@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'drf_yasg',
@@ -61,9 +62,11 @@ INSTALLED_APPS = [
     'apps.notifications',
     'apps.dashboard',
     'apps.activity_logs',
+    'system_monitor',
 ]
 
 MIDDLEWARE = [
+    'system_monitor.middleware.PrometheusMetricsMiddleware',  # First, so latency covers all other middleware
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Should be as high as possible, especially before CommonMiddleware
     'django.middleware.common.CommonMiddleware',
@@ -92,7 +95,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
-ASGI_APPLICATION = 'backend.routing.application'  # For Channels
+ASGI_APPLICATION = 'backend.asgi.application'  # For Channels
 
 # Database Configuration
 # =====================
@@ -156,12 +159,13 @@ SIMPLE_JWT = {
         days=int(os.getenv('JWT_SLIDING_TOKEN_REFRESH_LIFETIME_DAYS', '1'))
     ),
     'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.CustomTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.CustomTokenRefreshSerializer',
 }
 
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.MembershipClaimsAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -169,6 +173,7 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # High-volume endpoints use backend.pagination.CreatedAtCursorPagination
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -176,6 +181,90 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Cache
+# Redis is used when REDIS_CACHE_URL is set; otherwise each process falls back
+# to a local-memory cache (fine for development, not shared between workers)
+REDIS_CACHE_URL = os.getenv('REDIS_CACHE_URL', '')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+            'KEY_PREFIX': 'projectk',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'projectk',
+        },
+    }
+
+# Seconds a computed admin dashboard is served from the cache
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '300'))
+
+# Seconds a user's organization memberships are cached for permission checks
+PRINCIPAL_CACHE_TIMEOUT = int(os.getenv('PRINCIPAL_CACHE_TIMEOUT', '300'))
+
+# Embed organization memberships in access tokens so requests can be
+# authenticated without loading the user (see apps.users.authentication).
+# Claims are revoked through a version kept in the cache, which every worker
+# must see, so this is on by default only with Redis; without it users are
+# loaded from the database on each request.
+JWT_MEMBERSHIP_CLAIMS = os.getenv('JWT_MEMBERSHIP_CLAIMS', str(bool(REDIS_CACHE_URL))) == 'True'
+
+# Threads evaluating the widgets of a batched dashboard request
+DASHBOARD_BATCH_WORKERS = int(os.getenv('DASHBOARD_BATCH_WORKERS', '4'))
+
+# Seconds an exact count requested from a cursor-paginated list is cached
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '60'))
+
+# Milliseconds an autocomplete query may run before it is cancelled
+AUTOCOMPLETE_TIMEOUT_MS = int(os.getenv('AUTOCOMPLETE_TIMEOUT_MS', '200'))
+
+# System monitor: seconds between health samples and number of samples kept
+SYSTEM_MONITOR_INTERVAL = int(os.getenv('SYSTEM_MONITOR_INTERVAL', '5'))
+SYSTEM_MONITOR_HISTORY = int(os.getenv('SYSTEM_MONITOR_HISTORY', '60'))
+
+# Activity logs are buffered in memory and written in batches
+# (see apps.activity_logs.buffer)
+ACTIVITY_LOG_BUFFERED = os.getenv('ACTIVITY_LOG_BUFFERED', 'True') == 'True'
+ACTIVITY_LOG_BUFFER_SIZE = int(os.getenv('ACTIVITY_LOG_BUFFER_SIZE', '10000'))
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv('ACTIVITY_LOG_BATCH_SIZE', '500'))
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_LOG_FLUSH_INTERVAL', '2'))
+# 'drop' discards activities while the buffer is full, 'block' writes a batch in the caller
+ACTIVITY_LOG_OVERFLOW = os.getenv('ACTIVITY_LOG_OVERFLOW', 'drop')
+# Monthly activity log partitions created in advance, and months of activity
+# kept besides the current one before whole partitions are dropped (0 keeps all)
+ACTIVITY_LOG_PARTITIONS_AHEAD = int(os.getenv('ACTIVITY_LOG_PARTITIONS_AHEAD', '3'))
+ACTIVITY_LOG_RETENTION_MONTHS = int(os.getenv('ACTIVITY_LOG_RETENTION_MONTHS', '12'))
+# Rows fetched per round trip by activity log exports, and hours an export
+# written to MEDIA_ROOT by the background task is kept
+ACTIVITY_LOG_EXPORT_CHUNK_SIZE = int(os.getenv('ACTIVITY_LOG_EXPORT_CHUNK_SIZE', '2000'))
+ACTIVITY_LOG_EXPORT_TTL_HOURS = int(os.getenv('ACTIVITY_LOG_EXPORT_TTL_HOURS', '24'))
+
+# WebSocket messages sent at once by bulk notifications
+# (see apps.notifications.utils.send_notification_batch)
+NOTIFICATION_PUSH_CONCURRENCY = int(os.getenv('NOTIFICATION_PUSH_CONCURRENCY', '100'))
+# Seconds during which repeated events about the same object and recipient
+# are merged into one notification (see apps.notifications.coalesce; 0 disables)
+NOTIFICATION_COALESCE_WINDOW = int(os.getenv('NOTIFICATION_COALESCE_WINDOW', '30'))
+# Track which users have a notification socket open and skip the channel
+# layer for the others (see apps.notifications.presence). Needs a cache shared
+# by the web and Celery processes, so it is on by default only with Redis.
+NOTIFICATION_PRESENCE_ENABLED = os.getenv('NOTIFICATION_PRESENCE_ENABLED', str(bool(REDIS_CACHE_URL))) == 'True'
+# Seconds a socket's presence lasts without a heartbeat
+NOTIFICATION_PRESENCE_TTL = int(os.getenv('NOTIFICATION_PRESENCE_TTL', '60'))
+# Cached unread notification counts (see apps.notifications.inbox): latest
+# unread notifications kept per user, and seconds before a count is recomputed
+NOTIFICATION_INBOX_SIZE = int(os.getenv('NOTIFICATION_INBOX_SIZE', '10'))
+NOTIFICATION_UNREAD_COUNT_TIMEOUT = int(os.getenv('NOTIFICATION_UNREAD_COUNT_TIMEOUT', '3600'))
+
+# Bearer token required to scrape /metrics (without one, /metrics is only
+# served when DEBUG is on)
+METRICS_AUTH_TOKEN = os.getenv('METRICS_AUTH_TOKEN', '')
+
 # Channels
 CHANNEL_LAYERS = {
     'default': {
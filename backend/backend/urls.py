@@ -29,6 +29,7 @@ from drf_yasg.utils import swagger_auto_schema
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
 from apps.users.serializers import CustomTokenObtainPairSerializer
+from system_monitor.views import metrics_view
 
 # Custom TokenVerifyView with Swagger documentation
 class TokenVerifyViewWithSchema(TokenVerifyView):
@@ -135,6 +136,9 @@ urlpatterns = [
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     
+    # Prometheus metrics
+    path('metrics', metrics_view, name='prometheus-metrics'),
+    
     # CORS and CSRF endpoints
     path('api/v1/csrf/', get_csrf_token, name='get-csrf'),
     
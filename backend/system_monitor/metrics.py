@@ -0,0 +1,69 @@
+"""
+Prometheus metrics for HTTP requests and the database work they cause.
+
+Metrics are registered in the default ``prometheus_client`` registry and
+recorded by ``system_monitor.middleware.PrometheusMetricsMiddleware``.
+Requests are labelled by route (the resolver's ``view_name``) rather than
+by path, so label cardinality stays bounded.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set (gunicorn/uwsgi with several
+workers), ``prometheus_client`` writes samples to that directory and the
+metrics view aggregates them across processes.
+"""
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+# Route label for requests that did not resolve to a view (404s)
+UNRESOLVED_ROUTE = '<unresolved>'
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency in seconds',
+    ['method', 'route'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+REQUEST_COUNT = Counter(
+    'http_requests_total',
+    'HTTP requests by response status code',
+    ['method', 'route', 'status'],
+)
+
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress',
+    'HTTP requests currently being processed',
+    ['method'],
+    multiprocess_mode='livesum',
+)
+
+DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'Database queries executed per HTTP request',
+    ['route'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds',
+    'Time spent in database queries per HTTP request',
+    ['route'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+def render_metrics():
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        tuple: (payload bytes, content type)
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
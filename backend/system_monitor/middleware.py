@@ -0,0 +1,63 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from .metrics import (
+    DB_DURATION, DB_QUERIES, REQUEST_COUNT, REQUEST_LATENCY, REQUESTS_IN_PROGRESS, UNRESOLVED_ROUTE,
+)
+
+
+class QueryStats:
+    """
+    Database execute wrapper counting the queries of one request and the
+    time spent in them.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class PrometheusMetricsMiddleware:
+    """
+    Middleware recording request latency, status codes, in-flight requests
+    and per-request database query count and time.
+
+    It should come first in MIDDLEWARE so the measured latency covers the
+    other middleware as well.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        method = request.method
+        query_stats = QueryStats()
+        status_code = 500
+        start = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels(method).inc()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(query_stats))
+                response = self.get_response(request)
+            status_code = response.status_code
+            return response
+        finally:
+            duration = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.labels(method).dec()
+
+            resolver_match = getattr(request, 'resolver_match', None)
+            route = resolver_match.view_name if resolver_match else UNRESOLVED_ROUTE
+
+            REQUEST_LATENCY.labels(method, route).observe(duration)
+            REQUEST_COUNT.labels(method, route, str(status_code)).inc()
+            DB_QUERIES.labels(route).observe(query_stats.count)
+            DB_DURATION.labels(route).observe(query_stats.duration)
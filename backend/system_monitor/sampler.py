@@ -0,0 +1,195 @@
+"""
+Background sampler for system health metrics.
+
+Collecting health metrics is slow: ``psutil.cpu_percent`` needs a sampling
+interval, scanning processes walks the whole process table, and the database
+check needs a round trip. ``SystemSampler`` does that work in a daemon thread
+every ``SYSTEM_MONITOR_INTERVAL`` seconds and keeps the last
+``SYSTEM_MONITOR_HISTORY`` snapshots in a ring buffer, so the health endpoint
+only has to read memory.
+
+The sampler is per process and starts lazily on first use (see
+``get_sampler``), so management commands and Celery workers that never
+serve the health endpoint do not run it.
+"""
+import logging
+import platform
+import socket
+import threading
+from collections import deque
+from datetime import datetime
+
+import psutil
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Services reported by the health endpoint, matched against process command lines
+SERVICES = [
+    ('Django', ['python', 'manage.py']),
+    ('PostgreSQL', ['postgres']),
+    ('Redis', ['redis-server']),
+    ('Celery', ['celery']),
+]
+
+
+def _check_services():
+    """Check all services in a single pass over the process table."""
+    found = {}
+    for proc in psutil.process_iter(['cmdline', 'memory_info']):
+        try:
+            cmdline = ' '.join(proc.info['cmdline'] or []).lower()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+        if not cmdline:
+            continue
+        for name, process_names in SERVICES:
+            if name not in found and any(process_name.lower() in cmdline for process_name in process_names):
+                memory_info = proc.info['memory_info']
+                found[name] = {
+                    'name': name,
+                    'status': 'running',
+                    'pid': proc.pid,
+                    'memory_mb': round(memory_info.rss / (1024 * 1024), 2) if memory_info else None
+                }
+        if len(found) == len(SERVICES):
+            break
+    return [found.get(name, {'name': name, 'status': 'stopped'}) for name, _ in SERVICES]
+
+
+def _check_database(close_connection=False):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return {
+            'status': 'connected',
+            'tables': len(connection.introspection.table_names()),
+        }
+    except Exception as e:
+        return {'status': f'error: {str(e)}', 'tables': 0}
+    finally:
+        if close_connection:
+            # The sampler thread must not keep a connection open between samples
+            connection.close()
+
+
+def collect_snapshot(close_connection=False):
+    """
+    Collect one system health snapshot.
+
+    CPU usage is measured since the previous call (``interval=None``), so
+    the first snapshot of a process reports 0.
+
+    Args:
+        close_connection: Close this thread's database connection afterwards
+
+    Returns:
+        dict: Snapshot in the format returned by the health endpoint
+    """
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    boot_time = datetime.fromtimestamp(psutil.boot_time())
+
+    try:
+        services = _check_services()
+    except Exception as e:
+        logger.error(f"Error checking services: {str(e)}")
+        services = []
+
+    database = _check_database(close_connection)
+
+    return {
+        'status': 'healthy' if database['status'] == 'connected' else 'degraded',
+        'timestamp': datetime.now().isoformat(),
+        'system': {
+            'os': f"{platform.system()} {platform.release()}",
+            'hostname': socket.gethostname(),
+            'python_version': platform.python_version(),
+        },
+        'cpu': {
+            'usage_percent': psutil.cpu_percent(interval=None),
+            'cores': psutil.cpu_count(),
+        },
+        'memory': {
+            'used_gb': round(memory.used / (1024 ** 3), 2),
+            'total_gb': round(memory.total / (1024 ** 3), 2),
+            'usage_percent': memory.percent,
+        },
+        'disk': {
+            'used_gb': round(disk.used / (1024 ** 3), 2),
+            'total_gb': round(disk.total / (1024 ** 3), 2),
+            'usage_percent': disk.percent,
+        },
+        'uptime': str(datetime.now() - boot_time).split('.')[0],  # Remove microseconds
+        'database': database,
+        'services': services,
+    }
+
+
+class SystemSampler:
+    """Collects snapshots in a daemon thread and keeps the most recent ones."""
+
+    def __init__(self, interval=5, history_size=60):
+        self.interval = interval
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='system-monitor-sampler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def sample(self, close_connection=False):
+        """Collect a snapshot now and add it to the history."""
+        snapshot = collect_snapshot(close_connection)
+        with self._lock:
+            self._history.append(snapshot)
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample(close_connection=True)
+            except Exception as e:
+                logger.error(f"Error collecting system health snapshot: {str(e)}", exc_info=True)
+            self._stop.wait(self.interval)
+
+    def latest(self):
+        """Return the most recent snapshot, or None if nothing was collected yet."""
+        with self._lock:
+            return self._history[-1] if self._history else None
+
+    def history(self):
+        """Return all buffered snapshots, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """Return this process's sampler, starting it on first use."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = SystemSampler(
+                interval=getattr(settings, 'SYSTEM_MONITOR_INTERVAL', 5),
+                history_size=getattr(settings, 'SYSTEM_MONITOR_HISTORY', 60),
+            )
+        _sampler.start()
+    return _sampler
@@ -1,3 +1,27 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .metrics import render_metrics
+
+
+def metrics_view(request):
+    """
+    Expose the Prometheus metrics.
+
+    Scrapers must send METRICS_AUTH_TOKEN as a bearer token. Without a token
+    the endpoint is only open when DEBUG is on.
+    """
+    token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden('Metrics token not configured')
+    else:
+        expected = f'Bearer {token}'.encode()
+        provided = request.headers.get('Authorization', '').encode()
+        if not hmac.compare_digest(provided, expected):
+            return HttpResponseForbidden('Invalid metrics token')
+
+    payload, content_type = render_metrics()
+    return HttpResponse(payload, content_type=content_type)